@@ -0,0 +1,82 @@
+"""
+Strong ETags for list endpoints.
+
+The tag is a hash of each row's identity and version columns, so it only
+changes when a row is added, removed or rewritten.
+"""
+
+import re
+import hashlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def make_etag(
+    rows: Iterable[Dict[str, Any]], columns=("id", "created_at"), variant: str = ""
+) -> str:
+    """
+    Quoted strong ETag for a set of rows, independent of row order.
+
+    `variant` distinguishes different representations of the same rows
+    (e.g. a summary and a full listing).
+    """
+    digest = hashlib.sha256(variant.encode("utf-8"))
+
+    for key in sorted("|".join(str(row.get(c)) for c in columns) for row in rows):
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\n")
+
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header ("bytes=0-1023", "bytes=500-",
+    "bytes=-200").
+
+    Returns:
+        Inclusive (start, end) offsets, or None to send the whole body
+        (no header, or a multi-range request)
+
+    Raises:
+        HTTPException: 416 if the range doesn't overlap the body
+    """
+    if not header or "," in header:
+        return None
+
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return start, end
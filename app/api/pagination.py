@@ -0,0 +1,100 @@
+"""
+Keyset (cursor) pagination helpers for PostgREST queries.
+
+Pages are ordered by (created_at DESC, id DESC). The cursor is the
+(created_at, id) of the last row on the page, so the next page is a range
+scan on the leads_created_at_id index instead of an OFFSET that reads and
+throws away every earlier row.
+"""
+
+import json
+import base64
+from datetime import datetime
+from uuid import UUID
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just after `row`."""
+    raw = json.dumps([row["created_at"], str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Both parts end up inside a PostgREST filter string, so they are parsed
+    (ISO timestamp, UUID) and re-serialized rather than passed through.
+
+    Returns:
+        (created_at as an ISO timestamp, id as a canonical UUID)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(row_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, cursor: Optional[str]):
+    """
+    Order a query by (created_at, id) descending and start after `cursor`.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # created_at <= c bounds the index range scan; the OR breaks ties
+        query = query.lte("created_at", created_at).or_(
+            f'created_at.lt."{created_at}",id.lt.{row_id}'
+        )
+
+    return query.order("created_at", desc=True).order("id", desc=True)
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Iterable[str], required: Iterable[str] = ()
+) -> str:
+    """
+    Turn a `fields=` query parameter into a PostgREST select list.
+
+    Args:
+        fields: Comma-separated column names, or None for every column
+        allowed: Columns a caller may ask for
+        required: Columns always selected (e.g. the cursor columns)
+
+    Raises:
+        HTTPException: 400 for unknown columns
+    """
+    if not fields:
+        return "*"
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    columns: List[str] = list(required)
+    columns += [field for field in requested if field not in columns]
+    return ",".join(columns)
+
+
+def next_cursor(rows: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """
+    Cursor for the page after `rows`, fetched with limit + 1.
+
+    Returns None when the extra row is missing, i.e. this is the last page.
+    Trims the extra row from `rows` in place.
+    """
+    if not limit or len(rows) <= limit:
+        return None
+
+    del rows[limit:]
+    return encode_cursor(rows[-1])
@@ -0,0 +1,55 @@
+"""
+Fast JSON responses for rows that come straight from the database.
+
+Returning a list of rows from a route with response_model=List[Lead] makes
+FastAPI validate every row into a model and serialize it back, which is
+the bulk of the request time for large lists. Rows from Supabase are
+already JSON-shaped and match the schema, so with fast_json_responses on
+they are sent as-is with orjson. The route keeps its response_model, so
+the OpenAPI schema doesn't change.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+from app.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_json_enabled() -> bool:
+    return orjson is not None and get_settings().fast_json_responses
+
+
+def json_response(
+    content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """A JSONResponse, rendered with orjson when the fast path is enabled."""
+    response_class = OrjsonResponse if fast_json_enabled() else JSONResponse
+    return response_class(content=content, status_code=status_code, headers=headers)
+
+
+def trusted_json(content: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+    """
+    Return trusted database rows from a route.
+
+    With the fast path enabled this is an OrjsonResponse, which FastAPI
+    sends without re-validating against the route's response_model.
+    Otherwise `content` is returned unchanged for the usual validation;
+    the caller then sets `headers` on the injected Response itself.
+    """
+    if fast_json_enabled():
+        return OrjsonResponse(content=content, headers=headers)
+
+    return content
@@ -0,0 +1,32 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from app.services.linkedin_cache import get_enrichment_cache
+from app.services.search.cache import get_search_cache
+from app.services.company_cache import get_company_store
+from app.services.host_health import get_host_health
+from app.services.lead_cache import get_lead_cache
+
+
+router = APIRouter()
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Get cache hit ratios, remaining RapidAPI quota and open host circuits.
+    """
+
+    try:
+        # Opening the SQLite cache and counting its rows block, so use a thread
+        enrichment_cache = await asyncio.to_thread(get_enrichment_cache)
+        enrichment_stats = await asyncio.to_thread(enrichment_cache.stats)
+
+        return {
+            "linkedin_enrichment": enrichment_stats,
+            "search": get_search_cache().stats(),
+            "company_research": get_company_store().stats(),
+            "leads": get_lead_cache().stats(),
+            "hosts": get_host_health().snapshot(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
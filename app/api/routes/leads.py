@@ -1,51 +1,125 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional
 import uuid
 from uuid import UUID
+from supabase import AsyncClient
 from app.models.lead import Lead, LeadCreate, LeadUpdate
-from app.database import get_supabase_admin_client, get_supabase_client
+from app.database import get_supabase_admin_client
+from app.api.responses import json_response, trusted_json
+from app.api.pagination import apply_keyset, next_cursor, parse_fields
+from app.config import get_settings
+from app.services.lead_import import (
+    import_leads,
+    iter_csv_rows,
+    iter_lines,
+    iter_ndjson_rows,
+)
+from app.services.lead_export import iter_export_records, iter_ndjson
+from app.services.lead_cache import get_cached_lead, get_lead_cache
+from app.services.lead_identity import (
+    find_existing_leads,
+    first_match,
+    insert_leads_deduplicated,
+    lead_identity_keys,
+    merge_updates,
+    record_identities,
+    replace_identities,
+)
+from app.services.lead_vectors import find_lookalikes, remove_lead_embedding
 
 
 router = APIRouter()
 
 
+LEAD_FIELDS = set(Lead.model_fields)
+
+
 @router.get("/", response_model=List[Lead])
-async def get_leads(limit: int = 5):
+async def get_leads(
+    response: Response,
+    limit: int = Query(5, ge=0, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
     """
-    Retrieve all leads from the database.
+    Retrieve leads, newest first, one page at a time.
+
+    Args:
+        limit: Page size (0 returns every matching lead)
+        cursor: The X-Next-Cursor header from the previous page
+        fields: Comma-separated columns to return (id and created_at are
+                always included); omit for full Lead objects
+        status: Only leads with this status (comma-separated for several)
+        min_score / max_score: Inclusive score range
 
     Returns:
-        List[Lead]: A list of lead objects.
+        List[Lead]: A page of leads. When more remain, the X-Next-Cursor
+        response header holds the cursor for the next page.
     """
     try:
-        supabase = get_supabase_admin_client()
-        query = supabase.table("leads").select("*").order("created_at", desc=True)
+        select = parse_fields(fields, LEAD_FIELDS, required=("id", "created_at"))
+        query = supabase.table("leads").select(select)
+
+        if status:
+            query = query.in_("status", [s.strip() for s in status.split(",")])
+        if min_score is not None:
+            query = query.gte("score", min_score)
+        if max_score is not None:
+            query = query.lte("score", max_score)
+
+        query = apply_keyset(query, cursor)
 
         if limit:
-            query = query.limit(limit)
+            query = query.limit(limit + 1)
+
+        result = await query.execute()
 
-        response = query.execute()
+        rows = result.data or []
+        cursor_token = next_cursor(rows, limit)
+        headers = {"X-Next-Cursor": cursor_token} if cursor_token else {}
 
-        return response.data
+        if fields:
+            # Partial rows don't fit the Lead model; return them as-is
+            return json_response(rows, headers=headers)
+
+        response.headers.update(headers)
+        return trusted_json(rows, headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/stats")
-async def get_lead_stats():
-    """Get lead statistics."""
+async def get_lead_stats(
+    user_id: Optional[UUID] = None,
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
+    """
+    Get lead statistics.
 
-    try:
-        supabase = get_supabase_admin_client()
+    Counts come from the get_lead_stats database function, which reads the
+    per-status (or, for one user, per-user) rollup kept up to date by a
+    trigger on leads, so this costs the same however many leads there are.
 
-        result = supabase.table("leads").select("status, score").execute()
+    Args:
+        user_id: Only count this user's leads (default: all leads)
+    """
 
-        leads = result.data or []
+    try:
+        params = {"p_user_id": str(user_id)} if user_id else {}
+        result = await supabase.rpc("get_lead_stats", params).execute()
 
-        scores = []
+        rows = result.data or []
 
         stats = {
-            "total": len(leads),
+            "total": 0,
             "new": 0,
             "researching": 0,
             "qualified": 0,
@@ -54,18 +128,22 @@ async def get_lead_stats():
             "conversion_rate": 0,
         }
 
-        for lead in leads:
-            status = lead.get("status", "new")
+        score_sum = 0.0
+        scored = 0
+
+        for row in rows:
+            status = row.get("status")
+            count = row.get("lead_count") or 0
 
+            stats["total"] += count
             if status in stats:
-                stats[status] += 1
+                stats[status] += count
 
-            score = lead.get("score")
-            if score is not None and score > 0:
-                scores.append(score)
+            score_sum += row.get("score_sum") or 0
+            scored += row.get("scored_count") or 0
 
-        if scores:
-            stats["average_score"] = round(sum(scores) / len(scores), 1)
+        if scored:
+            stats["average_score"] = round(score_sum / scored, 1)
 
         completed = stats["qualified"] + stats["not_qualified"]
         if completed > 0:
@@ -77,8 +155,52 @@ async def get_lead_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+async def export_leads(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    gzip: bool = False,
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
+    """
+    Stream leads with their research as NDJSON, one lead per line.
+
+    Each line is a lead with its company_data, reports and
+    outreach_materials. Leads are read in keyset-paginated batches, so
+    memory stays flat however many leads match.
+
+    Args:
+        status: Only leads with this status (comma-separated for several)
+        created_from / created_to: created_at range, [from, to)
+        min_score / max_score: Inclusive score range
+        gzip: Send a gzip-compressed file (leads.ndjson.gz)
+    """
+    records = iter_export_records(
+        supabase,
+        status=[s.strip() for s in status.split(",")] if status else None,
+        created_from=created_from.isoformat() if created_from else None,
+        created_to=created_to.isoformat() if created_to else None,
+        min_score=min_score,
+        max_score=max_score,
+        batch_size=get_settings().lead_export_batch_size,
+    )
+
+    filename = "leads.ndjson.gz" if gzip else "leads.ndjson"
+
+    return StreamingResponse(
+        iter_ndjson(records, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{lead_id}", response_model=Lead)
-async def get_lead(lead_id: UUID):
+async def get_lead(
+    lead_id: UUID, supabase: AsyncClient = Depends(get_supabase_admin_client)
+):
     """
     Retrieve a single lead by its ID.
 
@@ -91,66 +213,232 @@ async def get_lead(lead_id: UUID):
     Raises:
         HTTPException: If the lead is not found.
     """
-    supabase = get_supabase_admin_client()
-    response = (
-        supabase.table("leads").select("*").eq("id", str(lead_id)).single().execute()
-    )
+    lead = await get_cached_lead(supabase, str(lead_id))
 
-    if not response.data:
+    if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    return response.data
+    return trusted_json(lead)
 
 
-@router.post("/", response_model=Lead)
-async def create_lead(lead: LeadCreate):
+@router.get("/{lead_id}/lookalikes")
+async def get_lookalike_leads(
+    lead_id: UUID,
+    limit: int = Query(10, ge=1, le=100),
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
+    """
+    Find the leads most similar to this one.
+
+    Compares embeddings of each lead's global research report and company
+    profile by cosine similarity.
 
-    user_id = str(uuid.uuid4())  # Placeholder for user ID
+    Args:
+        lead_id (UUID): The lead to find lookalikes for.
+        limit: Maximum number of leads to return.
+
+    Returns:
+        Leads, most similar first, each with a `similarity` in [-1, 1].
+        Empty if the lead has not been researched yet.
+    """
+    lead = await get_cached_lead(supabase, str(lead_id))
+
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+
+    try:
+        matches = await find_lookalikes(supabase, lead, limit)
+        if not matches:
+            return json_response({"leads": []})
+
+        response = (
+            await supabase.table("leads")
+            .select("*")
+            .in_("id", [match_id for match_id, _ in matches])
+            .execute()
+        )
+        rows = {str(row["id"]): row for row in response.data or []}
+
+        # Leads deleted since they were indexed simply drop out
+        return json_response(
+            {
+                "leads": [
+                    {**rows[match_id], "similarity": round(similarity, 4)}
+                    for match_id, similarity in matches
+                    if match_id in rows
+                ]
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/", response_model=Lead)
+async def create_lead(
+    lead: LeadCreate,
+    response: Response,
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
     """
     Create a new lead.
 
+    If the lead's email, LinkedIn URL or name + company domain already
+    belongs to a lead, no new lead is created: fields the existing lead is
+    missing are filled in from this one and the existing lead is returned
+    with an X-Existing-Lead: true header.
+
     Later we'll add:
     - User authentication (associate with user)
-    - Validation
     """
-    supabase = get_supabase_admin_client()
 
     # For now, we'll use a placeholder user_id
     # This will be replaced with actual auth later
     lead_data = lead.model_dump()
-    lead_data["user_id"] = user_id  # Placeholder
+    lead_data["user_id"] = str(uuid.uuid4())  # Placeholder
+
+    keys = lead_identity_keys(lead_data)
+    existing_id = first_match(keys, await find_existing_leads(supabase, keys))
+
+    if existing_id is None:
+        result = await supabase.table("leads").insert(lead_data).execute()
+        created = result.data[0]
+        await record_identities(supabase, [(key, str(created["id"])) for key in keys])
+
+        # Another request may have claimed one of the keys first; keep its lead
+        owners = await find_existing_leads(supabase, keys)
+        existing_id = first_match(keys, owners)
+        if existing_id in (None, str(created["id"])):
+            return trusted_json(created)
+
+        await supabase.table("leads").delete().eq("id", str(created["id"])).execute()
+
+    existing = await get_cached_lead(supabase, existing_id)
+    if existing is None:
+        raise HTTPException(status_code=409, detail="Duplicate lead was removed")
+
+    updates = merge_updates(existing, lead_data)
+    if updates:
+        result = (
+            await supabase.table("leads")
+            .update(updates)
+            .eq("id", existing_id)
+            .execute()
+        )
+        get_lead_cache().invalidate(existing_id)
+        existing = result.data[0] if result.data else {**existing, **updates}
+
+    await record_identities(supabase, [(key, existing_id) for key in keys])
+
+    headers = {"X-Existing-Lead": "true"}
+    response.headers.update(headers)
+    return trusted_json(existing, headers)
+
+
+@router.post("/import")
+async def import_leads_file(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    batch_size: Optional[int] = Query(None, ge=1, le=5000),
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
+    """
+    Import leads from a CSV or NDJSON upload.
+
+    The request body is the raw file (not multipart). It is parsed as it
+    arrives, so large CRM exports are never held in memory. Each row is
+    validated against LeadCreate. Rows repeating an earlier row's email,
+    LinkedIn URL or name + company domain are skipped, and rows matching a
+    lead already in the database are linked to it instead of inserted.
+
+    Args:
+        format: "csv" or "ndjson"; defaults from the Content-Type header
+        batch_size: Rows per database insert
+
+    Returns:
+        Counts of received/inserted/duplicate/existing/failed rows, the
+        errors for each failed row and the lead each existing row matched
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "json" in content_type else "csv"
+
+    parse = iter_ndjson_rows if format == "ndjson" else iter_csv_rows
+    user_id = str(uuid.uuid4())  # Placeholder until auth is added
 
-    response = supabase.table("leads").insert(lead_data).execute()
+    async def insert_batch(rows):
+        return await insert_leads_deduplicated(supabase, rows)
 
-    return response.data[0]
+    try:
+        return await import_leads(
+            parse(iter_lines(request.stream())),
+            insert_batch,
+            user_id=user_id,
+            batch_size=batch_size or get_settings().lead_import_batch_size,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.put("/{lead_id}", response_model=Lead)
-async def update_lead(lead_id: UUID, lead_update: LeadUpdate):
-    """Update an existing lead."""
-    supabase = get_supabase_admin_client()
+async def update_lead(
+    lead_id: UUID,
+    lead_update: LeadUpdate,
+    response: Response,
+    supabase: AsyncClient = Depends(get_supabase_admin_client),
+):
+    """
+    Update an existing lead.
+
+    The lead's identity keys are replaced to match its new email, LinkedIn
+    URL and name. Keys already belonging to another lead stay with it; those
+    leads are listed in an X-Conflicting-Leads header.
+    """
 
     update_data = lead_update.model_dump(exclude_unset=True)
 
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update provided")
 
-    response = (
-        supabase.table("leads").update(update_data).eq("id", str(lead_id)).execute()
+    result = (
+        await supabase.table("leads")
+        .update(update_data)
+        .eq("id", str(lead_id))
+        .execute()
     )
 
-    if not response.data:
+    get_lead_cache().invalidate(str(lead_id))
+
+    if not result.data:
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    return response.data[0]
+    updated = result.data[0]
+    conflicts = await replace_identities(
+        supabase, str(lead_id), lead_identity_keys(updated)
+    )
+
+    headers = {}
+    if conflicts:
+        others = ",".join(sorted(set(conflicts.values())))
+        print(f"⚠️ Lead {lead_id} shares identity keys with {others}")
+        headers["X-Conflicting-Leads"] = others
+        response.headers.update(headers)
+
+    return trusted_json(updated, headers)
 
 
 @router.delete("/{lead_id}")
-async def delete_lead(lead_id: UUID):
+async def delete_lead(
+    lead_id: UUID, supabase: AsyncClient = Depends(get_supabase_admin_client)
+):
     """Delete a lead."""
-    supabase = get_supabase_admin_client()
 
-    response = supabase.table("leads").delete().eq("id", str(lead_id)).execute()
+    response = (
+        await supabase.table("leads").delete().eq("id", str(lead_id)).execute()
+    )
+
+    get_lead_cache().invalidate(str(lead_id))
+    await remove_lead_embedding(str(lead_id))
 
     if not response.data:
         raise HTTPException(status_code=404, detail="Lead not found")
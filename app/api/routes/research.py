@@ -1,5 +1,16 @@
-from fastapi import APIRouter, HTTPException
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from supabase import AsyncClient
 from app.database import get_supabase_client
+from app.api.etag import etag_matches, make_etag, parse_byte_range
+from app.api.responses import json_response
+from app.services.lead_cache import get_cached_lead, get_lead_cache
+from app.services.lead_identity import copy_research, find_fresh_research
+from app.services.report_store import extract_section, hydrate_reports, list_sections
+from app.services.research_search import get_research_index
+from app.config import get_settings
 from pydantic import BaseModel
 from app.workflow.graph import run_research_workflow
 
@@ -9,30 +20,54 @@ router = APIRouter()
 
 class ResearchRequest(BaseModel):
     lead_id: str
+    force: bool = False
 
 
 @router.post("/start")
-async def start_research(request: ResearchRequest):
+async def start_research(
+    request: ResearchRequest, supabase: AsyncClient = Depends(get_supabase_client)
+):
     """
     Start research workflow for a lead.
+
+    If this lead, or another lead for the same person, finished research
+    within research_reuse_max_age_seconds, that result is returned instead
+    of running the workflow again (another lead's status, score, reports
+    and outreach are copied onto this one). Pass force=true to always
+    re-run.
     """
 
     try:
+        lead_cache = get_lead_cache()
+        lead = await get_cached_lead(supabase, request.lead_id)
 
-        supabase = get_supabase_client()
-
-        result = supabase.table("leads").select("*").eq("id", request.lead_id).execute()
-
-        if not result.data:
+        if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
 
-        lead = result.data[0]
+        if not request.force:
+            previous = await find_fresh_research(
+                supabase, lead, get_settings().research_reuse_max_age_seconds
+            )
+            if previous:
+                if str(previous["id"]) != request.lead_id:
+                    await copy_research(supabase, previous, lead)
+                    lead_cache.invalidate(request.lead_id)
+
+                return {
+                    "message": "Research reused",
+                    "lead_id": request.lead_id,
+                    "source_lead_id": previous["id"],
+                    "researched_at": previous["research_completed_at"],
+                    "is_qualified": previous["status"] != "not_qualified",
+                    "score": previous.get("score"),
+                }
 
         print(f"Starting research for lead ID: {request.lead_id}")
 
-        supabase.table("leads").update({"status": "researching"}).eq(
+        await supabase.table("leads").update({"status": "researching"}).eq(
             "id", request.lead_id
         ).execute()
+        lead_cache.invalidate(request.lead_id)
 
         final_state = await run_research_workflow(lead, lead.get("user_id", ""))
 
@@ -44,9 +79,13 @@ async def start_research(request: ResearchRequest):
             ),
             "score": final_state.get("lead_score", 0.0),
             "score_details": final_state.get("score_details"),
+            "research_completed_at": datetime.now(timezone.utc).isoformat(),
         }
 
-        supabase.table("leads").update(leads_update).eq("id", request.lead_id).execute()
+        await supabase.table("leads").update(leads_update).eq(
+            "id", request.lead_id
+        ).execute()
+        lead_cache.invalidate(request.lead_id)
 
         return {
             "message": "Research completed",
@@ -60,41 +99,194 @@ async def start_research(request: ResearchRequest):
 
 
 @router.get("/status/{lead_id}")
-async def get_research_status(lead_id: str):
+async def get_research_status(
+    lead_id: str, supabase: AsyncClient = Depends(get_supabase_client)
+):
     """
     Get the research status of a lead.
     """
 
     try:
-        supabase = get_supabase_client()
+        lead = await get_cached_lead(supabase, lead_id)
 
-        result = supabase.table("leads").select("*").eq("id", lead_id).execute()
-
-        if not result.data:
+        if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
 
-        lead = result.data[0]
+        return json_response(
+            {
+                "lead": lead,
+                "status": lead.get("status", "unknown"),
+                "score": lead.get("score"),
+            }
+        )
 
-        return {
-            "lead": lead,
-            "status": lead.get("status", "unknown"),
-            "score": lead.get("score"),
-        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search")
+async def search_research(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    supabase: AsyncClient = Depends(get_supabase_client),
+):
+    """
+    Search research reports and company profiles.
+
+    Args:
+        q: Words to find (all must match); "quoted phrases" match exactly
+        limit: Maximum number of results
+
+    Returns:
+        Ranked matches with the lead id, source (report type or
+        company_profile), title and a highlighted snippet
+    """
+
+    try:
+        start = time.perf_counter()
+        results = await get_research_index().search(supabase, q, limit)
+
+        return json_response(
+            {
+                "query": q,
+                "results": results,
+                "took_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+REPORT_SUMMARY_COLUMNS = (
+    "id, lead_id, report_type, title, is_markdown, created_at, content_size"
+)
+
+
 @router.get("/reports/{lead_id}")
-async def get_research_reports(lead_id: str):
-    """Get all reports for a lead."""
+async def get_research_reports(
+    lead_id: str,
+    request: Request,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    supabase: AsyncClient = Depends(get_supabase_client),
+):
+    """
+    Get all reports for a lead.
+
+    Args:
+        view: "full" includes every report's content; "summary" lists only
+              id, report_type, title, created_at and content_size, with
+              content fetched per report from /reports/{lead_id}/{report_id}
+
+    The response carries a strong ETag built from the reports' ids and
+    timestamps. A conditional request first queries just those two columns;
+    if its If-None-Match still matches it gets a 304 and the report bodies
+    are never fetched, serialized or sent.
+    """
 
     try:
-        supabase = get_supabase_client()
+        headers = {"Cache-Control": "private, no-cache"}
+
+        if request.headers.get("if-none-match"):
+            versions = (
+                await supabase.table("reports")
+                .select("id, created_at")
+                .eq("lead_id", lead_id)
+                .execute()
+            )
+
+            etag = make_etag(versions.data or [], variant=view)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={**headers, "ETag": etag})
 
-        result = supabase.table("reports").select("*").eq("lead_id", lead_id).execute()
+        columns = REPORT_SUMMARY_COLUMNS if view == "summary" else "*"
+        result = (
+            await supabase.table("reports")
+            .select(columns)
+            .eq("lead_id", lead_id)
+            .order("created_at")
+            .execute()
+        )
 
-        return {"reports": result.data or []}
+        reports = result.data or []
+        if view == "full":
+            reports = await hydrate_reports(supabase, reports)
+
+        headers["ETag"] = make_etag(reports, variant=view)
+
+        return json_response({"reports": reports}, headers=headers)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reports/{lead_id}/{report_id}")
+async def get_report_content(
+    lead_id: str,
+    report_id: str,
+    request: Request,
+    section: Optional[str] = None,
+    supabase: AsyncClient = Depends(get_supabase_client),
+):
+    """
+    Get one report's content as markdown (or plain text).
+
+    Args:
+        section: Only return the part under this heading (case-insensitive);
+            a 404 for an unknown heading lists the report's headings
+
+    Supports single byte ranges (Range: bytes=0-4095) over the UTF-8 body
+    (or over the section, when one is requested) and If-None-Match.
+    """
+
+    result = (
+        await supabase.table("reports")
+        .select("id, lead_id, content, content_hash, is_markdown, created_at")
+        .eq("id", report_id)
+        .eq("lead_id", lead_id)
+        .execute()
+    )
+
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    report = result.data[0]
+    etag = make_etag([report], variant=f"content:{section or ''}")
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = (await hydrate_reports(supabase, [report]))[0]["content"] or ""
+
+    if section:
+        extracted = extract_section(content, section)
+        if extracted is None:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "message": "Section not found",
+                    "sections": list_sections(content),
+                },
+            )
+        content = extracted
+
+    body = content.encode("utf-8")
+    media_type = "text/markdown" if report.get("is_markdown", True) else "text/plain"
+
+    byte_range = parse_byte_range(request.headers.get("range"), len(body))
+    if byte_range is None:
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+    return Response(
+        content=body[start : end + 1],
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
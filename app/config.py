@@ -26,6 +26,89 @@ class Settings(BaseSettings):
     serper_api_key: str = ""
     rapidapi_key: str = ""
 
+    # Scraper: process pool for HTML -> markdown conversion (0 = use a thread)
+    scraper_process_workers: int = 2
+    scraper_max_queued: int = 16
+
+    # Host health: circuit breaker for outbound requests (unresolvable hosts
+    # open their circuit immediately)
+    host_failure_threshold: int = 2
+    host_cooldown_seconds: float = 60.0
+    host_max_cooldown_seconds: float = 900.0
+    host_error_rate_threshold: float = 0.5
+    host_error_window: int = 10
+
+    # Serper result cache ("memory", "sqlite" or "none"), TTLs in seconds
+    search_cache_backend: str = "memory"
+    search_cache_path: str = ".cache/search_cache.sqlite3"
+    search_cache_max_entries: int = 10000
+    search_cache_ttl_search: float = 24 * 3600
+    search_cache_ttl_news: float = 3600
+    search_cache_ttl_linkedin: float = 30 * 24 * 3600
+
+    # Serper multi-query batching for bulk research
+    serper_batch_enabled: bool = False
+    serper_batch_window_ms: int = 25
+    serper_batch_max_size: int = 100
+
+    # Company-level research shared across leads at the same company
+    company_cache_ttl_seconds: float = 24 * 3600
+
+    # RapidAPI LinkedIn enrichment cache and local daily quota tracking
+    linkedin_cache_path: str = ".cache/linkedin_cache.sqlite3"
+    linkedin_cache_ttl_seconds: float = 14 * 24 * 3600
+    linkedin_cache_max_entries: int = 20000
+    rapidapi_daily_quota: int = 500
+    rapidapi_company_reserve: int = 50
+
+    # Local (name, company, email) -> LinkedIn URL index
+    linkedin_index_path: str = ".cache/linkedin_index.sqlite3"
+
+    # RapidAPI retries (exponential backoff with full jitter)
+    rapidapi_max_attempts: int = 4
+    rapidapi_retry_base_seconds: float = 0.5
+    rapidapi_retry_max_seconds: float = 8.0
+    rapidapi_retry_budget_seconds: float = 45.0
+
+    # Persist research runs through the save_research_results RPC (one atomic
+    # request); False uses one bulk upsert per table instead
+    research_save_use_rpc: bool = True
+
+    # Streaming lead import (POST /api/leads/import)
+    lead_import_batch_size: int = 500
+
+    # Leads per page (and per reports/company_data/outreach query) when
+    # streaming GET /api/leads/export
+    lead_export_batch_size: int = 25
+
+    # Response compression (brotli when brotli-asgi is installed, else gzip)
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # Send database rows with orjson, skipping response_model re-validation
+    fast_json_responses: bool = False
+
+    # In-process lead row cache; writes invalidate, the TTL bounds staleness
+    # from writes made by other workers
+    lead_cache_ttl_seconds: float = 30.0
+    lead_cache_max_entries: int = 10000
+
+    # POST /api/research/start reuses a finished run this recent for the
+    # same person instead of researching again (unless force=true)
+    research_reuse_max_age_seconds: float = 7 * 24 * 3600
+
+    # Full-text search over research ("postgres" or "sqlite" FTS5 for local dev)
+    research_search_backend: str = "postgres"
+    research_search_path: str = ".cache/research_search.sqlite3"
+
+    # Lead lookalikes: embedding provider ("gemini", or "hashing" for local
+    # deterministic vectors) and where vectors are kept between restarts
+    embedding_provider: str = "gemini"
+    embedding_model: str = "gemini-embedding-001"
+    embedding_dimensions: int = 256
+    lead_vectors_path: str = ".cache/lead_vectors.sqlite3"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
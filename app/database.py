@@ -1,27 +1,63 @@
-from supabase import create_client, Client
+import asyncio
+from typing import Optional
+from supabase import acreate_client, AsyncClient
 from app.config import get_settings
 
 
-def get_supabase_client() -> Client:
+_client: Optional[AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def init_supabase() -> AsyncClient:
+    """
+    Create the shared async Supabase client.
+
+    Called once from the app lifespan. The client keeps a pooled HTTP
+    connection to PostgREST that every request and workflow run reuses.
+    """
+    global _client
+
+    async with _client_lock:
+        if _client is None:
+            settings = get_settings()
+            _client = await acreate_client(
+                settings.supabase_url, settings.supabase_service_key
+            )
+
+    return _client
+
+
+async def close_supabase() -> None:
+    """Close the shared client's connections (app shutdown)."""
+    global _client
+
+    if _client is not None:
+        await _client.postgrest.aclose()
+        _client = None
+
+
+async def get_supabase_client() -> AsyncClient:
     """
-    Create and return a Supabase client using settings from the configuration.
+    Return the shared async Supabase client.
+
+    Use as a FastAPI dependency (`Depends(get_supabase_client)`) in routes,
+    or await it directly elsewhere. Falls back to creating the client if
+    the lifespan hasn't (e.g. in scripts).
 
     Returns:
-        Client: Supabase client instance.
+        AsyncClient: Supabase client instance.
     """
-    settings = get_settings()
-    supabase_client = create_client(
-        settings.supabase_url, settings.supabase_service_key
-    )
-    return supabase_client
+    if _client is None:
+        return await init_supabase()
+
+    return _client
 
 
-def get_supabase_admin_client() -> Client:
+async def get_supabase_admin_client() -> AsyncClient:
     """
-    Create and return a Supabase admin client.
+    Return the shared async Supabase admin client.
 
     This uses the service role key which bypasses RLS.
     Use this for admin operations only!
     """
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    return await get_supabase_client()
@@ -1,13 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.routes import leads
 from app.api.routes import research
+from app.api.routes import admin
 from app.config import get_settings
+from app.services.scraper import shutdown_html_pool
+from app.database import init_supabase, close_supabase
+from app.services.embeddings import np
+from app.services.lead_vectors import load_lead_vector_index
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # Optional dependency
+    BrotliMiddleware = None
 
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create shared resources on startup and release them on shutdown.
+    """
+    await init_supabase()
+    if np is not None:
+        # Load stored lead embeddings before requests need them
+        await load_lead_vector_index()
+    yield
+    await close_supabase()
+    shutdown_html_pool()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.app_name,
     debug=settings.debug,
     version="1.0.0",
@@ -25,9 +53,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Existing-Lead", "X-Conflicting-Leads"],
 )
 
 
+# Report payloads are mostly markdown and shrink several-fold compressed
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=settings.compression_brotli_quality,
+        minimum_size=settings.compression_minimum_size,
+        gzip_fallback=True,
+    )
+else:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        compresslevel=settings.compression_gzip_level,
+    )
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -43,6 +88,7 @@ async def health_check():
 
 app.include_router(leads.router, prefix="/api/leads", tags=["leads"])
 app.include_router(research.router, prefix="/api/research", tags=["research"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -54,6 +54,7 @@ class Lead(LeadBase):
     status: str = "new"
     score: Optional[float] = None
     score_details: Optional[Dict[str, Any]] = None
+    research_completed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
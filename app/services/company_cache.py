@@ -0,0 +1,196 @@
+import time
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+from app.config import get_settings
+
+
+T = TypeVar("T")
+
+
+def normalize_domain(url: str) -> str:
+    """
+    Reduce a website URL to its bare domain.
+
+    "https://www.Acme.com/about" and "acme.com" both become "acme.com".
+    """
+    if not url:
+        return ""
+
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"http://{url}"
+
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_linkedin_url(url: str) -> str:
+    """
+    Reduce a LinkedIn URL to its path ("company/acme", "in/jane-doe").
+
+    Scheme, subdomain (www., uk.), query string and trailing slash are dropped.
+    """
+    if not url:
+        return ""
+
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parsed = urlparse(url)
+    if not (parsed.hostname or "").endswith("linkedin.com"):
+        return ""
+
+    return parsed.path.strip("/")
+
+
+def company_keys(website: str = "", linkedin_url: str = "") -> List[str]:
+    """
+    All cache keys that identify a company, most specific first.
+
+    Names aren't keys: unrelated companies share names ("Acme"), so a
+    company known only by name gets no keys and isn't cached.
+    """
+    keys = []
+
+    domain = normalize_domain(website)
+    if domain:
+        keys.append(f"domain:{domain}")
+
+    linkedin_path = normalize_linkedin_url(linkedin_url)
+    if linkedin_path:
+        keys.append(f"linkedin:{linkedin_path}")
+
+    return keys
+
+
+class CompanyResearchStore:
+    """
+    In-process store of company-level research shared across leads.
+
+    Every lead at the same company produces the same website analysis,
+    company profile, blog/news/social analyses and digital presence report.
+    Values are stored per (company key, field) with a staleness TTL and at
+    most `max_entries` entries, least recently used evicted first.
+    Concurrent requests for the same missing value under any of the
+    company's keys share one computation.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 50000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, keys: List[str], field: str) -> Optional[Any]:
+        """Return a fresh value stored under any of the keys, or None."""
+        now = time.time()
+
+        for key in keys:
+            entry = self._entries.get((key, field))
+            if entry is None:
+                continue
+
+            if entry[0] > now:
+                self._entries.move_to_end((key, field))
+                return entry[1]
+
+            del self._entries[(key, field)]
+
+        return None
+
+    def set(self, keys: List[str], field: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl_seconds
+
+        for key in keys:
+            self._entries[(key, field)] = (expires_at, value)
+            self._entries.move_to_end((key, field))
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: List[str]) -> None:
+        """Drop every field stored for the given company keys."""
+        for entry_key in list(self._entries):
+            if entry_key[0] in keys:
+                del self._entries[entry_key]
+
+    async def get_or_compute(
+        self,
+        keys: List[str],
+        field: str,
+        compute: Callable[[], Awaitable[T]],
+        cache_if: Callable[[T], bool] = lambda value: True,
+    ) -> T:
+        """
+        Read a company-level value through the store.
+
+        Args:
+            keys: Company keys from company_keys(); empty disables caching
+            field: Which piece of research this is (e.g. "website")
+            compute: Coroutine factory producing the value on a miss
+            cache_if: Predicate deciding whether a computed value is kept
+                      (e.g. skip error results)
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if not keys:
+            return await compute()
+
+        cached = self.get(keys, field)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        flight_keys = [(key, field) for key in keys]
+        for flight_key in flight_keys:
+            if flight_key in self._inflight:
+                self.hits += 1
+                return await asyncio.shield(self._inflight[flight_key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        for flight_key in flight_keys:
+            self._inflight[flight_key] = future
+
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            for flight_key in flight_keys:
+                if self._inflight.get(flight_key) is future:
+                    del self._inflight[flight_key]
+
+        if cache_if(value):
+            self.set(keys, field, value)
+
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+@lru_cache()
+def get_company_store() -> CompanyResearchStore:
+    """Get the process-wide company research store."""
+    return CompanyResearchStore(ttl_seconds=get_settings().company_cache_ttl_seconds)
@@ -0,0 +1,103 @@
+import re
+import hashlib
+from functools import lru_cache
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from app.config import get_settings
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_rows(vectors):
+    """Scale each row to unit length so a dot product is cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbeddingProvider:
+    """
+    Deterministic local embeddings for development and tests.
+
+    Words and word pairs are hashed (blake2b, so the result is stable across
+    processes) into a fixed number of signed buckets, weighted by log term
+    frequency. Texts sharing vocabulary end up close; there is no semantics
+    beyond that, and no network call.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def _features(self, text: str):
+        words = TOKEN_RE.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+        buckets = np.empty(len(features), dtype=np.int64)
+        signs = np.empty(len(features), dtype=np.float32)
+        for i, feature in enumerate(features):
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(),
+                "little",
+            )
+            buckets[i] = (digest >> 1) % self.dimensions
+            signs[i] = 1.0 if digest & 1 else -1.0
+
+        return buckets, signs
+
+    def embed(self, texts: List[str]):
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            buckets, signs = self._features(text)
+            counts = np.bincount(buckets, weights=signs, minlength=self.dimensions)
+            vectors[row] = np.sign(counts) * np.log1p(np.abs(counts))
+
+        return normalize_rows(vectors)
+
+
+class GeminiEmbeddingProvider:
+    """Embeddings from the Gemini API, truncated to `dimensions` and normalized."""
+
+    def __init__(self, model: str, dimensions: int = 256):
+        self.model = model
+        self.dimensions = dimensions
+        self.name = f"{model}-{dimensions}"
+
+    def embed(self, texts: List[str]):
+        import google.genai as genai
+
+        client = genai.Client(api_key=get_settings().gemini_api_key)
+        result = client.models.embed_content(
+            model=self.model,
+            contents=texts,
+            config=genai.types.EmbedContentConfig(
+                task_type="SEMANTIC_SIMILARITY",
+                output_dimensionality=self.dimensions,
+            ),
+        )
+
+        # Only the full-size output comes normalized
+        return normalize_rows([embedding.values for embedding in result.embeddings])
+
+
+@lru_cache()
+def get_embedding_provider():
+    """Get the configured embedding provider ("gemini" or "hashing")."""
+    if np is None:
+        raise RuntimeError("numpy is required for embeddings")
+
+    settings = get_settings()
+
+    if settings.embedding_provider == "gemini":
+        return GeminiEmbeddingProvider(
+            settings.embedding_model, settings.embedding_dimensions
+        )
+
+    return HashingEmbeddingProvider(settings.embedding_dimensions)
@@ -0,0 +1,397 @@
+import asyncio
+import httpx
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import Optional, List, Set
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import XMLPullParser, ParseError
+from pydantic import BaseModel
+
+from app.services.scraper import REQUEST_HEADERS
+from app.services.host_health import get_host_health
+
+
+FEED_HEADERS = {
+    **REQUEST_HEADERS,
+    "Accept": "application/rss+xml,application/atom+xml,application/xml;q=0.9,text/xml;q=0.8,*/*;q=0.5",
+}
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/feed+json")
+
+# Tried relative to the blog URL and to the site root when no feed is advertised
+FEED_PATHS = ["feed", "rss.xml", "feed.xml", "atom.xml", "rss", "index.xml"]
+
+MAX_FEED_BYTES = 5 * 1024 * 1024
+MAX_POSTS = 500
+
+# Sitemap indexes can nest (or point at themselves); follow at most this deep
+MAX_SITEMAP_DEPTH = 2
+
+
+class FeedPost(BaseModel):
+    """A single post found in a feed or sitemap."""
+
+    title: str = ""
+    link: str = ""
+    published: Optional[datetime] = None
+    categories: List[str] = []
+
+
+class FeedDigest(BaseModel):
+    """Posts collected from a blog's feed or sitemap."""
+
+    source_url: str
+    source_type: str
+    posts: List[FeedPost] = []
+
+    def to_markdown(self, now: Optional[datetime] = None) -> str:
+        """
+        Build a compact digest for the LLM.
+
+        Frequency figures are computed here from exact post dates so the
+        model does not have to guess them from a page of markdown.
+        """
+        now = now or datetime.now(timezone.utc)
+
+        dated = sorted(
+            (post for post in self.posts if post.published),
+            key=lambda post: post.published,
+            reverse=True,
+        )
+
+        parts = [
+            "# Blog Feed Digest",
+            f"Source: {self.source_url} ({self.source_type})",
+            f"Posts found: {len(self.posts)} ({len(dated)} with dates)",
+        ]
+
+        if dated:
+            newest = dated[0].published
+            oldest = dated[-1].published
+
+            parts.append(f"Date range: {oldest.date()} to {newest.date()}")
+            parts.append(
+                f"Last post: {newest.date()} ({(now - newest).days} days ago)"
+            )
+
+            for days in (30, 90, 365):
+                count = sum(1 for post in dated if (now - post.published).days < days)
+                parts.append(f"Posts in last {days} days: {count}")
+
+            if len(dated) > 1:
+                span_days = (newest - oldest).days
+                parts.append(
+                    f"Average days between posts: {span_days / (len(dated) - 1):.1f}"
+                )
+
+            months = Counter(
+                post.published.strftime("%Y-%m")
+                for post in dated
+                if (now - post.published).days < 365
+            )
+            if months:
+                parts.extend(["", "## Posts per month (last 12 months)"])
+                for month in sorted(months, reverse=True):
+                    parts.append(f"- {month}: {months[month]}")
+
+        categories = Counter(
+            category for post in self.posts for category in post.categories
+        )
+        if categories:
+            parts.extend(["", "## Top categories"])
+            for category, count in categories.most_common(10):
+                parts.append(f"- {category} ({count})")
+
+        parts.extend(["", "## Recent posts"])
+        recent = dated[:15] if dated else self.posts[:15]
+        for post in recent:
+            date = post.published.date() if post.published else "undated"
+            parts.append(f"- {date} — {post.title or post.link}")
+
+        return "\n".join(parts)
+
+
+class _FeedLinkParser(HTMLParser):
+    """Collects <link rel="alternate"> feed URLs from an HTML document head."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+        self.feed_urls: List[str] = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+            return
+
+        if tag != "link":
+            return
+
+        attributes = {key: (value or "") for key, value in attrs}
+        rel = attributes.get("rel", "").lower().split()
+        link_type = attributes.get("type", "").lower()
+
+        if "alternate" in rel and link_type in FEED_TYPES and attributes.get("href"):
+            self.feed_urls.append(urljoin(self.base_url, attributes["href"]))
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element, *names: str) -> str:
+    """Return the text of the first direct child matching one of the names."""
+    for child in element:
+        if _local_name(child.tag) in names and child.text:
+            return child.text.strip()
+    return ""
+
+
+def parse_feed_date(value: str) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) and ISO 8601 (Atom, sitemap) dates."""
+    if not value:
+        return None
+
+    value = value.strip()
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+def _slug_title(url: str) -> str:
+    """Turn the last path segment of a URL into a readable title."""
+    slug = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+    return slug.replace("-", " ").replace("_", " ").strip().capitalize()
+
+
+async def _discover_feed_links(client: httpx.AsyncClient, page_url: str) -> List[str]:
+    """
+    Read a page only until the end of its <head> and return advertised feeds.
+    """
+    parser = _FeedLinkParser(page_url)
+    host_health = get_host_health()
+
+    try:
+        host_health.check(page_url)
+
+        async with client.stream("GET", page_url, headers=REQUEST_HEADERS) as response:
+            host_health.record_response(page_url, response.status_code)
+            if response.status_code != 200:
+                return []
+
+            async for chunk in response.aiter_text():
+                parser.feed(chunk)
+                if parser.done:
+                    break
+    except httpx.HTTPError as e:
+        host_health.record_error(page_url, e)
+        return []
+
+    return parser.feed_urls
+
+
+async def _stream_xml(
+    client: httpx.AsyncClient,
+    url: str,
+    visited: Optional[Set[str]] = None,
+    depth: int = 0,
+) -> Optional[FeedDigest]:
+    """
+    Fetch a feed or sitemap and parse it incrementally as bytes arrive.
+
+    Args:
+        visited: Sitemap URLs already fetched while following an index
+        depth: How many sitemap indexes led here
+
+    Returns None if the URL is not a parseable RSS/Atom feed or sitemap.
+    """
+    visited = visited if visited is not None else set()
+    visited.add(url)
+
+    parser = XMLPullParser(events=("start", "end"))
+    root_type = ""
+    posts: List[FeedPost] = []
+    child_sitemaps: List[str] = []
+    received = 0
+    host_health = get_host_health()
+
+    try:
+        host_health.check(url)
+
+        async with client.stream("GET", url, headers=FEED_HEADERS) as response:
+            host_health.record_response(url, response.status_code)
+            if response.status_code != 200:
+                return None
+
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                parser.feed(chunk)
+
+                for event, element in parser.read_events():
+                    name = _local_name(element.tag)
+
+                    if event == "start":
+                        if not root_type:
+                            root_type = name
+                            if root_type not in ("rss", "rdf", "feed", "urlset", "sitemapindex"):
+                                return None
+                        continue
+
+                    if name in ("item", "entry"):
+                        link = _child_text(element, "link")
+                        if not link:
+                            for child in element:
+                                if _local_name(child.tag) == "link" and child.get("href"):
+                                    link = child.get("href")
+                                    break
+
+                        categories = [
+                            child.text.strip() if child.text else child.get("term", "")
+                            for child in element
+                            if _local_name(child.tag) in ("category", "subject")
+                        ]
+
+                        posts.append(
+                            FeedPost(
+                                title=_child_text(element, "title"),
+                                link=link,
+                                published=parse_feed_date(
+                                    _child_text(element, "pubdate", "published", "date", "updated")
+                                ),
+                                categories=[c for c in categories if c],
+                            )
+                        )
+                        element.clear()
+
+                    elif name == "url" and root_type == "urlset":
+                        loc = _child_text(element, "loc")
+                        if loc:
+                            posts.append(
+                                FeedPost(
+                                    title=_slug_title(loc),
+                                    link=loc,
+                                    published=parse_feed_date(_child_text(element, "lastmod")),
+                                )
+                            )
+                        element.clear()
+
+                    elif name == "sitemap" and root_type == "sitemapindex":
+                        loc = _child_text(element, "loc")
+                        if loc:
+                            child_sitemaps.append(loc)
+                        element.clear()
+
+                if len(posts) >= MAX_POSTS or received >= MAX_FEED_BYTES:
+                    break
+    except (httpx.HTTPError, ParseError) as e:
+        if isinstance(e, httpx.HTTPError):
+            host_health.record_error(url, e)
+        if not posts and not child_sitemaps:
+            return None
+
+    if root_type == "sitemapindex":
+        if depth >= MAX_SITEMAP_DEPTH:
+            return None
+        return await _follow_sitemap_index(client, child_sitemaps, visited, depth + 1)
+
+    if not posts:
+        return None
+
+    source_type = "sitemap" if root_type == "urlset" else f"{root_type} feed"
+    return FeedDigest(source_url=url, source_type=source_type, posts=posts)
+
+
+async def _follow_sitemap_index(
+    client: httpx.AsyncClient, sitemaps: List[str], visited: Set[str], depth: int
+) -> Optional[FeedDigest]:
+    """Pick the post/blog sitemap out of a sitemap index."""
+    sitemaps = [loc for loc in dict.fromkeys(sitemaps) if loc not in visited]
+    preferred = [
+        loc
+        for loc in sitemaps
+        if any(word in loc.lower() for word in ("post", "blog", "article", "news"))
+    ]
+
+    for loc in (preferred or sitemaps)[:3]:
+        digest = await _stream_xml(client, loc, visited, depth)
+        if digest and digest.source_type == "sitemap":
+            return digest
+
+    return None
+
+
+def _filter_sitemap_posts(digest: FeedDigest, blog_url: str) -> Optional[FeedDigest]:
+    """Keep only sitemap entries that live under the blog path."""
+    blog_path = urlparse(blog_url).path.rstrip("/")
+
+    if blog_path:
+        digest.posts = [
+            post
+            for post in digest.posts
+            if urlparse(post.link).path.startswith(blog_path + "/")
+        ]
+
+    return digest if digest.posts else None
+
+
+async def fetch_feed_digest(blog_url: str) -> Optional[FeedDigest]:
+    """
+    Find and parse a blog's RSS/Atom feed, falling back to its sitemap.
+
+    Discovery order:
+        1. <link rel="alternate"> feeds advertised by the blog page
+        2. Common feed paths under the blog and the site root (/feed, /rss.xml, ...)
+        3. /sitemap.xml, filtered to URLs under the blog path
+
+    Returns:
+        FeedDigest, or None when no feed or usable sitemap exists
+    """
+    parsed = urlparse(blog_url)
+    site_root = f"{parsed.scheme}://{parsed.netloc}/"
+    blog_base = blog_url.rstrip("/") + "/"
+
+    timeout = httpx.Timeout(10.0, connect=5.0)
+
+    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
+        for feed_url in await _discover_feed_links(client, blog_url):
+            digest = await _stream_xml(client, feed_url)
+            if digest:
+                return digest
+
+        candidates: List[str] = []
+        for base in (blog_base, site_root):
+            for path in FEED_PATHS:
+                candidate = urljoin(base, path)
+                if candidate not in candidates:
+                    candidates.append(candidate)
+
+        results = await asyncio.gather(
+            *(_stream_xml(client, candidate) for candidate in candidates)
+        )
+        for digest in results:
+            if digest:
+                return digest
+
+        sitemap = await _stream_xml(client, urljoin(site_root, "sitemap.xml"))
+        if sitemap and sitemap.source_type == "sitemap":
+            return _filter_sitemap_posts(sitemap, blog_url)
+
+    return None
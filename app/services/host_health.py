@@ -0,0 +1,230 @@
+import time
+import socket
+import asyncio
+import httpx
+from collections import deque
+from functools import lru_cache
+from typing import Dict
+from urllib.parse import urlparse
+
+from app.config import get_settings
+
+
+class HostUnavailableError(httpx.RequestError):
+    """
+    Raised instead of sending a request to a host whose circuit is open.
+
+    Subclasses httpx.RequestError so existing `except httpx.HTTPError`
+    handlers treat it like any other failed request.
+    """
+
+
+class HostState:
+    """Health bookkeeping for a single host."""
+
+    def __init__(self, window: int):
+        self.consecutive_failures = 0
+        self.recent_statuses: deque = deque(maxlen=window)
+        self.open_until = 0.0
+        self.cooldown = 0.0
+        self.probing = False
+        self.reason = ""
+
+
+class HostHealthRegistry:
+    """
+    Per-host circuit breaker shared by all outbound HTTP calls.
+
+    A host's circuit opens when:
+    - its name does not resolve (immediately, so the failed lookup is
+      cached for the cooldown; successful lookups are left to httpx and
+      the system resolver, which this registry doesn't see)
+    - it fails at the transport level (timeouts, refused connections)
+      `failure_threshold` times in a row
+    - the share of 5xx responses in its recent window reaches
+      `error_rate_threshold`
+
+    While open, requests fail fast with HostUnavailableError. After the
+    cooldown a single probe request is let through; success closes the
+    circuit, failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 2,
+        cooldown_seconds: float = 60.0,
+        max_cooldown_seconds: float = 900.0,
+        error_rate_threshold: float = 0.5,
+        error_window: int = 10,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.error_rate_threshold = error_rate_threshold
+        self.error_window = error_window
+
+        self._hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        if host not in self._hosts:
+            self._hosts[host] = HostState(self.error_window)
+        return self._hosts[host]
+
+    def _open(self, host: str, reason: str) -> None:
+        state = self._state(host)
+
+        if state.cooldown:
+            state.cooldown = min(state.cooldown * 2, self.max_cooldown_seconds)
+        else:
+            state.cooldown = self.cooldown_seconds
+
+        state.open_until = time.monotonic() + state.cooldown
+        state.probing = False
+        state.reason = reason
+        print(f"⚠️ Circuit open for {host} ({reason}), cooling down {state.cooldown:.0f}s")
+
+    def _close(self, host: str) -> None:
+        state = self._state(host)
+        state.consecutive_failures = 0
+        state.open_until = 0.0
+        state.cooldown = 0.0
+        state.probing = False
+        state.reason = ""
+
+    def is_open(self, host: str) -> bool:
+        state = self._hosts.get(host)
+        return bool(state and state.open_until > time.monotonic())
+
+    def check(self, url: str) -> None:
+        """
+        Raise HostUnavailableError if the URL's host should not be contacted
+        (its circuit is open, including after a DNS failure).
+        """
+        host = host_of(url)
+        state = self._hosts.get(host)
+
+        if not state or not state.open_until:
+            return
+
+        if state.open_until > time.monotonic() or state.probing:
+            raise HostUnavailableError(
+                f"{host} is unavailable ({state.reason}), skipping request"
+            )
+
+        # Cooldown elapsed: let this request through as the probe
+        state.probing = True
+
+    def record_response(self, url: str, status_code: int) -> None:
+        """Record an HTTP response; 5xx responses count toward the error rate."""
+        host = host_of(url)
+        state = self._state(host)
+
+        state.consecutive_failures = 0
+        state.recent_statuses.append(status_code >= 500)
+
+        errors = sum(state.recent_statuses)
+        samples = len(state.recent_statuses)
+
+        if (
+            samples >= min(4, self.error_window)
+            and errors / samples >= self.error_rate_threshold
+        ):
+            state.recent_statuses.clear()
+            self._open(host, f"{errors}/{samples} recent responses were 5xx")
+        elif status_code < 500 and state.open_until:
+            self._close(host)
+        elif status_code >= 500 and state.probing:
+            self._open(host, f"probe returned HTTP {status_code}")
+
+    def record_error(self, url: str, error: Exception) -> None:
+        """Record a transport-level failure (timeout, refused or reset connection)."""
+        if isinstance(error, HostUnavailableError):
+            return
+
+        host = host_of(url)
+        state = self._state(host)
+
+        if not isinstance(error, httpx.TransportError):
+            # Not the host's fault (e.g. too many redirects); free the probe slot
+            state.probing = False
+            return
+
+        state.consecutive_failures += 1
+
+        if _is_dns_failure(error):
+            self._open(host, "DNS failure")
+        elif state.probing or state.consecutive_failures >= self.failure_threshold:
+            self._open(host, type(error).__name__)
+
+    async def request(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through the breaker, recording its outcome.
+
+        Raises:
+            HostUnavailableError: If the host's circuit is open
+            httpx.HTTPError: Whatever the underlying request raised
+        """
+        self.check(url)
+
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.record_error(url, e)
+            raise
+        except asyncio.CancelledError:
+            # A cancelled probe must not leave the circuit stuck half-open
+            self._state(host_of(url)).probing = False
+            raise
+
+        self.record_response(url, response.status_code)
+        return response
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Current state of every host that has an open or recently open circuit."""
+        now = time.monotonic()
+        return {
+            host: {
+                "open": state.open_until > now,
+                "retry_in_seconds": max(0.0, round(state.open_until - now, 1)),
+                "reason": state.reason,
+                "consecutive_failures": state.consecutive_failures,
+            }
+            for host, state in self._hosts.items()
+            if state.open_until or state.consecutive_failures
+        }
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased host name of a URL."""
+    return (urlparse(url).hostname or "").lower()
+
+
+def _is_dns_failure(error: BaseException) -> bool:
+    """Whether a connect error was caused by the host name not resolving."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, socket.gaierror):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+@lru_cache()
+def get_host_health() -> HostHealthRegistry:
+    """
+    Get the process-wide host health registry.
+
+    Using lru_cache so every service shares the same circuits.
+    """
+    settings = get_settings()
+
+    return HostHealthRegistry(
+        failure_threshold=settings.host_failure_threshold,
+        cooldown_seconds=settings.host_cooldown_seconds,
+        max_cooldown_seconds=settings.host_max_cooldown_seconds,
+        error_rate_threshold=settings.host_error_rate_threshold,
+        error_window=settings.host_error_window,
+    )
@@ -0,0 +1,148 @@
+import time
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import get_settings
+
+
+def _key(lead_id) -> str:
+    """UUIDs compare case-insensitively; so do cache keys."""
+    return str(lead_id).strip().lower()
+
+
+class LeadCache:
+    """
+    In-process read-through cache of lead rows keyed by lead id.
+
+    The dashboard polls a lead's status every few seconds while research
+    runs, and the lead, status and start-research routes all read the same
+    row. Every write path invalidates the lead, so reads see their own
+    writes; the TTL only bounds staleness from writes made by other
+    processes. Concurrent misses for the same lead share one query.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}  # Invalidations during a load
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, lead_id: str) -> Optional[Dict[str, Any]]:
+        lead_id = _key(lead_id)
+        entry = self._entries.get(lead_id)
+        if entry is None:
+            return None
+
+        if entry[0] <= time.time():
+            del self._entries[lead_id]
+            return None
+
+        self._entries.move_to_end(lead_id)
+        return dict(entry[1])
+
+    def set(self, lead_id: str, row: Dict[str, Any]) -> None:
+        lead_id = _key(lead_id)
+        self._entries[lead_id] = (time.time() + self.ttl_seconds, dict(row))
+        self._entries.move_to_end(lead_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, lead_id: str) -> None:
+        """
+        Drop a lead after it was written.
+
+        A load already in flight for this lead still returns to its callers
+        but isn't stored, since it may have read the row before the write.
+        """
+        lead_id = _key(lead_id)
+        self._entries.pop(lead_id, None)
+
+        if lead_id in self._inflight:
+            self._generations[lead_id] = self._generations.get(lead_id, 0) + 1
+
+    async def get_or_load(
+        self,
+        lead_id: str,
+        load: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached lead row, loading it on a miss.
+
+        Args:
+            lead_id: Lead id
+            load: Coroutine factory fetching the row (None if not found)
+
+        Returns:
+            A copy of the row, or None if the lead doesn't exist
+        """
+        lead_id = _key(lead_id)
+
+        cached = self.get(lead_id)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        if lead_id in self._inflight:
+            self.hits += 1
+            row = await asyncio.shield(self._inflight[lead_id])
+            return dict(row) if row is not None else None
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[lead_id] = future
+
+        try:
+            row = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(lead_id, None)
+            invalidated = self._generations.pop(lead_id, 0)
+
+        if row is not None and not invalidated:
+            self.set(lead_id, row)
+
+        future.set_result(row)
+        return dict(row) if row is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+@lru_cache()
+def get_lead_cache() -> LeadCache:
+    """Get the process-wide lead cache."""
+    settings = get_settings()
+    return LeadCache(
+        ttl_seconds=settings.lead_cache_ttl_seconds,
+        max_entries=settings.lead_cache_max_entries,
+    )
+
+
+async def get_cached_lead(supabase, lead_id: str) -> Optional[Dict[str, Any]]:
+    """Read a lead row through the lead cache."""
+
+    async def load():
+        result = (
+            await supabase.table("leads").select("*").eq("id", str(lead_id)).execute()
+        )
+        return result.data[0] if result.data else None
+
+    return await get_lead_cache().get_or_load(lead_id, load)
@@ -0,0 +1,147 @@
+import json
+import zlib
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.api.pagination import apply_keyset, encode_cursor
+from app.services.report_store import hydrate_reports
+
+
+# Rows per child-table request; must not exceed PostgREST's max-rows
+# (1000 on Supabase), or a capped page would look like the last one
+CHILD_PAGE_SIZE = 1000
+
+
+async def _fetch_all(
+    supabase, table: str, lead_ids: List[str], order: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Every `table` row for these leads, paged with .range() until a short page.
+
+    `order` must be unique per row so pages neither overlap nor skip rows.
+    """
+    rows: List[Dict[str, Any]] = []
+
+    while True:
+        query = supabase.table(table).select("*").in_("lead_id", lead_ids)
+        for column in order:
+            query = query.order(column)
+
+        result = await query.range(
+            len(rows), len(rows) + CHILD_PAGE_SIZE - 1
+        ).execute()
+        page = result.data or []
+        rows += page
+
+        if len(page) < CHILD_PAGE_SIZE:
+            return rows
+
+
+def _group_by_lead(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault(str(row["lead_id"]), []).append(row)
+    return grouped
+
+
+async def iter_export_records(
+    supabase,
+    status: Optional[List[str]] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    batch_size: int = 25,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Walk matching leads with their research attached.
+
+    Leads are read a page at a time with keyset pagination. Each page's
+    reports, company_data and outreach_materials are fetched concurrently
+    with one `lead_id IN (...)` query per table (paged in
+    CHILD_PAGE_SIZE rows, so reruns that pile up reports aren't cut off
+    at PostgREST's row limit), and only one page is in memory.
+
+    Yields:
+        Lead dicts with "company_data", "reports" and "outreach_materials"
+    """
+    cursor = None
+
+    while True:
+        query = supabase.table("leads").select("*")
+
+        if status:
+            query = query.in_("status", status)
+        if created_from:
+            query = query.gte("created_at", created_from)
+        if created_to:
+            query = query.lt("created_at", created_to)
+        if min_score is not None:
+            query = query.gte("score", min_score)
+        if max_score is not None:
+            query = query.lte("score", max_score)
+
+        result = await apply_keyset(query, cursor).limit(batch_size).execute()
+        leads = result.data or []
+        if not leads:
+            return
+
+        lead_ids = [str(lead["id"]) for lead in leads]
+
+        reports, company_data, outreach = await asyncio.gather(
+            _fetch_all(supabase, "reports", lead_ids, ["created_at", "id"]),
+            _fetch_all(supabase, "company_data", lead_ids, ["id"]),
+            _fetch_all(
+                supabase, "outreach_materials", lead_ids, ["created_at", "id"]
+            ),
+        )
+
+        reports_by_lead = _group_by_lead(await hydrate_reports(supabase, reports))
+        company_by_lead = _group_by_lead(company_data)
+        outreach_by_lead = _group_by_lead(outreach)
+
+        for lead in leads:
+            lead_id = str(lead["id"])
+            company = company_by_lead.get(lead_id)
+
+            yield {
+                **lead,
+                "company_data": company[0] if company else None,
+                "reports": reports_by_lead.get(lead_id, []),
+                "outreach_materials": outreach_by_lead.get(lead_id, []),
+            }
+
+        if len(leads) < batch_size:
+            return
+
+        cursor = encode_cursor(leads[-1])
+
+
+async def iter_ndjson(
+    records: AsyncIterator[Dict[str, Any]], compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Encode records as NDJSON, optionally as a gzip stream.
+
+    Lines are buffered up to ~64KB before being yielded so the response
+    isn't sent one tiny chunk per lead.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer = bytearray()
+
+    async for record in records:
+        buffer += json.dumps(record, default=str).encode("utf-8")
+        buffer += b"\n"
+
+        if len(buffer) >= 64 * 1024:
+            chunk = bytes(buffer)
+            buffer.clear()
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()
+    elif buffer:
+        yield bytes(buffer)
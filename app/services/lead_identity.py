@@ -0,0 +1,292 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.company_cache import normalize_domain, normalize_linkedin_url
+from app.services.lead_vectors import copy_lead_embedding
+from app.services.research_search import copy_research_index
+from app.workflow.persistence import idempotency_key
+
+
+# Fields copied onto an existing lead when a duplicate brings a value it lacks
+MERGE_FIELDS = (
+    "email",
+    "phone",
+    "address",
+    "company_name",
+    "company_website",
+    "company_linkedin_url",
+    "linkedin_url",
+)
+
+
+# Lead statuses set once a research run has finished
+RESEARCHED_STATUSES = ("qualified", "not_qualified", "outreach_ready")
+
+
+def lead_identity_keys(lead: Dict[str, Any]) -> List[str]:
+    """
+    Keys that identify the same person across lists.
+
+    Email, LinkedIn profile, or name at a company domain, whichever are known.
+    The lead_identities backfill in the migration mirrors these rules.
+    """
+    keys = []
+
+    if lead.get("email"):
+        keys.append(f"email:{lead['email'].strip().lower()}")
+
+    linkedin_path = normalize_linkedin_url(lead.get("linkedin_url") or "")
+    if linkedin_path:
+        keys.append(f"linkedin:{linkedin_path}")
+
+    domain = normalize_domain(lead.get("company_website") or "")
+    name = " ".join((lead.get("name") or "").lower().split())
+    if domain and name:
+        keys.append(f"name:{name}@{domain}")
+
+    return keys
+
+
+async def find_existing_leads(supabase, keys: Iterable[str]) -> Dict[str, str]:
+    """
+    Look up identity keys in lead_identities.
+
+    Returns:
+        {key: lead_id} for the keys that already belong to a lead
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    result = (
+        await supabase.table("lead_identities")
+        .select("key, lead_id")
+        .in_("key", keys)
+        .execute()
+    )
+
+    return {row["key"]: str(row["lead_id"]) for row in result.data or []}
+
+
+async def record_identities(supabase, pairs: List[Tuple[str, str]]) -> None:
+    """Register (key, lead_id) pairs. Keys already taken keep their lead."""
+    owners: Dict[str, str] = {}
+    for key, lead_id in pairs:
+        owners.setdefault(key, lead_id)
+
+    rows = [{"key": key, "lead_id": lead_id} for key, lead_id in owners.items()]
+    if rows:
+        await supabase.table("lead_identities").upsert(
+            rows, on_conflict="key", ignore_duplicates=True
+        ).execute()
+
+
+def first_match(keys: List[str], existing: Dict[str, str]) -> Optional[str]:
+    """The existing lead owning the most specific of `keys`, if any."""
+    return next((existing[key] for key in keys if key in existing), None)
+
+
+def merge_updates(existing: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields the incoming duplicate can fill in on the existing lead."""
+    return {
+        field: incoming[field]
+        for field in MERGE_FIELDS
+        if incoming.get(field) and not existing.get(field)
+    }
+
+
+async def insert_leads_deduplicated(
+    supabase, leads: List[Dict[str, Any]]
+) -> List[Optional[str]]:
+    """
+    Insert leads whose identity keys aren't already taken.
+
+    One lookup and at most one insert and one identity upsert per call,
+    however many leads are passed.
+
+    Returns:
+        For each lead, None if it was inserted or the id of the existing
+        lead it duplicates
+    """
+    lead_keys = [lead_identity_keys(lead) for lead in leads]
+    existing = await find_existing_leads(
+        supabase, (key for keys in lead_keys for key in keys)
+    )
+
+    matches = [first_match(keys, existing) for keys in lead_keys]
+    new = [
+        (lead, keys)
+        for lead, keys, match in zip(leads, lead_keys, matches)
+        if not match
+    ]
+
+    if new:
+        result = (
+            await supabase.table("leads").insert([lead for lead, _ in new]).execute()
+        )
+        await record_identities(
+            supabase,
+            [
+                (key, str(row["id"]))
+                for row, (_, keys) in zip(result.data or [], new)
+                for key in keys
+            ],
+        )
+
+    return matches
+
+
+async def replace_identities(
+    supabase, lead_id: str, keys: List[str]
+) -> Dict[str, str]:
+    """
+    Make `keys` the lead's identity keys, dropping the ones it no longer has.
+
+    Keys owned by another lead are left with that lead.
+
+    Returns:
+        {key: other lead_id} for keys this lead could not take
+    """
+    lead_id = str(lead_id)
+    owners = await find_existing_leads(supabase, keys)
+    conflicts = {key: owner for key, owner in owners.items() if owner != lead_id}
+
+    await supabase.table("lead_identities").delete().eq("lead_id", lead_id).execute()
+    await record_identities(
+        supabase, [(key, lead_id) for key in keys if key not in conflicts]
+    )
+
+    return conflicts
+
+
+def _parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def find_fresh_research(
+    supabase, lead: Dict[str, Any], max_age_seconds: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Find a finished research run for this person that is still fresh.
+
+    Checks the lead itself and any other lead sharing one of its identity
+    keys (e.g. duplicates created before the identity index existed).
+    Age is measured from research_completed_at, so edits to a lead don't
+    make old research look new.
+
+    Returns:
+        The most recently researched matching lead row, or None
+    """
+    lead_ids = {str(lead["id"])}
+    owners = await find_existing_leads(supabase, lead_identity_keys(lead))
+    lead_ids.update(owners.values())
+
+    result = (
+        await supabase.table("leads")
+        .select("id, status, score, score_details, research_completed_at")
+        .in_("id", sorted(lead_ids))
+        .in_("status", list(RESEARCHED_STATUSES))
+        .not_.is_("research_completed_at", "null")
+        .order("research_completed_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+
+    if not result.data:
+        return None
+
+    row = result.data[0]
+    researched_at = _parse_timestamp(row["research_completed_at"])
+    age = (datetime.now(timezone.utc) - researched_at).total_seconds()
+    return row if age <= max_age_seconds else None
+
+
+async def _latest_rows(
+    supabase, table: str, lead_id: str, kind: str
+) -> List[Dict[str, Any]]:
+    """The newest row of each `kind` (report or material type) a lead has."""
+    result = (
+        await supabase.table(table)
+        .select("*")
+        .eq("lead_id", lead_id)
+        .order("created_at", desc=True)
+        .execute()
+    )
+
+    latest: Dict[str, Dict[str, Any]] = {}
+    for row in result.data or []:
+        latest.setdefault(row[kind], row)
+
+    return list(latest.values())
+
+
+async def copy_research(
+    supabase, source: Dict[str, Any], target: Dict[str, Any]
+) -> None:
+    """
+    Give `target` the research result of `source` (a lead for the same person).
+
+    Copies the newest report of each type, the newest outreach material of
+    each type and the company data, then status, score and
+    research_completed_at onto the target lead. The lead is updated last,
+    so a failure part way never leaves it marked researched without its
+    reports, and copies carry idempotency keys, so a retry adds only what
+    is missing. Report bodies live in report_contents, so copied reports
+    only reference them. Finally the target is added to research search
+    and lookalikes.
+    """
+    source_id, target_id = str(source["id"]), str(target["id"])
+
+    for table, kind in (
+        ("reports", "report_type"),
+        ("outreach_materials", "material_type"),
+    ):
+        rows = [
+            {
+                **{k: v for k, v in row.items() if k not in ("id", "created_at")},
+                "lead_id": target_id,
+                "user_id": target.get("user_id") or row.get("user_id"),
+                "idempotency_key": idempotency_key("copy", row["id"], target_id),
+            }
+            for row in await _latest_rows(supabase, table, source_id, kind)
+        ]
+        if rows:
+            await supabase.table(table).upsert(
+                rows, on_conflict="idempotency_key", ignore_duplicates=True
+            ).execute()
+
+    company = (
+        await supabase.table("company_data")
+        .select("*")
+        .eq("lead_id", source_id)
+        .limit(1)
+        .execute()
+    )
+    if company.data:
+        row = {
+            k: v for k, v in company.data[0].items() if k not in ("id", "created_at")
+        }
+        await supabase.table("company_data").upsert(
+            {**row, "lead_id": target_id}, on_conflict="lead_id"
+        ).execute()
+
+    await supabase.table("leads").update(
+        {
+            "status": source["status"],
+            "score": source.get("score"),
+            "score_details": source.get("score_details"),
+            "research_completed_at": source["research_completed_at"],
+        }
+    ).eq("id", target_id).execute()
+
+    # The research is copied; failing to index it only costs discoverability
+    try:
+        await copy_research_index(supabase, source_id, target_id)
+    except Exception as e:
+        print(f"⚠️ Search index error for lead {target_id}: {e}")
+
+    try:
+        await copy_lead_embedding(supabase, source_id, target)
+    except Exception as e:
+        print(f"⚠️ Embedding index error for lead {target_id}: {e}")
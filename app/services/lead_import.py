@@ -0,0 +1,301 @@
+import csv
+import json
+import codecs
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.models.lead import LeadCreate
+from app.services.lead_identity import lead_identity_keys
+
+
+# Common CRM export headers mapped onto LeadCreate fields
+COLUMN_ALIASES = {
+    "full_name": "name",
+    "contact_name": "name",
+    "email_address": "email",
+    "phone_number": "phone",
+    "company": "company_name",
+    "organization": "company_name",
+    "website": "company_website",
+    "company_url": "company_website",
+    "linkedin": "linkedin_url",
+    "linkedin_profile": "linkedin_url",
+    "company_linkedin": "company_linkedin_url",
+}
+
+LEAD_COLUMNS = set(LeadCreate.model_fields)
+
+MAX_REPORTED_ERRORS = 1000
+
+# Lines one CSV record may span before an unclosed quote is treated as a stray
+MAX_RECORD_LINES = 100
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream as UTF-8 and yield it line by line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+
+        # The last piece is an incomplete line; keep it for the next chunk
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse CSV lines into dicts keyed by the header row.
+
+    A quoted field can contain newlines, so lines are joined until the
+    record has an even number of quote characters before parsing it. A
+    record still open after MAX_RECORD_LINES lines, or at the end of the
+    file, has a stray quote: it yields an {"_error": ...} row and the lines
+    after its first are read again as new records, so one bad row can't
+    swallow the rest of the file.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    record: List[str] = []
+    quotes = 0
+
+    def records(final: bool):
+        """Complete records from the pending lines; None for a stray quote."""
+        nonlocal record, quotes
+
+        while pending or (final and record):
+            if pending:
+                line = pending.pop(0)
+                record.append(line)
+                quotes += line.count('"')
+
+                if quotes % 2 and len(record) < MAX_RECORD_LINES:
+                    continue
+
+            if quotes % 2:
+                pending[:0] = record[1:]
+                record, quotes = [], 0
+                yield None
+                continue
+
+            text = "".join(record)
+            record, quotes = [], 0
+            yield next(csv.reader([text]), [])
+
+    async def parsed(final: bool):
+        nonlocal header
+
+        for values in records(final):
+            if values is None:
+                if header is not None:
+                    yield {"_error": "Unterminated quoted field"}
+                continue
+
+            if not any(value.strip() for value in values):
+                continue
+
+            if header is None:
+                header = [normalize_column(value) for value in values]
+                continue
+
+            yield dict(zip(header, values))
+
+    async for line in lines:
+        pending.append(line)
+        async for row in parsed(final=False):
+            yield row
+
+    async for row in parsed(final=True):
+        yield row
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Parse one JSON object per line. Invalid lines yield an {"_error": ...} row."""
+    async for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"_error": f"Invalid JSON: {e.msg}"}
+            continue
+
+        if not isinstance(row, dict):
+            yield {"_error": "Expected a JSON object"}
+            continue
+
+        yield {normalize_column(key): value for key, value in row.items()}
+
+
+def normalize_column(name: str) -> str:
+    column = "_".join(str(name).strip().lower().replace("-", " ").split())
+    return COLUMN_ALIASES.get(column, column)
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep LeadCreate columns, trim strings and turn blanks into None."""
+    lead = {}
+
+    for column, value in row.items():
+        if column not in LEAD_COLUMNS:
+            continue
+
+        if isinstance(value, str):
+            value = " ".join(value.split()) or None
+
+        lead[column] = value
+
+    if lead.get("email"):
+        lead["email"] = lead["email"].lower()
+
+    return lead
+
+
+class ImportReport:
+    """Running totals and per-row errors for one import."""
+
+    def __init__(self, max_errors: int = MAX_REPORTED_ERRORS):
+        self.max_errors = max_errors
+        self.received = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.existing = 0
+        self.failed = 0
+        self.aborted: Optional[str] = None
+        self.errors: List[Dict[str, Any]] = []
+        self.linked: List[Dict[str, Any]] = []
+
+    def error(self, row: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": messages})
+
+    def link(self, row: int, lead_id: str) -> None:
+        """Row matched a lead that was already in the database."""
+        self.existing += 1
+        if len(self.linked) < self.max_errors:
+            self.linked.append({"row": row, "lead_id": lead_id})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "existing": self.existing,
+            "failed": self.failed,
+            "aborted": self.aborted,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "linked": self.linked,
+        }
+
+
+async def import_leads(
+    rows: AsyncIterator[Dict[str, Any]],
+    insert_batch: Callable[[List[Dict[str, Any]]], Awaitable[List[Optional[str]]]],
+    user_id: str,
+    batch_size: int = 500,
+) -> Dict[str, Any]:
+    """
+    Validate, dedupe and insert a stream of lead rows.
+
+    Rows are inserted in batches of `batch_size`. At most one batch is
+    being written while the next one is parsed; reading pauses until that
+    write finishes, so a slow database throttles the upload instead of
+    rows piling up in memory.
+
+    Args:
+        rows: Parsed rows (iter_csv_rows / iter_ndjson_rows)
+        insert_batch: Coroutine inserting a list of lead dicts, returning for
+                      each lead None if inserted or the id of the existing
+                      lead it duplicates (insert_leads_deduplicated)
+        user_id: Owner of the imported leads
+        batch_size: Rows per insert
+
+    Returns:
+        The ImportReport as a dict. Row numbers are 1-based data rows;
+        "duplicates" repeat an earlier row of the same file, "existing"
+        (listed in "linked") match a lead already in the database. If
+        reading the upload fails part way, rows before the failure are
+        still written and counted, and "aborted" says where it stopped.
+    """
+    report = ImportReport()
+    seen = set()
+    batch: List[Dict[str, Any]] = []
+    batch_rows: List[int] = []
+    inflight: Optional[asyncio.Task] = None
+
+    async def write(leads, row_numbers):
+        try:
+            matches = await insert_batch(leads)
+        except Exception as e:
+            for row_number in row_numbers:
+                report.error(row_number, [f"Insert failed: {e}"])
+            return
+
+        for row_number, existing_id in zip(row_numbers, matches):
+            if existing_id:
+                report.link(row_number, existing_id)
+            else:
+                report.inserted += 1
+
+    try:
+        async for row in rows:
+            report.received += 1
+            row_number = report.received
+
+            if "_error" in row:
+                report.error(row_number, [row["_error"]])
+                continue
+
+            try:
+                lead = LeadCreate.model_validate(normalize_row(row)).model_dump()
+            except ValidationError as e:
+                messages = [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+                report.error(row_number, messages)
+                continue
+
+            keys = lead_identity_keys(lead)
+            if any(key in seen for key in keys):
+                report.duplicates += 1
+                continue
+            seen.update(keys)
+
+            lead["user_id"] = user_id
+            batch.append(lead)
+            batch_rows.append(row_number)
+
+            if len(batch) >= batch_size:
+                if inflight:
+                    await inflight
+                inflight = asyncio.create_task(write(batch, batch_rows))
+                batch, batch_rows = [], []
+
+    except asyncio.CancelledError:
+        # The upload was abandoned; don't leave a write running unobserved
+        if inflight:
+            inflight.cancel()
+        raise
+
+    except Exception as e:
+        report.aborted = f"Stopped after row {report.received}: {e}"
+
+    if inflight:
+        await inflight
+    if batch:
+        await write(batch, batch_rows)
+
+    return report.to_dict()
@@ -0,0 +1,324 @@
+import os
+import sqlite3
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import get_settings
+from app.services.embeddings import get_embedding_provider, normalize_rows, np
+from app.services.report_store import hydrate_reports
+
+
+def lead_embedding_text(research_report: str, company_profile: str) -> str:
+    """What a lead is embedded from: its global research report and company profile."""
+    return "\n\n".join(part for part in (research_report, company_profile) if part)
+
+
+class LeadVectorIndex:
+    """
+    Lead embeddings in one contiguous float32 matrix, searched exactly.
+
+    Rows are unit length, so a query is one matrix-vector product followed
+    by a partial sort: ~11ms at 100k and ~110ms at a million 256-d vectors
+    (benchmarks/lead_lookalikes.py), memory-bound. Leads are added or
+    replaced one at a time as research finishes. With a path, rows are also
+    kept in SQLite and loaded back on start; vectors from another model
+    are ignored.
+
+    Each row's user_id is stored but queries are not scoped by it yet:
+    create_lead still gives every lead its own placeholder user_id, so
+    scoping would leave each lead alone with itself. Once leads carry real
+    owners, per-user matrices would also cut the scan to one user's leads.
+    """
+
+    def __init__(self, dimensions: int, model: str, path: Optional[str] = None):
+        self.dimensions = dimensions
+        self.model = model
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((1024, dimensions), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        self._conn = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lead_vectors (
+                    lead_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT lead_id, vector FROM lead_vectors WHERE model = ?",
+            (self.model,),
+        ).fetchall()
+
+        if rows:
+            vectors = [np.frombuffer(vector, dtype=np.float32) for _, vector in rows]
+            self._add([lead_id for lead_id, _ in rows], vectors)
+
+    def _add(self, lead_ids: List[str], vectors) -> None:
+        with self._lock:
+            size = len(self._ids) + len(lead_ids)
+            if size > len(self._vectors):
+                # Double the capacity so appends are amortized O(1) copies
+                grown = np.zeros(
+                    (max(size, 2 * len(self._vectors)), self.dimensions),
+                    dtype=np.float32,
+                )
+                grown[: len(self._ids)] = self._vectors[: len(self._ids)]
+                self._vectors = grown
+
+            for lead_id, vector in zip(lead_ids, vectors):
+                row = self._rows.get(lead_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._rows[lead_id] = row
+                    self._ids.append(lead_id)
+
+                self._vectors[row] = vector
+
+    def upsert(self, items: Iterable[Tuple[str, str, Any]]) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            items: (lead_id, user_id, vector) tuples
+        """
+        items = list(items)
+        if not items:
+            return
+
+        keys = [(str(lead_id), str(user_id)) for lead_id, user_id, _ in items]
+        vectors = normalize_rows([vector for _, _, vector in items])
+        self._add([lead_id for lead_id, _ in keys], vectors)
+
+        if self._conn is not None:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO lead_vectors "
+                    "(lead_id, user_id, model, vector) VALUES (?, ?, ?, ?)",
+                    [
+                        (lead_id, user_id, self.model, vector.tobytes())
+                        for (lead_id, user_id), vector in zip(keys, vectors)
+                    ],
+                )
+                self._conn.commit()
+
+    def remove(self, lead_id: str) -> None:
+        """Drop a lead; the last row moves into its slot."""
+        lead_id = str(lead_id)
+
+        with self._lock:
+            row = self._rows.pop(lead_id, None)
+            if row is not None:
+                last = len(self._ids) - 1
+                if row != last:
+                    moved = self._ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    self._ids[row] = moved
+                    self._rows[moved] = row
+                self._ids.pop()
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "DELETE FROM lead_vectors WHERE lead_id = ?", (lead_id,)
+                )
+                self._conn.commit()
+
+    def vector(self, lead_id: str):
+        """The stored (unit length) vector for a lead, or None."""
+        with self._lock:
+            row = self._rows.get(str(lead_id))
+            return None if row is None else self._vectors[row].copy()
+
+    def query(
+        self, vector, limit: int = 10, exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """
+        Most similar leads by cosine similarity.
+
+        Args:
+            vector: Query embedding
+            limit: Number of results
+            exclude: Lead ids to leave out (e.g. the query lead itself)
+
+        Returns:
+            [(lead_id, similarity)], most similar first
+        """
+        query = normalize_rows(vector)
+
+        with self._lock:
+            scores = self._vectors[: len(self._ids)] @ query
+            for lead_id in exclude:
+                row = self._rows.get(str(lead_id))
+                if row is not None:
+                    scores[row] = -np.inf
+
+            limit = min(limit, len(scores))
+            if limit <= 0:
+                return []
+
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                (self._ids[row], float(scores[row]))
+                for row in top
+                if scores[row] > -np.inf
+            ]
+
+
+@lru_cache()
+def get_lead_vector_index() -> LeadVectorIndex:
+    """Get the process-wide lead embedding index."""
+    provider = get_embedding_provider()
+    return LeadVectorIndex(
+        provider.dimensions, provider.name, get_settings().lead_vectors_path
+    )
+
+
+async def load_lead_vector_index() -> LeadVectorIndex:
+    """
+    Get the lead embedding index from async code.
+
+    The first call opens the SQLite file and loads every stored vector, so
+    it runs in a worker thread; the app lifespan makes that call at
+    startup.
+    """
+    return await asyncio.to_thread(get_lead_vector_index)
+
+
+async def remove_lead_embedding(lead_id: str) -> None:
+    """Forget a deleted lead (a no-op when numpy isn't installed)."""
+    if np is not None:
+        index = await load_lead_vector_index()
+        await asyncio.to_thread(index.remove, lead_id)
+
+
+async def embed_lead(
+    lead_id: str, user_id: str, research_report: str, company_profile: str
+) -> bool:
+    """
+    Embed a lead and add it to the index.
+
+    Returns:
+        False if there was no research text to embed
+    """
+    text = lead_embedding_text(research_report, company_profile)
+    if not text:
+        return False
+
+    provider = get_embedding_provider()
+    vectors = await asyncio.to_thread(provider.embed, [text])
+    index = await load_lead_vector_index()
+    await asyncio.to_thread(index.upsert, [(lead_id, user_id, vectors[0])])
+    return True
+
+
+async def index_lead_embedding(state: Dict[str, Any]) -> None:
+    """Add or replace the embedding for a finished research run."""
+    lead = state["current_lead"]
+    embedded = await embed_lead(
+        str(lead["id"]),
+        str(state.get("user_id") or ""),
+        state.get("global_research_report", ""),
+        state.get("company_data", {}).get("profile", ""),
+    )
+    if embedded:
+        print(f"🧭 Indexed embedding for lead {lead['id']}")
+
+
+async def embed_stored_lead(supabase, lead: Dict[str, Any]) -> bool:
+    """Embed a lead from its saved research, for leads researched before indexing."""
+    lead_id = str(lead["id"])
+
+    reports = (
+        await supabase.table("reports")
+        .select("content, content_hash")
+        .eq("lead_id", lead_id)
+        .eq("report_type", "global_research")
+        .order("created_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    company = (
+        await supabase.table("company_data")
+        .select("profile")
+        .eq("lead_id", lead_id)
+        .limit(1)
+        .execute()
+    )
+
+    research = await hydrate_reports(supabase, reports.data or [])
+    return await embed_lead(
+        lead_id,
+        str(lead.get("user_id") or ""),
+        research[0]["content"] if research else "",
+        (company.data or [{}])[0].get("profile") or "",
+    )
+
+
+async def copy_lead_embedding(
+    supabase, source_id: str, target: Dict[str, Any]
+) -> bool:
+    """
+    Index a lead whose research was copied from another lead.
+
+    Reuses the source's vector when it is indexed, otherwise embeds the
+    target from its (copied) saved research.
+    """
+    index = await load_lead_vector_index()
+    vector = index.vector(source_id)
+
+    if vector is None:
+        return await embed_stored_lead(supabase, target)
+
+    await asyncio.to_thread(
+        index.upsert,
+        [(str(target["id"]), str(target.get("user_id") or ""), vector)],
+    )
+    return True
+
+
+async def find_lookalikes(
+    supabase, lead: Dict[str, Any], limit: int = 10
+) -> List[Tuple[str, float]]:
+    """
+    Leads whose research is most similar to this lead's.
+
+    Searches every indexed lead: leads don't have real owners yet (see
+    LeadVectorIndex). A lead not yet in the index is embedded from its
+    saved research first.
+
+    Returns:
+        [(lead_id, similarity)], most similar first; empty if the lead has
+        no research to compare
+    """
+    index = await load_lead_vector_index()
+    vector = index.vector(lead["id"])
+
+    if vector is None:
+        if not await embed_stored_lead(supabase, lead):
+            return []
+        vector = index.vector(lead["id"])
+
+    return await asyncio.to_thread(index.query, vector, limit, [str(lead["id"])])
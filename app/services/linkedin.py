@@ -1,7 +1,14 @@
+import time
+import random
+import asyncio
 import httpx
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Tuple, Dict, Any
 
 from app.config import get_settings
+from app.services.host_health import get_host_health, host_of, HostUnavailableError
+from app.services.linkedin_cache import get_enrichment_cache
 from app.services.llm import invoke_llm
 from app.services.search.search import google_search
 
@@ -20,7 +27,10 @@ async def find_linkedin_url(name: str, company: str) -> Optional[str]:
 
     query = f'site:linkedin.com/in "{name}" "{company}"'
 
-    results = await google_search(query=query)
+    # Profile URLs rarely change, so these lookups are cached much longer
+    results = await google_search(
+        query=query, cache_ttl=get_settings().search_cache_ttl_linkedin
+    )
 
     for result in results:
         result: Dict[str, Any] = result
@@ -31,23 +41,163 @@ async def find_linkedin_url(name: str, company: str) -> Optional[str]:
     return None
 
 
-async def scrape_linkedin_profile(url: str) -> Dict[str, Any]:
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RapidAPIQuotaExceeded(Exception):
+    """The local daily RapidAPI budget has no calls left for this lookup."""
+
+
+def _is_retryable(error: Optional[Exception], response: Optional[httpx.Response]) -> bool:
     """
-    Scrape a LinkedIn profile using RapidAPI.
+    Classify a RapidAPI failure.
+
+    Rate limits, server errors and transient network problems are worth
+    retrying. Other 4xx responses (bad URL, private profile, auth) and
+    requests refused by an open circuit are not.
+    """
+    if response is not None:
+        return response.status_code in RETRYABLE_STATUS_CODES
+
+    if isinstance(error, HostUnavailableError):
+        return False
+
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def _rate_limit_wait(response: Optional[httpx.Response]) -> Optional[float]:
+    """
+    Seconds the provider asked us to wait, from Retry-After or RapidAPI's
+    x-ratelimit-requests-reset header.
+    """
+    if response is None:
+        return None
+
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    reset = response.headers.get("x-ratelimit-requests-reset")
+    if reset and response.status_code == 429:
+        try:
+            return max(0.0, float(reset))
+        except ValueError:
+            pass
+
+    return None
+
+
+async def _rapidapi_get(
+    client: httpx.AsyncClient, api_url: str, headers: Dict[str, str], kind: str
+) -> httpx.Response:
+    """
+    GET a RapidAPI URL with retries.
+
+    Retryable failures are retried with exponential backoff and full jitter,
+    or after the delay the provider asks for, as long as the next attempt
+    fits in rapidapi_retry_budget_seconds. Requests go through the host
+    health registry, so a provider outage opens the circuit and later calls
+    fail fast instead of queueing up timeouts.
+
+    Every attempt is a billed call, so each one is charged to the daily
+    quota for `kind`; retrying stops when the budget runs out.
+
+    Returns:
+        The last response received (callers check its status)
+
+    Raises:
+        RapidAPIQuotaExceeded: If not even the first attempt fits the quota
+        httpx.HTTPError: If no response could be obtained
+    """
+    settings = get_settings()
+    cache = get_enrichment_cache()
+    host_health = get_host_health()
+    deadline = time.monotonic() + settings.rapidapi_retry_budget_seconds
+    error: Optional[Exception] = None
+    response: Optional[httpx.Response] = None
+
+    for attempt in range(settings.rapidapi_max_attempts):
+        # An open circuit fails without reaching RapidAPI, so don't charge it
+        if not host_health.is_open(host_of(api_url)):
+            if not await asyncio.to_thread(cache.try_consume, kind):
+                if attempt == 0:
+                    raise RapidAPIQuotaExceeded(kind)
+                print("⚠️ RapidAPI daily quota reached, not retrying")
+                break
+
+        error = None
+        response = None
+        remaining = deadline - time.monotonic()
+
+        try:
+            response = await host_health.request(
+                client,
+                "GET",
+                api_url,
+                headers=headers,
+                timeout=max(1.0, min(30.0, remaining)),
+            )
+        except httpx.HTTPError as e:
+            error = e
+
+        if response is not None and response.status_code < 400:
+            return response
+
+        is_last = attempt == settings.rapidapi_max_attempts - 1
+        if is_last or not _is_retryable(error, response):
+            break
+
+        delay = _rate_limit_wait(response)
+        if delay is None:
+            backoff = settings.rapidapi_retry_base_seconds * (2**attempt)
+            delay = random.uniform(0, min(backoff, settings.rapidapi_retry_max_seconds))
+
+        if time.monotonic() + delay >= deadline:
+            break
+
+        reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+        print(f"🔁 RapidAPI {reason}, retrying in {delay:.1f}s (attempt {attempt + 2})")
+        await asyncio.sleep(delay)
+
+    if response is not None:
+        return response
+
+    raise error
+
+
+async def _fetch_enrichment(url: str, kind: str, error_label: str) -> Dict[str, Any]:
+    """
+    Fetch LinkedIn data from RapidAPI, reading through the enrichment cache.
 
     Args:
-        linkedin_url: The LinkedIn profile URL
+        url: LinkedIn profile or company URL
+        kind: "profile" or "company", used for quota budgeting
+        error_label: What failed, for error messages
 
     Returns:
-        Dictionary containing profile data
+        Dictionary containing the payload's data, or {"error": ...}
     """
 
     settings = get_settings()
-    api_url = f"https://fresh-linkedin-profile-data.p.rapidapi.com/enrich-lead?linkedin_url={url}"
 
     if not settings.rapidapi_key:
         return {"error": "RapidAPI key not configured."}
 
+    cache = get_enrichment_cache()
+
+    cached = await asyncio.to_thread(cache.get, url)
+    if cached is not None:
+        return cached
+
+    api_url = f"https://fresh-linkedin-profile-data.p.rapidapi.com/enrich-lead?linkedin_url={url}"
+
     headers = {
         "x-rapidapi-key": settings.rapidapi_key,
         "x-rapidapi-host": "fresh-linkedin-profile-data.p.rapidapi.com",
@@ -55,46 +205,49 @@ async def scrape_linkedin_profile(url: str) -> Dict[str, Any]:
 
     async with httpx.AsyncClient(timeout=30.0) as client:
         try:
-            response = await client.get(api_url, headers=headers)
-            print(response)
+            response = await _rapidapi_get(client, api_url, headers, kind)
             response.raise_for_status()
-            data: dict[str, Any] = response.json()
-            return data.get("data", {})
+            data: Dict[str, Any] = response.json().get("data", {})
+        except RapidAPIQuotaExceeded:
+            return {
+                "error": f"Skipped {error_label}: daily RapidAPI quota reached, "
+                "retry after it resets."
+            }
         except httpx.HTTPError as e:
-            return {"error": f"Failed to scrape LinkedIn: {str(e)}"}
+            return {"error": f"Failed to {error_label}: {str(e)}"}
 
+    if data:
+        await asyncio.to_thread(cache.set, url, data)
 
-async def scrape_linkedin_company_page(url: str) -> Dict[str, Any]:
+    return data
+
+
+async def scrape_linkedin_profile(url: str) -> Dict[str, Any]:
     """
-    Scrape a LinkedIn company page using RapidAPI.
+    Scrape a LinkedIn profile using RapidAPI.
 
     Args:
-        linkedin_url: The LinkedIn company URL
+        linkedin_url: The LinkedIn profile URL
 
     Returns:
-        Dictionary containing company data
+        Dictionary containing profile data
     """
 
-    settings = get_settings()
+    return await _fetch_enrichment(url, "profile", "scrape LinkedIn")
 
-    api_url = f"https://fresh-linkedin-profile-data.p.rapidapi.com/enrich-lead?linkedin_url={url}"
 
-    if not settings.rapidapi_key:
-        return {"error": "RapidAPI key not configured."}
+async def scrape_linkedin_company_page(url: str) -> Dict[str, Any]:
+    """
+    Scrape a LinkedIn company page using RapidAPI.
 
-    headers = {
-        "x-rapidapi-key": settings.rapidapi_key,
-        "x-rapidapi-host": "fresh-linkedin-profile-data.p.rapidapi.com",
-    }
+    Args:
+        linkedin_url: The LinkedIn company URL
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(api_url, headers=headers)
-            response.raise_for_status()
-            data: Dict[str, Any] = response.json()
-            return data.get("data", {})
-        except httpx.HTTPError as e:
-            return {"error": f"Failed to scrape LinkedIn Company Page: {str(e)}"}
+    Returns:
+        Dictionary containing company data
+    """
+
+    return await _fetch_enrichment(url, "company", "scrape LinkedIn Company Page")
 
 
 def format_linkedin_profile(raw_data: dict[str, Any]) -> str:
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.config import get_settings
+from app.services.company_cache import normalize_linkedin_url
+
+
+class EnrichmentCache:
+    """
+    Persistent cache of raw RapidAPI LinkedIn payloads plus a local tally of
+    the daily RapidAPI quota.
+
+    Payloads are keyed by normalized LinkedIn URL, expire after `ttl_seconds`
+    and are evicted least-recently-used once `max_entries` is exceeded.
+    URLs that don't normalize (short links, other hosts) are never cached,
+    since they would all share the empty key. Methods block on SQLite, so
+    async callers run them with asyncio.to_thread.
+
+    Quota use is counted per UTC day. Profile lookups may use the whole
+    budget; company page lookups stop once only `company_reserve` calls are
+    left, so the remaining calls go to profiles (the lead can't be researched
+    without one, while a missing company page only loses some detail).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_entries: int,
+        daily_quota: int,
+        company_reserve: int,
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.daily_quota = daily_quota
+        self.company_reserve = company_reserve
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS linkedin_enrichment (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS linkedin_enrichment_accessed_at "
+            "ON linkedin_enrichment (accessed_at)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rapidapi_usage (
+                day TEXT PRIMARY KEY,
+                calls INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a LinkedIn URL, if fresh."""
+        key = normalize_linkedin_url(url)
+        if not key:
+            return None
+
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM linkedin_enrichment WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or row[1] + self.ttl_seconds <= now:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE linkedin_enrichment SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, url: str, payload: Dict[str, Any]) -> None:
+        key = normalize_linkedin_url(url)
+        if not key:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO linkedin_enrichment "
+                "(key, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM linkedin_enrichment WHERE key IN (
+                    SELECT key FROM linkedin_enrichment
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _today(self) -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def calls_today(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT calls FROM rapidapi_usage WHERE day = ?", (self._today(),)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining_quota(self) -> int:
+        return max(0, self.daily_quota - self.calls_today())
+
+    def try_consume(self, kind: str) -> bool:
+        """
+        Reserve one RapidAPI call for today.
+
+        Args:
+            kind: "profile" or "company"
+
+        Returns:
+            False if the call would exceed the budget for this kind of lookup
+        """
+        reserve = self.company_reserve if kind == "company" else 0
+        today = self._today()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT calls FROM rapidapi_usage WHERE day = ?", (today,)
+            ).fetchone()
+            calls = row[0] if row else 0
+
+            if self.daily_quota - calls <= reserve:
+                return False
+
+            self._conn.execute(
+                "INSERT INTO rapidapi_usage (day, calls) VALUES (?, 1) "
+                "ON CONFLICT(day) DO UPDATE SET calls = calls + 1",
+                (today,),
+            )
+            self._conn.commit()
+
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM linkedin_enrichment"
+            ).fetchone()[0]
+
+        total = self.hits + self.misses
+        calls = self.calls_today()
+
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "quota": {
+                "daily_limit": self.daily_quota,
+                "used_today": calls,
+                "remaining_today": max(0, self.daily_quota - calls),
+                "company_reserve": self.company_reserve,
+            },
+        }
+
+
+@lru_cache()
+def get_enrichment_cache() -> EnrichmentCache:
+    """Get the process-wide LinkedIn enrichment cache."""
+    settings = get_settings()
+
+    return EnrichmentCache(
+        path=settings.linkedin_cache_path,
+        ttl_seconds=settings.linkedin_cache_ttl_seconds,
+        max_entries=settings.linkedin_cache_max_entries,
+        daily_quota=settings.rapidapi_daily_quota,
+        company_reserve=settings.rapidapi_company_reserve,
+    )
@@ -0,0 +1,228 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional
+
+from app.config import get_settings
+from app.services.company_cache import normalize_domain
+
+
+NAME_NOISE = {"mr", "mrs", "ms", "miss", "dr", "prof", "jr", "sr", "ii", "iii", "iv", "phd", "mba", "md"}
+
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "srl", "oy", "ab",
+}
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# A one-letter typo is confident in names of seven or more letters
+NAME_MATCH_THRESHOLD = 0.85
+
+
+def _ascii_words(value: str) -> List[str]:
+    """Lower-case, accent-free words of a string."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = value.encode("ascii", "ignore").decode("ascii").lower()
+    return WORD_RE.findall(value)
+
+
+def normalize_person_name(name: str) -> str:
+    """
+    Normalize a person's name for matching.
+
+    Accents, punctuation, honorifics and suffixes are dropped and the
+    remaining words sorted, so "Dr. José  García-López" and
+    "garcia lopez, jose" give the same key.
+    """
+    return " ".join(sorted(word for word in _ascii_words(name) if word not in NAME_NOISE))
+
+
+def normalize_company_name(company: str) -> str:
+    """Normalize a company name, dropping legal suffixes like Inc or GmbH."""
+    return " ".join(word for word in _ascii_words(company) if word not in COMPANY_SUFFIXES)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between two strings, or limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return min(previous[-1], limit + 1)
+
+
+def name_similarity(name_a: str, name_b: str) -> float:
+    """
+    Score how alike two normalized names are, from 0 to 1.
+
+    1.0 when the names have the same words, or when one name's words are
+    all contained in the other's and at least two words are shared (a
+    middle name present in only one of them). Otherwise the names are
+    compared word by word: every word but one must be shared, and the
+    remaining pair, the longer of which has at least four letters, may
+    differ by a single edit ("jon smith" and "john smith"). That scores
+    1 - 1 / letters in the longer name, so longer names score higher.
+    Anything else scores 0.
+    """
+    if not name_a or not name_b:
+        return 0.0
+
+    words_a, words_b = set(name_a.split()), set(name_b.split())
+    if words_a == words_b:
+        return 1.0
+
+    shared = words_a & words_b
+    if len(shared) >= 2 and (shared == words_a or shared == words_b):
+        return 1.0
+
+    rest_a, rest_b = words_a - shared, words_b - shared
+    if not shared or len(rest_a) != 1 or len(rest_b) != 1:
+        return 0.0
+
+    (word_a,), (word_b,) = rest_a, rest_b
+    if max(len(word_a), len(word_b)) < 4 or edit_distance(word_a, word_b, 1) > 1:
+        return 0.0
+
+    letters = max(len(name_a.replace(" ", "")), len(name_b.replace(" ", "")))
+    return 1 - 1 / letters
+
+
+class LinkedInIndex:
+    """
+    Local index of people we've already resolved to a LinkedIn URL.
+
+    Rows hold (normalized name, normalized company, domain, email) -> URL
+    and are added on every successful Google resolution and RapidAPI
+    enrichment. A lookup is confident when the email matches exactly, or
+    when the company (name or domain) matches and the person's name either
+    matches word for word or is the only one at the company within a
+    single-letter typo scoring at least NAME_MATCH_THRESHOLD (see
+    name_similarity). Two such near matches ("mark jones" and "mary
+    jones") are ambiguous, and like no match the caller falls back to
+    searching.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS linkedin_identities (
+                name TEXT NOT NULL,
+                company TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                email TEXT NOT NULL,
+                url TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                UNIQUE (name, company, domain, email, url)
+            )
+            """
+        )
+        for column in ("email", "company", "domain"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS linkedin_identities_{column} "
+                f"ON linkedin_identities ({column})"
+            )
+        self._conn.commit()
+
+    def record(
+        self,
+        url: str,
+        name: str = "",
+        company: str = "",
+        website: str = "",
+        email: str = "",
+    ) -> None:
+        """Remember that this person resolves to `url`."""
+        if not url or not (name or email):
+            return
+
+        row = (
+            normalize_person_name(name),
+            normalize_company_name(company),
+            normalize_domain(website),
+            (email or "").strip().lower(),
+            url,
+            time.time(),
+        )
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO linkedin_identities "
+                "(name, company, domain, email, url, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name, company, domain, email, url) "
+                "DO UPDATE SET updated_at = excluded.updated_at",
+                row,
+            )
+            self._conn.commit()
+
+    def lookup(
+        self, name: str = "", company: str = "", website: str = "", email: str = ""
+    ) -> Optional[str]:
+        """
+        Return a LinkedIn URL for this person if the index has a confident match.
+        """
+        email = (email or "").strip().lower()
+        name_key = normalize_person_name(name)
+        company_key = normalize_company_name(company)
+        domain = normalize_domain(website)
+
+        with self._lock:
+            if email:
+                row = self._conn.execute(
+                    "SELECT url FROM linkedin_identities WHERE email = ? "
+                    "ORDER BY updated_at DESC LIMIT 1",
+                    (email,),
+                ).fetchone()
+                if row:
+                    return row[0]
+
+            if not name_key or not (company_key or domain):
+                return None
+
+            candidates = self._conn.execute(
+                "SELECT name, url FROM linkedin_identities "
+                "WHERE (company = ? AND company != '') OR (domain = ? AND domain != '') "
+                "ORDER BY updated_at DESC",
+                (company_key, domain),
+            ).fetchall()
+
+        near = set()
+        for candidate_name, url in candidates:
+            score = name_similarity(name_key, candidate_name)
+            if score == 1.0:
+                return url
+            if score >= NAME_MATCH_THRESHOLD:
+                near.add(url)
+
+        return near.pop() if len(near) == 1 else None
+
+
+@lru_cache()
+def get_linkedin_index() -> LinkedInIndex:
+    """Get the process-wide LinkedIn URL index."""
+    return LinkedInIndex(get_settings().linkedin_index_path)
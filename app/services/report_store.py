@@ -0,0 +1,149 @@
+import re
+import zlib
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+# Report markdown compresses ~3x at level 9 for well under a millisecond
+# per report (benchmarks/report_storage.py); 9 is also zlib's maximum
+COMPRESSION_LEVEL = 9
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def content_hash(content: str) -> str:
+    """sha256 of the report text; identical reports share one stored body."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compress_content(
+    content: str, level: int = COMPRESSION_LEVEL
+) -> Tuple[str, bytes]:
+    """
+    Compress report text with zstd, or zlib when zstandard isn't installed.
+
+    Returns:
+        (encoding, compressed bytes)
+    """
+    data = content.encode("utf-8")
+
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=level).compress(data)
+
+    return "zlib", zlib.compress(data, min(level, 9))
+
+
+def decompress_content(encoding: str, data: bytes) -> str:
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd report content")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+
+    if encoding == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+
+    return data.decode("utf-8")
+
+
+def encode_bytea(data: bytes) -> str:
+    """PostgREST's text form of a bytea value."""
+    return "\\x" + data.hex()
+
+
+def decode_bytea(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+
+def build_content_row(content: str) -> Dict[str, Any]:
+    """A report_contents row for this report text."""
+    encoding, body = compress_content(content)
+    return {
+        "hash": content_hash(content),
+        "encoding": encoding,
+        "body": encode_bytea(body),
+        "size": len(content.encode("utf-8")),
+        "compressed_size": len(body),
+    }
+
+
+async def fetch_contents(supabase, hashes: List[str]) -> Dict[str, str]:
+    """Decompressed report text for each content hash, in one query."""
+    hashes = sorted(set(hashes))
+    if not hashes:
+        return {}
+
+    result = (
+        await supabase.table("report_contents")
+        .select("hash, encoding, body")
+        .in_("hash", hashes)
+        .execute()
+    )
+
+    return {
+        row["hash"]: decompress_content(row["encoding"], decode_bytea(row["body"]))
+        for row in result.data or []
+    }
+
+
+async def hydrate_reports(
+    supabase, reports: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Fill in `content` for report rows that reference report_contents.
+
+    Rows written before content was deduplicated still carry their text
+    inline and are left as they are.
+    """
+    hashes = [
+        report["content_hash"]
+        for report in reports
+        if report.get("content") is None and report.get("content_hash")
+    ]
+    contents = await fetch_contents(supabase, hashes)
+
+    for report in reports:
+        if report.get("content") is None and report.get("content_hash"):
+            report["content"] = contents.get(report["content_hash"], "")
+
+    return reports
+
+
+def list_sections(markdown: str) -> List[str]:
+    """Headings of a markdown report, in order."""
+    return [
+        match.group(2)
+        for match in map(HEADING_RE.match, markdown.splitlines())
+        if match
+    ]
+
+
+def extract_section(markdown: str, section: str) -> Optional[str]:
+    """
+    The part of a markdown report under a heading.
+
+    Runs from the first heading whose text matches `section`
+    (case-insensitive) up to the next heading of the same or a higher
+    level. Returns None if no heading matches.
+    """
+    wanted = " ".join(section.lower().split())
+    lines = markdown.splitlines(keepends=True)
+    start = level = None
+
+    for index, line in enumerate(lines):
+        match = HEADING_RE.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+
+        depth = len(match.group(1))
+        if start is None:
+            if " ".join(match.group(2).lower().split()) == wanted:
+                start, level = index, depth
+        elif depth <= level:
+            return "".join(lines[start:index])
+
+    return "".join(lines[start:]) if start is not None else None
@@ -0,0 +1,254 @@
+import os
+import re
+import sqlite3
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from app.config import get_settings
+
+
+def build_search_documents(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Searchable texts produced by a research run.
+
+    One document per report (the LinkedIn summary is one of them) plus the
+    company profile. Indexing a run replaces all of the lead's documents,
+    so sources missing from a rerun drop out of search.
+    """
+    lead_id = str(state["current_lead"]["id"])
+    documents = []
+
+    for report in state.get("reports", []):
+        if report.get("content"):
+            documents.append(
+                {
+                    "lead_id": lead_id,
+                    "source": report["report_type"],
+                    "title": report.get("title") or "",
+                    "body": report["content"],
+                }
+            )
+
+    company = state.get("company_data", {})
+    if company.get("profile"):
+        documents.append(
+            {
+                "lead_id": lead_id,
+                "source": "company_profile",
+                "title": company.get("name") or "",
+                "body": company["profile"],
+            }
+        )
+
+    return documents
+
+
+class PostgresResearchIndex:
+    """
+    Full-text search over the research_documents table.
+
+    Postgres keeps a generated tsvector column with a GIN index; ranking
+    and snippets come from the search_research RPC (ts_rank_cd and
+    ts_headline over websearch_to_tsquery), which ranks at most 1000
+    matches so broad terms stay fast. A lead's documents are replaced in
+    one transaction by the index_research_documents RPC.
+    """
+
+    async def index(
+        self, supabase, lead_id: str, documents: List[Dict[str, Any]]
+    ) -> None:
+        await supabase.rpc(
+            "index_research_documents",
+            {"p_lead_id": str(lead_id), "p_documents": documents},
+        ).execute()
+
+    async def documents(self, supabase, lead_id: str) -> List[Dict[str, Any]]:
+        result = (
+            await supabase.table("research_documents")
+            .select("lead_id, source, title, body")
+            .eq("lead_id", str(lead_id))
+            .execute()
+        )
+        return result.data or []
+
+    async def search(
+        self, supabase, query: str, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        result = await supabase.rpc(
+            "search_research", {"p_query": query, "p_limit": limit}
+        ).execute()
+        return result.data or []
+
+
+class SQLiteResearchIndex:
+    """
+    SQLite FTS5 index with the same interface, for local development and
+    tests without Postgres. Ranked with bm25; snippets from snippet().
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Plain table whose (lead_id, source) index lets a rerun delete its
+        # lead's rows with a lookup; FTS5 indexes it as external content
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS research_documents (
+                id INTEGER PRIMARY KEY,
+                lead_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                UNIQUE (lead_id, source)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS research_documents_fts USING fts5 (
+                title,
+                body,
+                content = 'research_documents',
+                content_rowid = 'id',
+                tokenize = 'porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS research_documents_ai
+            AFTER INSERT ON research_documents BEGIN
+                INSERT INTO research_documents_fts (rowid, title, body)
+                VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS research_documents_ad
+            AFTER DELETE ON research_documents BEGIN
+                INSERT INTO research_documents_fts
+                    (research_documents_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS research_documents_au
+            AFTER UPDATE ON research_documents BEGIN
+                INSERT INTO research_documents_fts
+                    (research_documents_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO research_documents_fts (rowid, title, body)
+                VALUES (new.id, new.title, new.body);
+            END;
+            """
+        )
+        self._conn.commit()
+
+    def _index(self, lead_ids: List[str], documents: List[Dict[str, Any]]) -> None:
+        """Replace every document of `lead_ids` with `documents`."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM research_documents WHERE lead_id = ?",
+                [(lead_id,) for lead_id in lead_ids],
+            )
+            self._conn.executemany(
+                "INSERT INTO research_documents (lead_id, source, title, body) "
+                "VALUES (:lead_id, :source, :title, :body)",
+                documents,
+            )
+            self._conn.commit()
+
+    def _documents(self, lead_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lead_id, source, title, body FROM research_documents "
+                "WHERE lead_id = ?",
+                (lead_id,),
+            ).fetchall()
+
+        return [
+            {"lead_id": lead_id, "source": source, "title": title, "body": body}
+            for lead_id, source, title, body in rows
+        ]
+
+    def _search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        match = fts5_query(query)
+        if not match:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT d.lead_id, d.source, d.title,
+                       snippet(research_documents_fts, 1, '<b>', '</b>', '…', 24),
+                       bm25(research_documents_fts, 2.0, 1.0)
+                FROM research_documents_fts
+                JOIN research_documents d ON d.id = research_documents_fts.rowid
+                WHERE research_documents_fts MATCH ?
+                ORDER BY bm25(research_documents_fts, 2.0, 1.0)
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+
+        return [
+            {
+                "lead_id": lead_id,
+                "source": source,
+                "title": title,
+                "snippet": snippet,
+                "rank": round(-score, 4),
+            }
+            for lead_id, source, title, snippet, score in rows
+        ]
+
+    async def index(
+        self, supabase, lead_id: str, documents: List[Dict[str, Any]]
+    ) -> None:
+        await asyncio.to_thread(self._index, [str(lead_id)], documents)
+
+    async def documents(self, supabase, lead_id: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._documents, str(lead_id))
+
+    async def search(
+        self, supabase, query: str, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._search, query, limit)
+
+
+def fts5_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match, with
+    "quoted phrases" kept together. Operators in user input are ignored.
+    """
+    phrases = re.findall(r'"([^"]+)"', query)
+    words = re.sub(r'"[^"]*"', " ", query)
+
+    terms = [" ".join(re.findall(r"\w+", phrase)) for phrase in phrases]
+    terms += re.findall(r"\w+", words)
+
+    return " AND ".join(f'"{term}"' for term in terms if term)
+
+
+@lru_cache()
+def get_research_index():
+    """Get the configured research search backend ("postgres" or "sqlite")."""
+    settings = get_settings()
+
+    if settings.research_search_backend == "sqlite":
+        return SQLiteResearchIndex(settings.research_search_path)
+
+    return PostgresResearchIndex()
+
+
+async def index_research(supabase, state: Dict[str, Any]) -> None:
+    """Replace the lead's search documents with those of a finished run."""
+    documents = build_search_documents(state)
+    await get_research_index().index(
+        supabase, str(state["current_lead"]["id"]), documents
+    )
+    print(f"🔎 Indexed {len(documents)} research documents")
+
+
+async def copy_research_index(supabase, source_id: str, target_id: str) -> None:
+    """Index a lead whose research was copied from another with the same documents."""
+    index = get_research_index()
+    documents = [
+        {**document, "lead_id": str(target_id)}
+        for document in await index.documents(supabase, source_id)
+    ]
+    await index.index(supabase, str(target_id), documents)
@@ -1,10 +1,26 @@
 import re
+import asyncio
 import httpx
 import html2text
 from bs4 import BeautifulSoup
 from pydantic import BaseModel
+from typing import Optional
 from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor
+from app.config import get_settings
 from app.services.llm import invoke_llm
+from app.services.host_health import get_host_health
+
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
 
 
 class WebsiteData(BaseModel):
@@ -24,6 +40,12 @@ def extract_important_links(html_content: str, base_url: str) -> dict:
     """
     soup = BeautifulSoup(html_content, "html.parser")
 
+    return _extract_links_from_soup(soup, base_url)
+
+
+def _extract_links_from_soup(soup: BeautifulSoup, base_url: str) -> dict:
+    """Collect blog and social media links from an already parsed document."""
+
     links = {
         "blog_url": "",
         "youtube": "",
@@ -69,41 +91,20 @@ def extract_important_links(html_content: str, base_url: str) -> dict:
     return links
 
 
-async def scrape_website_to_markdown(url: str) -> tuple[str, dict]:
+def html_to_markdown(raw_html: bytes, base_url: str) -> tuple[str, dict]:
     """
-    Scrape a website and convert its content to markdown.
-    Also extracts important links BEFORE truncation.
+    Convert raw HTML bytes into markdown and extract important links.
+
+    This is the CPU-heavy part of scraping (parsing, prettify and html2text).
+    It is a plain module-level function so it can run in a worker process.
 
     Returns:
         Tuple of (markdown_content, extracted_links)
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
-
-    try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        return f"Error: Could not fetch {url} - HTTP {e.response.status_code}", {}
-    except httpx.TimeoutException:
-        return f"Error: Timeout fetching {url}", {}
-    except Exception as e:
-        return f"Error: {str(e)}", {}
-
-    raw_html = response.text
+    soup = BeautifulSoup(raw_html, "html.parser")
 
     # Extract links BEFORE any processing
-    extracted_links = extract_important_links(raw_html, url)
-
-    soup = BeautifulSoup(raw_html, "html.parser")
+    extracted_links = _extract_links_from_soup(soup, base_url)
 
     for script in soup(["script", "style", "noscript"]):
         script.decompose()
@@ -127,6 +128,86 @@ async def scrape_website_to_markdown(url: str) -> tuple[str, dict]:
     return markdown_content, extracted_links
 
 
+_html_pool: Optional[ProcessPoolExecutor] = None
+_html_pool_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_html_pool() -> tuple[Optional[ProcessPoolExecutor], asyncio.Semaphore]:
+    """
+    Lazily create the HTML conversion process pool and its queue bound.
+
+    With scraper_process_workers set to 0 no pool is created and conversions
+    run in a thread instead (useful for development and constrained hosts).
+    """
+    global _html_pool, _html_pool_slots
+
+    settings = get_settings()
+
+    if _html_pool_slots is None:
+        _html_pool_slots = asyncio.Semaphore(
+            max(1, settings.scraper_process_workers) + settings.scraper_max_queued
+        )
+
+    if _html_pool is None and settings.scraper_process_workers > 0:
+        _html_pool = ProcessPoolExecutor(max_workers=settings.scraper_process_workers)
+
+    return _html_pool, _html_pool_slots
+
+
+async def convert_html_to_markdown(raw_html: bytes, base_url: str) -> tuple[str, dict]:
+    """
+    Run html_to_markdown off the event loop.
+
+    At most workers + scraper_max_queued conversions are in flight; further
+    callers wait here instead of piling raw pages into the pool's queue.
+    """
+    pool, slots = _get_html_pool()
+
+    async with slots:
+        if pool is None:
+            return await asyncio.to_thread(html_to_markdown, raw_html, base_url)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, html_to_markdown, raw_html, base_url)
+
+
+def shutdown_html_pool() -> None:
+    """Shut down the HTML conversion process pool, if it was started."""
+    global _html_pool, _html_pool_slots
+
+    if _html_pool is not None:
+        _html_pool.shutdown(wait=False, cancel_futures=True)
+
+    _html_pool = None
+    _html_pool_slots = None
+
+
+async def scrape_website_to_markdown(url: str) -> tuple[str, dict]:
+    """
+    Scrape a website and convert its content to markdown.
+    Also extracts important links BEFORE truncation.
+
+    Returns:
+        Tuple of (markdown_content, extracted_links)
+    """
+    timeout = httpx.Timeout(30.0, connect=10.0)
+
+    try:
+        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
+            response = await get_host_health().request(
+                client, "GET", url, headers=REQUEST_HEADERS
+            )
+            response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        return f"Error: Could not fetch {url} - HTTP {e.response.status_code}", {}
+    except httpx.TimeoutException:
+        return f"Error: Timeout fetching {url}", {}
+    except Exception as e:
+        return f"Error: {str(e)}", {}
+
+    return await convert_html_to_markdown(response.content, url)
+
+
 async def analyse_website(url: str) -> WebsiteData:
     """
     Scrape and analyze a website to extract key information.
@@ -0,0 +1,93 @@
+import asyncio
+from typing import List, Dict, Any, Set, Tuple, Awaitable, Callable
+
+
+PostFn = Callable[[str, Any], Awaitable[Any]]
+
+
+class SerperBatcher:
+    """
+    Micro-batches concurrent Serper queries into multi-query requests.
+
+    Serper accepts a JSON array of queries in one POST and answers with an
+    array of results in the same order. Callers submit a single query and
+    await its own result; queries arriving within `window_seconds` of the
+    first one (up to `max_batch_size`) share one HTTP request. Identical
+    queries in the same batch are sent once and fanned out to every caller.
+    """
+
+    def __init__(self, post: PostFn, window_seconds: float, max_batch_size: int):
+        self._post = post
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # The loop only keeps weak references to tasks; hold in-flight sends
+        # so one isn't collected while callers wait on its futures
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a query for the next batch to `endpoint` and wait for its result.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(endpoint, [])
+        batch.append((params, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(endpoint)
+        elif endpoint not in self._timers:
+            self._timers[endpoint] = loop.call_later(
+                self.window_seconds, self._flush, endpoint
+            )
+
+        return await future
+
+    def _flush(self, endpoint: str) -> None:
+        timer = self._timers.pop(endpoint, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(endpoint, [])
+        if batch:
+            task = asyncio.ensure_future(self._send(endpoint, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self, endpoint: str, batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        # Deduplicate identical queries within the batch
+        unique: Dict[Tuple, int] = {}
+        body: List[Dict[str, Any]] = []
+        positions: List[int] = []
+
+        for params, _ in batch:
+            key = tuple(sorted(params.items()))
+            if key not in unique:
+                unique[key] = len(body)
+                body.append(params)
+            positions.append(unique[key])
+
+        try:
+            if len(body) == 1:
+                results = [await self._post(endpoint, body[0])]
+            else:
+                results = await self._post(endpoint, body)
+
+            if not isinstance(results, list) or len(results) != len(body):
+                raise ValueError(
+                    f"Serper batch returned {len(results) if isinstance(results, list) else 'non-list'} "
+                    f"results for {len(body)} queries"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), position in zip(batch, positions):
+            if not future.done():
+                future.set_result(results[position])
@@ -0,0 +1,191 @@
+import os
+import abc
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any
+
+from app.config import get_settings
+
+
+def make_cache_key(
+    endpoint: str, q: str, num: Optional[int] = None, tbs: Optional[str] = None
+) -> str:
+    """
+    Build a cache key from the parts of a Serper query that affect its results.
+    """
+    raw = json.dumps([endpoint, q.strip().lower(), num, tbs or ""])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SearchCache(abc.ABC):
+    """
+    Base class for search result caches.
+
+    Values are the decoded JSON bodies returned by Serper. Subclasses only
+    need to implement _get and _set; hit/miss counting lives here. Async
+    callers use aget/aset, which run backends that block on I/O
+    (`blocking = True`) in a worker thread.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        if ttl > 0:
+            self._set(key, value, ttl)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value, ttl)
+        else:
+            self.set(key, value, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value, or None if missing or expired."""
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        """Store a value for `ttl` seconds."""
+
+
+class NullSearchCache(SearchCache):
+    """Cache that never stores anything (caching disabled)."""
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def _set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        pass
+
+
+class MemorySearchCache(SearchCache):
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteSearchCache(SearchCache):
+    """
+    Cache persisted in a local SQLite file, shared across restarts and
+    worker processes on the same host.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        super().__init__()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_expires_at ON search_cache (expires_at)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[1] <= time.time():
+            return None
+
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl),
+            )
+            self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+
+@lru_cache()
+def get_search_cache() -> SearchCache:
+    """
+    Get the configured search cache backend.
+
+    search_cache_backend can be "memory" (default), "sqlite" or "none".
+    """
+    settings = get_settings()
+    backend = settings.search_cache_backend.lower()
+
+    if backend == "sqlite":
+        return SQLiteSearchCache(settings.search_cache_path)
+    if backend == "memory":
+        return MemorySearchCache(max_entries=settings.search_cache_max_entries)
+
+    return NullSearchCache()
@@ -0,0 +1,180 @@
+import re
+import hashlib
+from collections import Counter
+from typing import List, Dict, Any, Set
+
+
+NUM_PERMUTATIONS = 128
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Word 3-grams: copies of one wire story share most of them, while
+# different stories about the same company share single words (its
+# product, investors, "announces") but rarely three in a row. The
+# threshold is tuned with benchmarks/news_dedup.py.
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.3
+
+# Fixed seeds so fingerprints are stable across processes
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % MERSENNE_PRIME or 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+TOKEN_RE = re.compile(r"[a-z]+|[0-9]+")
+
+STOPWORDS = set(
+    """
+    a an the and or but of to in on for with as at by from is are was were be been
+    its it this that these will has have had into after about up out over new
+    today said says company announced announces
+    """.split()
+)
+
+
+def shingles(
+    text: str, size: int = SHINGLE_SIZE, ignore: Set[str] = frozenset()
+) -> Set[int]:
+    """
+    Hash the word n-grams of a text, skipping stopwords and `ignore`d words.
+
+    Texts shorter than `size` words produce a single shingle of all words.
+    """
+    tokens = [
+        token
+        for token in TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS and token not in ignore
+    ]
+
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=4).digest(), "big")
+        for gram in grams
+    }
+
+
+def _common_words(texts: List[str]) -> Set[str]:
+    """
+    Words that appear in more than half of the texts.
+
+    In a news search for one company these are the company's own name and
+    industry terms; they say nothing about which story an item belongs to.
+    """
+    if len(texts) < 4:
+        return set()
+
+    counts = Counter(word for text in texts for word in set(TOKEN_RE.findall(text.lower())))
+    return {word for word, count in counts.items() if count > len(texts) / 2}
+
+
+def minhash(shingle_set: Set[int]) -> List[int]:
+    """MinHash signature of a shingle set (NUM_PERMUTATIONS values)."""
+    if not shingle_set:
+        return [MERSENNE_PRIME] * NUM_PERMUTATIONS
+
+    values = list(shingle_set)
+
+    return [
+        min([(a * value + b) % MERSENNE_PRIME for value in values])
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimated_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimate the Jaccard similarity of two sets from their signatures."""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / NUM_PERMUTATIONS
+
+
+def _item_text(item: Dict[str, Any]) -> str:
+    return f"{item.get('title', '')} {item.get('snippet', '')}"
+
+
+def _source_rank(item: Dict[str, Any]) -> tuple:
+    """Sort key for picking a cluster's representative: best first."""
+    position = item.get("position") or 1000
+    return (
+        item.get("published_at") is None,
+        position,
+        -len(item.get("snippet", "")),
+    )
+
+
+def group_news_items(
+    news_items: List[Dict[str, Any]], threshold: float = SIMILARITY_THRESHOLD
+) -> List[List[int]]:
+    """
+    Group the indexes of items that carry the same story text.
+
+    Items are compared on word 3-grams of their title and snippet, with
+    stopwords and words shared by most of the batch removed first. Two
+    items are copies when the estimated Jaccard similarity of those
+    shingle sets is at least `threshold`; grouping is transitive. Groups
+    are ordered by their first item.
+    """
+    texts = [_item_text(item) for item in news_items]
+    common = _common_words(texts)
+    signatures = [minhash(shingles(text, ignore=common)) for text in texts]
+
+    parent = list(range(len(news_items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(news_items)):
+        for j in range(i + 1, len(news_items)):
+            if find(i) == find(j):
+                continue
+
+            if estimated_similarity(signatures[i], signatures[j]) >= threshold:
+                parent[find(j)] = find(i)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(news_items)):
+        groups.setdefault(find(index), []).append(index)
+
+    return list(groups.values())
+
+
+def cluster_news_items(
+    news_items: List[Dict[str, Any]], threshold: float = SIMILARITY_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Collapse syndicated copies of the same story into one item per story.
+
+    Args:
+        news_items: News items as returned by get_news_items
+        threshold: Similarity at or above which items are merged
+
+    Returns:
+        One item per story, in order of each story's first appearance. Each
+        is the best-ranked source, with "also_reported_by" (other sources)
+        and "cluster_size" added and "published_at" set to the newest date
+        in the cluster.
+    """
+    stories = []
+
+    for group in group_news_items(news_items, threshold):
+        members = [news_items[index] for index in group]
+        best = min(members, key=_source_rank)
+        dates = [m["published_at"] for m in members if m.get("published_at")]
+
+        story = dict(best)
+        story["cluster_size"] = len(members)
+        story["also_reported_by"] = sorted(
+            {m.get("source", "") for m in members if m.get("source")}
+            - {best.get("source", "")}
+        )
+        story["published_at"] = max(dates) if dates else None
+        stories.append(story)
+
+    return stories
@@ -1,16 +1,125 @@
+import re
 import httpx
-from typing import List, Dict, Any
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
 
 from app.config import get_settings
+from app.services.host_health import get_host_health
+from app.services.search.cache import get_search_cache, make_cache_key
+from app.services.search.batch import SerperBatcher
 
 
-async def google_search(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+SERPER_BASE_URL = "https://google.serper.dev"
+
+RELATIVE_DATE_RE = re.compile(
+    r"^(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago$", re.IGNORECASE
+)
+
+RELATIVE_UNITS_IN_DAYS = {
+    "minute": 1 / 1440,
+    "hour": 1 / 24,
+    "day": 1,
+    "week": 7,
+    "month": 30,
+    "year": 365,
+}
+
+
+async def post_serper(endpoint: str, body: Any) -> Any:
+    """
+    Send a query (dict) or a batch of queries (list of dicts) to Serper.
+
+    Returns:
+        Decoded JSON response: a dict for a single query, a list of dicts
+        in request order for a batch
+    """
+
+    settings = get_settings()
+
+    if not settings.serper_api_key:
+        raise ValueError("Serper API key not configured.")
+
+    url = f"{SERPER_BASE_URL}/{endpoint}"
+
+    headers = {"X-API-KEY": settings.serper_api_key, "Content-Type": "application/json"}
+
+    async with httpx.AsyncClient() as client:
+        response = await get_host_health().request(
+            client, "POST", url, headers=headers, json=body, timeout=30.0
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+@lru_cache()
+def get_serper_batcher() -> SerperBatcher:
+    """Get the process-wide batcher used when serper_batch_enabled is set."""
+
+    settings = get_settings()
+
+    return SerperBatcher(
+        post=post_serper,
+        window_seconds=settings.serper_batch_window_ms / 1000,
+        max_batch_size=settings.serper_batch_max_size,
+    )
+
+
+async def serper_query(
+    endpoint: str, params: Dict[str, Any], cache_ttl: float
+) -> Dict[str, Any]:
+    """
+    POST a query to a Serper endpoint, reading through the search cache.
+
+    With serper_batch_enabled, cache misses are micro-batched with other
+    concurrent queries into a single multi-query request.
+
+    Args:
+        endpoint: Serper endpoint name ("search" or "news")
+        params: Request body (q, num and optionally tbs)
+        cache_ttl: Seconds to keep the response cached (0 disables caching)
+
+    Returns:
+        Decoded JSON response body
+
+    Raises:
+        ValueError: If the Serper API key is not configured
+        httpx.HTTPError: If the request fails
+    """
+
+    cache = get_search_cache()
+    key = make_cache_key(endpoint, params["q"], params.get("num"), params.get("tbs"))
+
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+
+    settings = get_settings()
+
+    if settings.serper_batch_enabled:
+        data = await get_serper_batcher().submit(endpoint, params)
+    else:
+        data = await post_serper(endpoint, params)
+
+    # Don't hold on to "nothing found" as long as real results
+    if not data.get("organic") and not data.get("news"):
+        cache_ttl = min(cache_ttl, settings.search_cache_ttl_news)
+
+    await cache.aset(key, data, cache_ttl)
+
+    return data
+
+
+async def google_search(
+    query: str, num_results: int = 5, cache_ttl: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Perform a Google search using Serper API.
 
     Args:
         query: Search query
         num_results: Number of results to return
+        cache_ttl: Override for how long results are cached, in seconds
 
     Returns:
         List of search results with title, link, and snippet
@@ -19,27 +128,16 @@ async def google_search(query: str, num_results: int = 5) -> List[Dict[str, Any]
 
     settings = get_settings()
 
-    api_key = settings.serper_api_key
-
-    if not api_key:
-        raise ValueError("Serper API key not configured.")
-
-    url = "https://google.serper.dev/search"
-
-    headers = {"X-API-KEY": settings.serper_api_key, "Content-Type": "application/json"}
+    if cache_ttl is None:
+        cache_ttl = settings.search_cache_ttl_search
 
     params = {"q": query, "num": num_results}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                url, headers=headers, json=params, timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("organic", [])
-        except httpx.HTTPError as e:
-            raise RuntimeError(f"Google search failed: {e}")
+    try:
+        data = await serper_query("search", params, cache_ttl)
+        return data.get("organic", [])
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"Google search failed: {e}")
 
 
 def days_back_to_tbs(days_back: int) -> str:
@@ -57,55 +155,127 @@ def days_back_to_tbs(days_back: int) -> str:
     return "qdr:y"
 
 
-async def get_recent_news(
-    company: str, num_results: int = 5, days_back: int = 30
+def parse_news_date(value: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse the date strings Serper returns for news items.
+
+    Handles relative dates ("3 hours ago", "2 weeks ago") and absolute ones
+    ("Mar 3, 2024", "3 Mar 2024", "2024-03-03").
+
+    Returns:
+        Timezone-aware datetime, or None if the value can't be parsed
+    """
+
+    if not value:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    value = value.strip()
+
+    match = RELATIVE_DATE_RE.match(value)
+    if match:
+        amount = int(match.group(1))
+        unit = match.group(2).lower()
+        return now - timedelta(days=amount * RELATIVE_UNITS_IN_DAYS[unit])
+
+    for date_format in ("%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+
+    return None
+
+
+async def get_news_items(
+    company: str, num_results: int = 10, days_back: int = 365
 ) -> List[Dict[str, Any]]:
     """
-    Get recent news about a company using Serper API.
+    Get news items about a company with parsed publication dates.
 
     Args:
         company: Company name to search for
         num_results: Number of news results
         days_back: Recency window. Mapped to Serper's qdr filters (day/week/month/year).
+
     Returns:
-        Formatted string of recent news
+        Serper news items, newest first, each with an added "published_at"
+        datetime (None when the date couldn't be parsed)
     """
 
     settings = get_settings()
 
-    api_key = settings.serper_api_key
+    params = {"q": company, "num": num_results, "tbs": days_back_to_tbs(days_back)}
 
-    if not api_key:
-        raise ValueError("Serper API key not configured.")
+    try:
+        data = await serper_query("news", params, settings.search_cache_ttl_news)
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"News search failed: {e}")
 
-    url = "https://google.serper.dev/news"
+    now = datetime.now(timezone.utc)
+    news_items = []
+    for item in data.get("news", []):
+        item: Dict[str, Any] = dict(item)
+        item["published_at"] = parse_news_date(item.get("date", ""), now)
+        news_items.append(item)
 
-    headers = {"X-API-KEY": settings.serper_api_key, "Content-Type": "application/json"}
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    news_items.sort(key=lambda item: item["published_at"] or oldest, reverse=True)
 
-    tbs = days_back_to_tbs(days_back)
-    params = {"q": company, "num": num_results, "tbs": tbs}  # Last month
+    return news_items
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                url, headers=headers, json=params, timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            news_items = data.get("news", [])
-        except httpx.HTTPError as e:
-            raise RuntimeError(f"News search failed: {e}")
+
+def filter_news_by_age(
+    news_items: List[Dict[str, Any]], days_back: int, now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Keep only items published within the last days_back days."""
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=days_back)
+
+    return [
+        item
+        for item in news_items
+        if item.get("published_at") and item["published_at"] >= cutoff
+    ]
+
+
+def format_news_items(news_items: List[Dict[str, Any]]) -> str:
+    """Format news items into a markdown string for the LLM."""
 
     if not news_items:
         return "No recent news found."
 
     news_list = []
     for item in news_items:
-        item: Dict[str, Any] = item
         title = item.get("title", "")
         snippet = item.get("snippet", "")
         date = item.get("date", "")
         link = item.get("link", "")
-        news_list.append(f"**{title}**\n{snippet}\nDate: {date}\nURL: {link}\n")
+        entry = f"**{title}**\n{snippet}\nDate: {date}\nURL: {link}\n"
+
+        if item.get("also_reported_by"):
+            entry += f"Also reported by: {', '.join(item['also_reported_by'])}\n"
+
+        news_list.append(entry)
 
     return "\n".join(news_list)
+
+
+async def get_recent_news(
+    company: str, num_results: int = 5, days_back: int = 30
+) -> str:
+    """
+    Get recent news about a company using Serper API.
+
+    Args:
+        company: Company name to search for
+        num_results: Number of news results
+        days_back: Recency window. Mapped to Serper's qdr filters (day/week/month/year).
+    Returns:
+        Formatted string of recent news
+    """
+
+    news_items = await get_news_items(company, num_results, days_back)
+
+    return format_news_items(news_items)
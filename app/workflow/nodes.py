@@ -14,6 +14,7 @@ from app.services.linkedin import (
 )
 from app.services.llm import invoke_llm
 import json
+import asyncio
 from app.prompts.research import (
     DIGITAL_PRESENCE_PROMPT,
     INTERVIEW_SCRIPT_PROMPT,
@@ -24,8 +25,32 @@ from app.prompts.research import (
 )
 from typing import Dict, Any
 from app.services.scraper import analyse_website, scrape_website_to_markdown
-from app.services.search.search import get_recent_news
+from app.services.feeds import fetch_feed_digest
+from app.services.search.search import (
+    get_news_items,
+    filter_news_by_age,
+    format_news_items,
+)
+from app.services.search.dedup import cluster_news_items
+from app.services.company_cache import company_keys, get_company_store
+from app.services.linkedin_index import get_linkedin_index
 from app.database import get_supabase_admin_client
+from app.services.lead_cache import get_lead_cache
+from app.services.research_search import index_research
+from app.services.lead_vectors import index_lead_embedding
+from app.workflow.persistence import build_research_rows, save_research_rows
+from app.config import get_settings
+
+
+def _company_keys(state: GraphState) -> list:
+    """Company cache keys for the lead being researched."""
+    company = state.get("company_data", {})
+    lead = state["current_lead"]
+
+    return company_keys(
+        website=company.get("website") or lead.get("company_website", ""),
+        linkedin_url=company.get("linkedin_url", ""),
+    )
 
 
 async def fetch_linkedin_data(state: GraphState) -> GraphState:
@@ -42,12 +67,33 @@ async def fetch_linkedin_data(state: GraphState) -> GraphState:
     try:
 
         linkedin_url = lead.get("linkedin_url")
+        linkedin_index = await asyncio.to_thread(get_linkedin_index)
+
+        if not linkedin_url:
+            # A confident local match skips the Google search
+            linkedin_url = await asyncio.to_thread(
+                linkedin_index.lookup,
+                name=lead.get("name", ""),
+                company=lead.get("company_name", ""),
+                website=lead.get("company_website", ""),
+                email=lead.get("email", ""),
+            )
 
         if not linkedin_url and lead.get("name") and lead.get("company_name"):
             linkedin_url = await find_linkedin_url(
                 name=lead["name"], company=lead["company_name"]
             )
 
+            if linkedin_url:
+                await asyncio.to_thread(
+                    linkedin_index.record,
+                    linkedin_url,
+                    name=lead["name"],
+                    company=lead["company_name"],
+                    website=lead.get("company_website", ""),
+                    email=lead.get("email", ""),
+                )
+
         if not linkedin_url:
             updates["erros"] = ["Could not find LinkedIn URL."]
             updates["linkedin_profile"] = ["LinkedIn profile not found."]
@@ -60,6 +106,16 @@ async def fetch_linkedin_data(state: GraphState) -> GraphState:
             updates["linkedin_profile"] = ["Error fetching LinkedIn profile."]
             return updates
 
+        await asyncio.to_thread(
+            linkedin_index.record,
+            linkedin_url,
+            name=profile_data.get("full_name") or lead.get("name", ""),
+            company=profile_data.get("company") or lead.get("company_name", ""),
+            website=profile_data.get("company_website")
+            or lead.get("company_website", ""),
+            email=lead.get("email", ""),
+        )
+
         formatted_profile = format_linkedin_profile(profile_data)
 
         profile_summary = invoke_llm(
@@ -83,7 +139,12 @@ async def fetch_linkedin_data(state: GraphState) -> GraphState:
         company_website = profile_data.get("company_website", "")
 
         if company_linkedin:
-            company_data = await scrape_linkedin_company_page(company_linkedin)
+            company_data = await get_company_store().get_or_compute(
+                company_keys(website=company_website, linkedin_url=company_linkedin),
+                "linkedin_company",
+                lambda: scrape_linkedin_company_page(company_linkedin),
+                cache_if=lambda data: "error" not in data,
+            )
             if "error" not in company_data:
                 formatted_linkedin_company = format_linkedin_company(company_data)
                 updates["company_data"] = CompanyInfo(
@@ -123,7 +184,12 @@ async def analyse_company_website(state: GraphState) -> Dict[str, Any]:
         return updates
 
     try:
-        website_data = await analyse_website(website_url)
+        website_data = await get_company_store().get_or_compute(
+            _company_keys(state),
+            "website",
+            lambda: analyse_website(website_url),
+            cache_if=lambda data: not data.summary.startswith("Could not analyze"),
+        )
         updates["website_analysis"] = website_data.summary
 
         current_company = state.get("company_data", CompanyInfo())
@@ -159,6 +225,51 @@ async def analyse_company_website(state: GraphState) -> Dict[str, Any]:
     return updates
 
 
+async def _analyse_blog(blog_url: str, company_name: str) -> Dict[str, Any]:
+    """
+    Analyze a company blog.
+
+    Returns:
+        {"analysis", "source"} or {"error"} if the blog couldn't be fetched
+    """
+
+    # Fast path: exact post dates and titles from the feed or sitemap
+    digest = await fetch_feed_digest(blog_url)
+
+    if digest:
+        blog_content = digest.to_markdown()
+        blog_source = digest.source_url
+    else:
+        blog_content, _ = await scrape_website_to_markdown(blog_url)
+        blog_source = blog_url
+
+        if blog_content.startswith("Error"):
+            return {"error": f"Could not analyze blog: {blog_content}"}
+
+    prompt = f"""
+    Analyze the blog content for {company_name}.
+
+    The input is either a digest built from the blog's feed or sitemap
+    (with exact post dates and counts) or the scraped blog page.
+    
+    Evaluate:
+    1. Publishing frequency
+    2. Topics and relevance
+    3. Content quality
+    4. SEO indicators
+    5. Improvement opportunities
+    
+    Provide a score out of 10.
+    """
+
+    blog_analysis = invoke_llm(
+        system_prompt=prompt,
+        user_message=blog_content,
+    )
+
+    return {"analysis": blog_analysis, "source": blog_source}
+
+
 async def analyse_blog_content(state: GraphState) -> Dict[str, Any]:
     """Node: Analyze social media presence."""
 
@@ -177,29 +288,21 @@ async def analyse_blog_content(state: GraphState) -> Dict[str, Any]:
         return updates
 
     try:
-        blog_content = await scrape_website_to_markdown(blog_url)
         company_name = company.get("name", "the company")
 
-        print(blog_content)
-
-        prompt = f"""
-        Analyze the blog content for {company_name}.
-        
-        Evaluate:
-        1. Publishing frequency
-        2. Topics and relevance
-        3. Content quality
-        4. SEO indicators
-        5. Improvement opportunities
-        
-        Provide a score out of 10.
-        """
-
-        blog_analysis = invoke_llm(
-            system_prompt=prompt,
-            user_message=blog_content,
+        result = await get_company_store().get_or_compute(
+            _company_keys(state),
+            "blog_analysis",
+            lambda: _analyse_blog(blog_url, company_name),
+            cache_if=lambda result: "error" not in result,
         )
 
+        if "error" in result:
+            updates["blog_analysis"] = result["error"]
+            return updates
+
+        blog_analysis = result["analysis"]
+
         updates["blog_analysis"] = blog_analysis
 
         updates["reports"] = [
@@ -208,7 +311,7 @@ async def analyse_blog_content(state: GraphState) -> Dict[str, Any]:
                 title="Blog Content Analysis",
                 content=blog_analysis,
                 is_markdown=True,
-                metadata={"blog_url": blog_url},
+                metadata={"blog_url": blog_url, "source": result["source"]},
             )
         ]
 
@@ -266,6 +369,51 @@ Found profiles:
     return updates
 
 
+async def _analyse_news(company_name: str) -> Dict[str, Any]:
+    """
+    Summarize recent news about a company.
+
+    Returns:
+        {"analysis", "days_back"} where days_back is the window used
+    """
+
+    # One request for the whole year, then pick the window locally.
+    # Syndicated copies are collapsed so a wider window stays cheap.
+    news_items = await get_news_items(company_name, num_results=20, days_back=365)
+    news_items = cluster_news_items(news_items)
+
+    days_back_used = 30
+    selected_news = filter_news_by_age(news_items, days_back_used)
+
+    if not selected_news:
+        days_back_used = 365
+        selected_news = news_items
+
+    selected_news = selected_news[:5]
+
+    prompt = f"""
+    Summarize recent news about {company_name}.
+    
+    Focus on:
+    1. Major announcements
+    2. Product launches
+    3. Growth indicators
+    4. Challenges
+    5. Industry trends
+    
+    Highlight anything relevant for sales outreach.
+    """
+
+    if selected_news:
+        analysis = invoke_llm(
+            system_prompt=prompt, user_message=format_news_items(selected_news)
+        )
+    else:
+        analysis = "No recent news found."
+
+    return {"analysis": analysis, "days_back": days_back_used}
+
+
 async def anayse_recent_news(state: GraphState) -> Dict[str, Any]:
     """Node: Gather recent news about the company."""
     print("📍 Node: anayse_recent_news")
@@ -284,34 +432,14 @@ async def anayse_recent_news(state: GraphState) -> Dict[str, Any]:
         return updates
 
     try:
-        days_back_used = 30
-        news = await get_recent_news(
-            company_name, num_results=5, days_back=days_back_used
+        result = await get_company_store().get_or_compute(
+            _company_keys(state),
+            "news_analysis",
+            lambda: _analyse_news(company_name),
         )
 
-        if (not news) or (isinstance(news, str) and news.startswith("No recent news")):
-            days_back_used = 365
-            news = await get_recent_news(
-                company_name, num_results=5, days_back=days_back_used
-            )
-
-        prompt = f"""
-        Summarize recent news about {company_name}.
-        
-        Focus on:
-        1. Major announcements
-        2. Product launches
-        3. Growth indicators
-        4. Challenges
-        5. Industry trends
-        
-        Highlight anything relevant for sales outreach.
-        """
-
-        if news or not news.startswith("No recent news"):
-            analysis = invoke_llm(system_prompt=prompt, user_message=news)
-        else:
-            analysis = "No recent news found."
+        analysis = result["analysis"]
+        days_back_used = result["days_back"]
 
         updates["news_analysis"] = analysis
         updates["reports"] = [
@@ -320,7 +448,7 @@ async def anayse_recent_news(state: GraphState) -> Dict[str, Any]:
                 title="Recent News Analysis",
                 content=analysis,
                 is_markdown=True,
-                metadata={"company_name": company_name},
+                metadata={"company_name": company_name, "days_back": days_back_used},
             )
         ]
     except Exception as e:
@@ -358,9 +486,15 @@ async def generate_digital_presence_report(
     ## Recent News
     {state.get('news_analysis', 'Not available')}
     """
-    report = invoke_llm(
-        system_prompt=DIGITAL_PRESENCE_PROMPT,
-        user_message=input_data,
+
+    async def build_report() -> str:
+        return invoke_llm(
+            system_prompt=DIGITAL_PRESENCE_PROMPT,
+            user_message=input_data,
+        )
+
+    report = await get_company_store().get_or_compute(
+        _company_keys(state), "digital_presence_report", build_report
     )
 
     updates["digital_presence_report"] = report
@@ -611,82 +745,33 @@ async def save_to_database(state: GraphState) -> Dict[str, Any]:
 
     updates = {"current_step": "saving", "completed_steps": ["saving"]}
 
-    supabase = get_supabase_admin_client()
-
-    lead_id = state["current_lead"]["id"]
-    user_id = state["user_id"]
+    supabase = await get_supabase_admin_client()
 
     try:
-        status = "outreach_ready" if state.get("is_qualified") else "not_qualified"
-
-        supabase.table("leads").update(
-            {
-                "status": status,
-                "score": state.get("lead_score", 0),
-                "score_details": state.get("score_details", {}),
-            }
-        ).eq("id", str(lead_id)).execute()
-
-        company_data = state.get("company_data", {})
-        if company_data:
-            supabase.table("company_data").upsert(
-                {
-                    "lead_id": lead_id,
-                    "name": company_data.get("name", ""),
-                    "profile": company_data.get("profile", ""),
-                    "website": company_data.get("website", ""),
-                    "blog_url": company_data.get("social_media_links", {}).get(
-                        "blog", ""
-                    ),
-                    "facebook_url": company_data.get("social_media_links", {}).get(
-                        "facebook", ""
-                    ),
-                    "twitter_url": company_data.get("social_media_links", {}).get(
-                        "twitter", ""
-                    ),
-                    "youtube_url": company_data.get("social_media_links", {}).get(
-                        "youtube", ""
-                    ),
-                },
-                on_conflict="lead_id",
-            ).execute()
-        for report in state.get("reports", []):
-            supabase.table("reports").insert(
-                {
-                    "lead_id": lead_id,
-                    "user_id": user_id,
-                    "report_type": report["report_type"],
-                    "title": report["title"],
-                    "content": report["content"],
-                    "is_markdown": report.get("is_markdown", True),
-                    "metadata": report.get("metadata", {}),
-                }
-            ).execute()
-
-        outreach = state.get("outreach_materials", {})
-
-        if outreach.get("email_body"):
-            supabase.table("outreach_materials").insert(
-                {
-                    "lead_id": lead_id,
-                    "user_id": user_id,
-                    "material_type": "email",
-                    "subject": outreach.get("email_subject", ""),
-                    "content": outreach.get("email_body", ""),
-                }
-            ).execute()
-
-        if outreach.get("interview_script"):
-            supabase.table("outreach_materials").insert(
-                {
-                    "lead_id": lead_id,
-                    "user_id": user_id,
-                    "material_type": "interview_script",
-                    "content": outreach.get("interview_script", ""),
-                }
-            ).execute()
+        rows = build_research_rows(state)
+        await save_research_rows(
+            supabase, rows, use_rpc=get_settings().research_save_use_rpc
+        )
+        get_lead_cache().invalidate(rows["lead_id"])
     except Exception as e:
         updates["errors"] = [f"Database error: {str(e)}"]
+        return updates
+
+    # The research is saved; failing to index it only costs discoverability
+    errors = []
+
+    try:
+        await index_research(supabase, state)
+    except Exception as e:
+        errors.append(f"Search index error: {str(e)}")
+
+    try:
+        await index_lead_embedding(state)
+    except Exception as e:
+        errors.append(f"Embedding index error: {str(e)}")
+
+    if errors:
+        updates["errors"] = errors
 
     return updates
 
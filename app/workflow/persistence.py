@@ -0,0 +1,169 @@
+"""
+Persistence for Research Workflow Results
+
+Turns the final workflow state into table rows and writes them in as few
+round trips as possible.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from app.services.report_store import build_content_row
+
+
+def idempotency_key(*parts: Any) -> str:
+    """
+    Stable key for a row produced by a workflow run.
+
+    Retrying the save for the same run produces the same keys, so rows
+    already written are skipped instead of duplicated.
+    """
+    raw = ":".join(str(part) for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_research_rows(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build every row save_to_database writes for a finished run.
+
+    Report text goes into "report_contents" once per distinct content
+    (compressed, keyed by hash); report rows reference it by content_hash.
+
+    Returns:
+        {"lead_id", "lead": update dict, "company_data": row or None,
+         "report_contents": [rows], "reports": [rows],
+         "outreach_materials": [rows]}
+    """
+    lead_id = state["current_lead"]["id"]
+    user_id = state["user_id"]
+    run_id = state.get("run_id", "")
+
+    status = "outreach_ready" if state.get("is_qualified") else "not_qualified"
+
+    lead = {
+        "status": status,
+        "score": state.get("lead_score", 0),
+        "score_details": state.get("score_details", {}),
+        "research_completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    company_row = None
+    company_data = state.get("company_data", {})
+    if company_data:
+        social_links = company_data.get("social_media_links", {})
+        company_row = {
+            "lead_id": lead_id,
+            "name": company_data.get("name", ""),
+            "profile": company_data.get("profile", ""),
+            "website": company_data.get("website", ""),
+            "blog_url": social_links.get("blog", ""),
+            "facebook_url": social_links.get("facebook", ""),
+            "twitter_url": social_links.get("twitter", ""),
+            "youtube_url": social_links.get("youtube", ""),
+        }
+
+    contents: Dict[str, Dict[str, Any]] = {}
+    reports: List[Dict[str, Any]] = []
+    for index, report in enumerate(state.get("reports", [])):
+        content_row = build_content_row(report["content"])
+        contents.setdefault(content_row["hash"], content_row)
+
+        reports.append(
+            {
+                "lead_id": lead_id,
+                "user_id": user_id,
+                "report_type": report["report_type"],
+                "title": report["title"],
+                "content": None,
+                "content_hash": content_row["hash"],
+                "is_markdown": report.get("is_markdown", True),
+                "metadata": report.get("metadata", {}),
+                "idempotency_key": idempotency_key(
+                    lead_id, run_id, "report", report["report_type"], index
+                ),
+            }
+        )
+
+    outreach_rows: List[Dict[str, Any]] = []
+    outreach = state.get("outreach_materials", {})
+
+    if outreach.get("email_body"):
+        outreach_rows.append(
+            {
+                "lead_id": lead_id,
+                "user_id": user_id,
+                "material_type": "email",
+                "subject": outreach.get("email_subject", ""),
+                "content": outreach.get("email_body", ""),
+                "idempotency_key": idempotency_key(lead_id, run_id, "email"),
+            }
+        )
+
+    if outreach.get("interview_script"):
+        outreach_rows.append(
+            {
+                "lead_id": lead_id,
+                "user_id": user_id,
+                "material_type": "interview_script",
+                "subject": None,
+                "content": outreach.get("interview_script", ""),
+                "idempotency_key": idempotency_key(
+                    lead_id, run_id, "interview_script"
+                ),
+            }
+        )
+
+    return {
+        "lead_id": str(lead_id),
+        "lead": lead,
+        "company_data": company_row,
+        "report_contents": list(contents.values()),
+        "reports": reports,
+        "outreach_materials": outreach_rows,
+    }
+
+
+async def save_research_rows(
+    supabase, rows: Dict[str, Any], use_rpc: bool = True
+) -> int:
+    """
+    Write the rows from build_research_rows.
+
+    With use_rpc, everything is sent to the save_research_results database
+    function in one request and committed in one transaction. Otherwise
+    each table gets one bulk write (up to five requests, not atomic).
+    Either way, rows whose idempotency_key already exists are skipped.
+
+    Returns:
+        Number of requests made
+    """
+    if use_rpc:
+        await supabase.rpc("save_research_results", {"payload": rows}).execute()
+        return 1
+
+    requests = 1
+    await supabase.table("leads").update(rows["lead"]).eq(
+        "id", rows["lead_id"]
+    ).execute()
+
+    if rows["company_data"]:
+        requests += 1
+        await supabase.table("company_data").upsert(
+            rows["company_data"], on_conflict="lead_id"
+        ).execute()
+
+    if rows["report_contents"]:
+        requests += 1
+        await supabase.table("report_contents").upsert(
+            rows["report_contents"], on_conflict="hash", ignore_duplicates=True
+        ).execute()
+
+    for table in ("reports", "outreach_materials"):
+        if rows[table]:
+            requests += 1
+            await supabase.table(table).upsert(
+                rows[table], on_conflict="idempotency_key", ignore_duplicates=True
+            ).execute()
+
+    return requests
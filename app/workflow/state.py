@@ -5,6 +5,7 @@ This file defines the data structure that flows through the workflow.
 Each node receives this state and can update parts of it.
 """
 
+import uuid
 from typing import TypedDict, Annotated, List, Optional, Dict, Any
 from operator import add
 
@@ -71,6 +72,7 @@ class GraphState(TypedDict, total=False):
 
     # Context
     user_id: str
+    run_id: str
     current_lead: LeadInfo
     company_data: CompanyInfo
 
@@ -104,6 +106,7 @@ def create_initial_state(lead_data: Dict[str, Any], user_id: str) -> GraphState:
     """Create initial state for a new workflow run."""
     return GraphState(
         user_id=user_id,
+        run_id=str(uuid.uuid4()),
         current_lead=LeadInfo(
             id=lead_data.get("id", ""),
             name=lead_data.get("name", ""),
@@ -0,0 +1,132 @@
+"""
+Benchmark the orjson fast path for database rows.
+
+Serves the same payloads from a throwaway FastAPI app in two ways: the
+default (response_model validation + stdlib json for lead lists,
+jsonable_encoder + json for the reports dict) and the fast path (rows
+returned as an OrjsonResponse). Times whole requests through TestClient
+and checks the OpenAPI schema is identical for both.
+
+Usage:
+    python -m benchmarks.json_responses [leads] [reports] [requests]
+"""
+
+import sys
+import time
+import uuid
+import random
+import statistics
+from typing import List
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.responses import OrjsonResponse
+from app.models.lead import Lead
+from benchmarks.report_corpus import make_report_corpus
+
+
+def make_leads(count: int) -> list:
+    rng = random.Random(3)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+
+    for i in range(count):
+        created_at = (start + timedelta(minutes=i)).isoformat()
+        rows.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "user_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "external_id": None,
+                "name": f"Person {i}",
+                "email": f"person{i}@example{i % 300}.com",
+                "phone": "+1 555 0100",
+                "address": None,
+                "company_name": f"Example {i % 300}",
+                "company_website": f"https://example{i % 300}.com",
+                "company_linkedin_url": None,
+                "linkedin_url": f"https://www.linkedin.com/in/person-{i}",
+                "status": rng.choice(["new", "qualified", "not_qualified"]),
+                "score": round(rng.random() * 100, 1),
+                "score_details": {
+                    "fit": rng.random(),
+                    "reasoning": "Strong fit for the product. " * 10,
+                    "signals": ["hiring", "funding", "expansion"],
+                },
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+
+    return rows
+
+
+def build_app(leads: list, reports: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/leads", response_model=List[Lead])
+    async def default_leads():
+        return leads
+
+    @app.get("/fast/leads", response_model=List[Lead])
+    async def fast_leads():
+        return OrjsonResponse(leads)
+
+    @app.get("/default/reports")
+    async def default_reports():
+        return {"reports": reports}
+
+    @app.get("/fast/reports")
+    async def fast_reports():
+        return OrjsonResponse({"reports": reports})
+
+    return app
+
+
+def time_requests(client: TestClient, path: str, requests: int) -> tuple:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return statistics.median(timings) * 1000, response.json()
+
+
+def main():
+    lead_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    report_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+    leads = make_leads(lead_count)
+    reports = make_report_corpus(leads=(report_count + 8) // 9)[:report_count]
+
+    app = build_app(leads, reports)
+    client = TestClient(app)
+
+    print(f"{'payload':<14} {'default (ms)':>13} {'fast (ms)':>10} {'speedup':>8}")
+
+    payloads = [(f"{lead_count} leads", "leads"), (f"{report_count} reports", "reports")]
+    for name, kind in payloads:
+        default_ms, default_body = time_requests(client, f"/default/{kind}", requests)
+        fast_ms, fast_body = time_requests(client, f"/fast/{kind}", requests)
+        assert len(default_body) == len(fast_body)
+        print(
+            f"{name:<14} {default_ms:>13.2f} {fast_ms:>10.2f} "
+            f"{default_ms / fast_ms:>7.1f}x"
+        )
+
+    paths = app.openapi()["paths"]
+    schemas = [
+        paths[f"/{mode}/leads"]["get"]["responses"]["200"]["content"]
+        for mode in ("default", "fast")
+    ]
+    for content in schemas:
+        content["application/json"]["schema"].pop("title")  # Named after the route
+    same = schemas[0] == schemas[1]
+    print(f"\nOpenAPI response schema unchanged by the fast path: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark lookalike-lead queries on the in-memory vector index.
+
+First embeds part of the synthetic report corpus with the hashing provider
+(global research report plus a company-level report, the way research is
+embedded) and checks that a lead's nearest neighbours are the other leads
+at its company. Then fills the index with random 256-d vectors and times
+top-10 queries across every lead (what the lookalikes endpoint runs), plus
+the cost of adding one lead to a full index.
+
+Usage:
+    python -m benchmarks.lead_lookalikes [sizes] [dimensions]
+    python -m benchmarks.lead_lookalikes 100000,1000000 256
+"""
+
+import sys
+import time
+import statistics
+from itertools import groupby
+
+import numpy as np
+
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.lead_vectors import LeadVectorIndex, lead_embedding_text
+from benchmarks.report_corpus import make_report_corpus
+
+
+CHUNK_SIZE = 100_000
+QUERIES = 200
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def check_quality(dimensions: int, leads: int = 2000, per_company: int = 4):
+    provider = HashingEmbeddingProvider(dimensions)
+    index = LeadVectorIndex(dimensions, provider.name)
+
+    texts, companies = {}, {}
+    corpus = make_report_corpus(leads, leads_per_company=per_company)
+    for position, (lead_id, rows) in enumerate(
+        groupby(corpus, key=lambda row: row["lead_id"])
+    ):
+        reports = {row["report_type"]: row["content"] for row in rows}
+        texts[lead_id] = lead_embedding_text(
+            reports["global_research"], reports["website_analysis"]
+        )
+        companies[lead_id] = position // per_company
+
+    start = time.perf_counter()
+    vectors = provider.embed(list(texts.values()))
+    embed_ms = (time.perf_counter() - start) * 1000 / len(texts)
+    index.upsert(zip(texts, ["user"] * len(texts), vectors))
+
+    hits = 0
+    for lead_id in texts:
+        matches = index.query(
+            index.vector(lead_id), per_company - 1, exclude=[lead_id]
+        )
+        hits += sum(companies[match] == companies[lead_id] for match, _ in matches)
+
+    precision = hits / (len(texts) * (per_company - 1))
+    print(
+        f"hashing-{dimensions}: {embed_ms:.2f}ms to embed a lead; top {per_company - 1} "
+        f"lookalikes at the same company: {precision:.0%}\n"
+    )
+
+
+def fill(index: LeadVectorIndex, size: int, rng):
+    for offset in range(0, size, CHUNK_SIZE):
+        count = min(CHUNK_SIZE, size - offset)
+        vectors = rng.standard_normal((count, index.dimensions), dtype=np.float32)
+        index.upsert(
+            (f"lead-{offset + i}", "user", vectors[i])
+            for i in range(count)
+        )
+
+
+def time_queries(index: LeadVectorIndex, size: int, rng):
+    timings = []
+    for _ in range(QUERIES):
+        lead = int(rng.integers(size))
+        vector = index.vector(f"lead-{lead}")
+
+        start = time.perf_counter()
+        index.query(vector, 10, exclude=[f"lead-{lead}"])
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def main():
+    sizes = sys.argv[1] if len(sys.argv) > 1 else "100000,1000000"
+    sizes = [int(size) for size in sizes.split(",")]
+    dimensions = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+
+    check_quality(dimensions)
+
+    print(
+        f"{'vectors':>10} {'MB':>7} {'build (s)':>10} "
+        f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'add one (ms)':>13}"
+    )
+
+    rng = np.random.default_rng(5)
+    for size in sizes:
+        index = LeadVectorIndex(dimensions, "random")
+
+        start = time.perf_counter()
+        fill(index, size, rng)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.upsert([("lead-new", "user", rng.standard_normal(dimensions))])
+        add_ms = (time.perf_counter() - start) * 1000
+
+        megabytes = size * dimensions * 4 / 1e6
+        timings = time_queries(index, size, rng)
+        print(
+            f"{size:>10,} {megabytes:>7.0f} {build:>10.1f} "
+            f"{statistics.median(timings):>9.1f} {percentile(timings, 0.95):>9.1f} "
+            f"{add_ms:>13.3f}"
+        )
+
+        del index
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark OFFSET paging against keyset (created_at, id) paging.
+
+Builds a leads table in SQLite with the same (created_at DESC, id DESC)
+index the migration adds, then times fetching one page at increasing
+depths. OFFSET has to walk every skipped row, so its latency grows with
+the page number. Keyset starts from the cursor, so it stays flat.
+
+Usage:
+    python -m benchmarks.lead_pagination [rows] [page_size]
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import sqlite3
+import statistics
+from datetime import datetime, timedelta, timezone
+
+
+def build_table(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE leads (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            status TEXT,
+            score REAL,
+            score_details TEXT,
+            created_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX leads_created_at_id_idx ON leads (created_at DESC, id DESC)"
+    )
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    details = json.dumps({"reasoning": "x" * 2000})
+    statuses = ["new", "researching", "qualified", "not_qualified"]
+
+    conn.executemany(
+        "INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                str(uuid.uuid4()),
+                f"Lead {i}",
+                random.choice(statuses),
+                random.random() * 100,
+                details,
+                (start + timedelta(seconds=i // 3)).isoformat(),  # Some ties
+            )
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    return conn
+
+
+def offset_page(conn, offset: int, page_size: int) -> list:
+    return conn.execute(
+        "SELECT id, name, status, score, created_at FROM leads "
+        "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+        (page_size, offset),
+    ).fetchall()
+
+
+def keyset_page(conn, cursor, page_size: int) -> list:
+    if cursor is None:
+        return offset_page(conn, 0, page_size)
+
+    created_at, row_id = cursor
+    return conn.execute(
+        "SELECT id, name, status, score, created_at FROM leads "
+        "WHERE created_at <= ? AND (created_at < ? OR id < ?) "
+        "ORDER BY created_at DESC, id DESC LIMIT ?",
+        (created_at, created_at, row_id, page_size),
+    ).fetchall()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"Building {rows:,} leads...")
+    conn = build_table(rows)
+
+    print(f"\n{'page':>6} {'offset (ms)':>12} {'keyset (ms)':>12}")
+
+    total_pages = rows // page_size
+    depths = [1, 10, 100, total_pages // 4, total_pages // 2, total_pages - 1]
+
+    for page in sorted(set(d for d in depths if d >= 1)):
+        offset = (page - 1) * page_size
+
+        # The cursor a client would hold: the last row of the previous page
+        cursor = None
+        if offset:
+            last = offset_page(conn, offset - 1, 1)[0]
+            cursor = (last[4], last[0])
+
+        assert offset_page(conn, offset, page_size) == keyset_page(
+            conn, cursor, page_size
+        )
+
+        offset_ms = timed(lambda: offset_page(conn, offset, page_size))
+        keyset_ms = timed(lambda: keyset_page(conn, cursor, page_size))
+        print(f"{page:>6} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark news clustering on a labelled Serper /news corpus.
+
+Each item has a "story" (the event it reports) and, for copies of the
+same text (wire releases, syndicated articles), a shared "release".
+Merging copies is the goal and merging different stories the failure,
+so precision is measured against stories and recall against releases,
+over a sweep of thresholds to tune SIMILARITY_THRESHOLD. Also reports the
+time spent clustering and how much smaller the LLM input gets.
+
+The shipped corpus is synthetic; record live results for tuning with
+benchmarks/record_news_corpus.py.
+
+Usage:
+    python -m benchmarks.news_dedup [path/to/corpus.json]
+"""
+
+import sys
+import json
+import time
+from itertools import combinations
+from pathlib import Path
+
+from app.services.search.dedup import (
+    SIMILARITY_THRESHOLD,
+    cluster_news_items,
+    group_news_items,
+)
+
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "news_corpus.json"
+THRESHOLDS = (0.1, 0.2, 0.3, 0.4, 0.5)
+
+
+def format_items(items) -> str:
+    """Same layout as format_news_items, without importing the HTTP stack."""
+    parts = []
+    for item in items:
+        line = f"**{item['title']}**\n{item['snippet']}\nDate: {item['date']}\nURL: {item['link']}\n"
+        if item.get("also_reported_by"):
+            line += f"Also reported by: {', '.join(item['also_reported_by'])}\n"
+        parts.append(line)
+    return "\n".join(parts)
+
+
+def label_pairs(items, label) -> set:
+    """Index pairs whose items share a label (items without one are unique)."""
+    labels = [item.get(label) or item["link"] for item in items]
+    return {
+        (a, b) for a, b in combinations(range(len(items)), 2)
+        if labels[a] == labels[b]
+    }
+
+
+def pair_scores(items, groups) -> tuple:
+    """Pairwise precision (same story) and recall (copies merged) of a grouping."""
+    predicted = {}
+    for group_index, group in enumerate(groups):
+        for member in group:
+            predicted[member] = group_index
+
+    predicted_pairs = {
+        (a, b) for a, b in combinations(range(len(items)), 2)
+        if predicted[a] == predicted[b]
+    }
+    same_story = label_pairs(items, "story")
+    copies = label_pairs(items, "release")
+
+    precision = (
+        len(predicted_pairs & same_story) / len(predicted_pairs)
+        if predicted_pairs else 1.0
+    )
+    recall = len(predicted_pairs & copies) / len(copies) if copies else 1.0
+    return precision, recall
+
+
+def main():
+    corpus_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CORPUS
+    items = json.loads(corpus_path.read_text())["news"]
+
+    stories = cluster_news_items(items)
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        cluster_news_items(items)
+    per_call_ms = (time.perf_counter() - start) / runs * 1000
+
+    labelled = len({item["story"] for item in items})
+    releases = len({item.get("release") or item["link"] for item in items})
+
+    before = format_items(items)
+    after = format_items(stories)
+
+    print(f"Corpus: {corpus_path.name}")
+    print(
+        f"Items: {len(items)}  stories: {labelled}  distinct texts: {releases}  "
+        f"clusters: {len(stories)}"
+    )
+    for threshold in THRESHOLDS:
+        precision, recall = pair_scores(items, group_news_items(items, threshold))
+        marker = "  (default)" if threshold == SIMILARITY_THRESHOLD else ""
+        print(
+            f"Threshold {threshold:.1f}: pairwise precision {precision:.2f}  "
+            f"recall {recall:.2f}{marker}"
+        )
+    print(f"Clustering time: {per_call_ms:.2f} ms per call")
+    print(
+        f"LLM input: {len(before)} -> {len(after)} chars "
+        f"(~{len(before) // 4} -> ~{len(after) // 4} tokens, "
+        f"{100 - len(after) * 100 // len(before)}% smaller)"
+    )
+
+
+if __name__ == "__main__":
+    main()
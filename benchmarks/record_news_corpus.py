@@ -0,0 +1,55 @@
+"""
+Record live Serper /news results as a corpus for benchmarks/news_dedup.py.
+
+Runs the same news query the workflow does (get_news_items, 20 results
+over a year) for one company, the batch the workflow clusters, and
+writes the items with empty "story" and "release" fields. Fill those in
+by hand before benchmarking: items reporting the same event share a
+story, and copies of the same text (wire releases, syndicated articles)
+also share a release. Needs SERPER_API_KEY.
+
+Usage:
+    python -m benchmarks.record_news_corpus out.json "Company Name"
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+from app.services.search.search import get_news_items
+
+
+FIELDS = ("title", "snippet", "source", "date", "link", "position")
+
+
+async def record(company):
+    items = await get_news_items(company, num_results=20, days_back=365)
+    return [
+        {
+            **{field: item.get(field) for field in FIELDS},
+            "story": "",
+            "release": "",
+        }
+        for item in items
+    ]
+
+
+def main():
+    if len(sys.argv) != 3:
+        raise SystemExit(__doc__)
+
+    path, company = Path(sys.argv[1]), sys.argv[2]
+    news = asyncio.run(record(company))
+    path.write_text(
+        json.dumps(
+            {"description": f"Serper /news results for {company}", "news": news},
+            indent=2,
+        )
+        + "\n"
+    )
+    print(f"Wrote {len(news)} items to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Synthetic research-report corpus shared by the report benchmarks.
+
+Mirrors what the workflow writes per lead: nine markdown reports. Five of
+them are company-level (website, blog, social, news, digital presence) and
+come out nearly identical for every lead at the same company; the rest are
+about the person. Text is drawn from a fixed vocabulary with a seeded RNG,
+so it compresses roughly like real prose rather than like repeated filler.
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+
+COMPANY_REPORTS = [
+    ("website_analysis", "Website Analysis"),
+    ("blog_analysis", "Blog Analysis"),
+    ("social_media_analysis", "Social Media Analysis"),
+    ("news_analysis", "Recent News"),
+    ("digital_presence", "Digital Presence Report"),
+]
+
+LEAD_REPORTS = [
+    ("linkedin_profile", "LinkedIn Profile"),
+    ("lead_profile", "Lead Profile"),
+    ("global_research", "Global Research Report"),
+    ("outreach_report", "Outreach Report"),
+]
+
+WORDS = (
+    "platform customers revenue growth pipeline analytics cloud data team "
+    "product launch market enterprise pricing integration security compliance "
+    "hiring engineering sales marketing partnership funding series round "
+    "strategy roadmap expansion europe north america retail logistics finance "
+    "automation workflow dashboard reporting onboarding retention churn "
+    "kubernetes infrastructure migration latency reliability support "
+    "leadership founder ceo cto vp director manager quarter annual recent "
+    "announced released improved reduced increased focused experience "
+    "content webinar case study newsletter community campaign audience "
+    "engagement followers posts video youtube twitter linkedin blog website"
+).split()
+
+HEADINGS = [
+    "Overview", "Key Findings", "Products and Services", "Target Market",
+    "Recent Activity", "Strengths", "Opportunities", "Risks", "Talking Points",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def _markdown(rng: random.Random, title: str, sections: int) -> str:
+    parts = [f"# {title}\n"]
+    for heading in rng.sample(HEADINGS, sections):
+        parts.append(f"## {heading}\n")
+        parts.append(" ".join(_sentence(rng) for _ in range(rng.randint(3, 7))) + "\n")
+        for _ in range(rng.randint(2, 5)):
+            parts.append(f"- {_sentence(rng)}")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def make_report_corpus(
+    leads: int = 1000, leads_per_company: int = 4, seed: int = 7
+) -> List[Dict]:
+    """
+    Report rows for `leads` leads spread over companies.
+
+    Returns:
+        Rows shaped like the reports table (id, lead_id, user_id,
+        report_type, title, content, is_markdown, metadata, created_at)
+    """
+    rng = random.Random(seed)
+    user_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    company_reports: Dict[int, Dict[str, str]] = {}
+    rows = []
+
+    for lead_index in range(leads):
+        lead_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        company = lead_index // leads_per_company
+        created_at = start + timedelta(minutes=lead_index)
+
+        if company not in company_reports:
+            company_rng = random.Random(f"{seed}:{company}")
+            company_reports[company] = {
+                report_type: _markdown(company_rng, f"{title}: Company {company}", 5)
+                for report_type, title in COMPANY_REPORTS
+            }
+
+        reports = [
+            (report_type, title, company_reports[company][report_type])
+            for report_type, title in COMPANY_REPORTS
+        ]
+        reports += [
+            (report_type, title, _markdown(rng, f"{title}: Lead {lead_index}", 4))
+            for report_type, title in LEAD_REPORTS
+        ]
+
+        for report_type, title, content in reports:
+            rows.append(
+                {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "lead_id": lead_id,
+                    "user_id": user_id,
+                    "report_type": report_type,
+                    "title": title,
+                    "content": content,
+                    "is_markdown": True,
+                    "metadata": {},
+                    "created_at": created_at.isoformat(),
+                }
+            )
+
+    return rows
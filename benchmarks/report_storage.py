@@ -0,0 +1,102 @@
+"""
+Benchmark content-addressed, compressed report storage.
+
+Uses the synthetic report corpus (nine reports per lead; the five
+company-level ones are identical for leads at the same company) plus a
+share of reruns, and compares:
+
+    inline        full markdown in every reports row (previous layout)
+    dedup         one copy per distinct content
+    dedup+zlib    ... compressed with zlib
+    dedup+zstd    ... compressed with zstd (if zstandard is installed)
+
+It also reports the CPU cost of writing (hash + compress) and of reading
+a lead's nine reports back (decompress), and the bytes PostgREST sends
+the API per lead (bytea travels hex-encoded).
+
+Usage:
+    python -m benchmarks.report_storage [leads] [leads_per_company] [rerun_ratio]
+"""
+
+import sys
+import time
+import zlib
+import random
+import statistics
+from itertools import groupby
+
+from app.services import report_store
+from app.services.report_store import content_hash, decompress_content
+from benchmarks.report_corpus import make_report_corpus
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    per_company = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rerun_ratio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    corpus = make_report_corpus(leads, leads_per_company=per_company)
+
+    # A rerun regenerates the lead-level reports but gets the cached
+    # company-level ones, so only those repeat byte for byte
+    rng = random.Random(11)
+    per_lead = [list(rows) for _, rows in groupby(corpus, key=lambda r: r["lead_id"])]
+    for reports in rng.sample(per_lead, int(len(per_lead) * rerun_ratio)):
+        corpus.extend(dict(r) for r in reports[:5])
+
+    contents = [row["content"] for row in corpus]
+    unique = {content_hash(content): content for content in contents}
+
+    encoders = {"zlib": lambda data: zlib.compress(data, 9)}
+    if report_store.zstandard is not None:
+        zstd = report_store.zstandard.ZstdCompressor(
+            level=report_store.COMPRESSION_LEVEL
+        )
+        encoders["zstd"] = zstd.compress
+
+    print(
+        f"{leads} leads, {per_company} per company, {rerun_ratio:.0%} reruns: "
+        f"{len(contents)} reports, {len(unique)} distinct\n"
+    )
+    print(
+        f"{'layout':<12} {'stored (MB)':>12} {'vs inline':>10} "
+        f"{'write/lead (ms)':>16} {'read/lead (ms)':>15} {'DB->API/lead (KB)':>18}"
+    )
+
+    inline = sum(len(content.encode()) for content in contents)
+    reports_per_lead = len(contents) / leads
+    print(
+        f"{'inline':<12} {inline / 1e6:>12.2f} {'1.0x':>10} {'-':>16} {'-':>15} "
+        f"{inline / leads / 1024:>18.1f}"
+    )
+
+    deduped = sum(len(content.encode()) for content in unique.values())
+    print(f"{'dedup':<12} {deduped / 1e6:>12.2f} {inline / deduped:>9.1f}x")
+
+    for name, encode in encoders.items():
+        write_times, read_times, stored = [], [], {}
+
+        for content in unique.values():
+            start = time.perf_counter()
+            key = content_hash(content)
+            stored[key] = encode(content.encode("utf-8"))
+            write_times.append(time.perf_counter() - start)
+
+        for body in stored.values():
+            start = time.perf_counter()
+            decompress_content(name, body)
+            read_times.append(time.perf_counter() - start)
+
+        size = sum(len(body) for body in stored.values())
+        write_ms = statistics.mean(write_times) * reports_per_lead * 1000
+        read_ms = statistics.mean(read_times) * reports_per_lead * 1000
+        mean_body = statistics.mean(len(body) for body in stored.values())
+        egress_kb = mean_body * 2 * reports_per_lead / 1024
+        print(
+            f"{'dedup+' + name:<12} {size / 1e6:>12.2f} {inline / size:>9.1f}x "
+            f"{write_ms:>16.2f} {read_ms:>15.2f} {egress_kb:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
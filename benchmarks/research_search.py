@@ -0,0 +1,212 @@
+"""
+Benchmark ranked full-text search over research reports.
+
+Indexes the synthetic report corpus into the SQLite FTS5 backend (the
+same code path as research_search_backend="sqlite") and times ranked,
+snippeted top-20 queries. Given a Postgres DSN it instead loads the
+corpus into a scratch schema there, applies the research_search
+migration and times the search_research function the production backend
+calls. That needs psycopg, and creates stub leads/reports/company_data
+tables and the Supabase API roles if missing: point it at a scratch
+database.
+
+The corpus vocabulary is only ~150 words, so every one of them appears
+in nearly every report. Real reports also name companies, products and
+technologies, so each document gets a handful of terms drawn from a
+Zipf-distributed vocabulary of 20k names. Two query sets are timed:
+
+    selective   names from that vocabulary (what users search for)
+    common      words from the shared vocabulary; each matches most of
+                the corpus, so every match is a ranking candidate (worst case)
+
+Usage:
+    python -m benchmarks.research_search [leads] [queries] [postgres-dsn]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import statistics
+from itertools import accumulate
+from pathlib import Path
+
+from app.services.research_search import SQLiteResearchIndex
+from benchmarks.report_corpus import WORDS, make_report_corpus
+
+try:
+    import psycopg
+    from psycopg.types.json import Jsonb
+except ImportError:
+    psycopg = None
+
+
+BATCH_SIZE = 5000
+NAMES = [f"acme{i}" for i in range(20_000)]
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "supabase" / "migrations" / "20261019000600_research_search.sql"
+)
+SCHEMA = "research_search_bench"
+POSTGRES_SETUP = f"""
+DO $$
+DECLARE
+    api_role TEXT;
+BEGIN
+    FOREACH api_role IN ARRAY ARRAY['anon', 'authenticated', 'service_role'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = api_role) THEN
+            EXECUTE FORMAT('CREATE ROLE %I NOLOGIN', api_role);
+        END IF;
+    END LOOP;
+END;
+$$;
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+SET search_path = {SCHEMA}, public;
+CREATE TABLE leads (id UUID PRIMARY KEY);
+CREATE TABLE reports (
+    lead_id UUID, report_type TEXT, title TEXT, content TEXT,
+    created_at TIMESTAMPTZ
+);
+CREATE TABLE company_data (lead_id UUID, name TEXT, profile TEXT);
+"""
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def time_queries(search, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query, 20)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def print_timings(search, query_sets):
+    print(f"{'top 20':<12} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for name, queries in query_sets:
+        timings = time_queries(search, queries)
+        print(
+            f"{name:<12} {statistics.median(timings):>9.1f} "
+            f"{percentile(timings, 0.95):>9.1f} {max(timings):>9.1f}"
+        )
+
+
+def run_sqlite(documents, leads, query_sets):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search.sqlite3")
+        index = SQLiteResearchIndex(path)
+
+        start = time.perf_counter()
+        for offset in range(0, len(documents), BATCH_SIZE):
+            batch = documents[offset:offset + BATCH_SIZE]
+            index._index(sorted({doc["lead_id"] for doc in batch}), batch)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index._index([documents[0]["lead_id"]], documents[:9])
+        reindex = (time.perf_counter() - start) * 1000
+
+        index._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = os.path.getsize(path)
+        print(
+            f"SQLite FTS5: {len(documents):,} reports ({leads:,} leads), "
+            f"{size / 1e6:.0f}MB, indexed in {build:.1f}s; "
+            f"re-indexing one lead {reindex:.1f}ms\n"
+        )
+
+        print_timings(index._search, query_sets)
+
+
+def run_postgres(dsn, documents, leads, query_sets):
+    if psycopg is None:
+        raise SystemExit("psycopg is required for the Postgres benchmark")
+
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(POSTGRES_SETUP)
+
+        try:
+            start = time.perf_counter()
+            with conn.cursor().copy("COPY leads (id) FROM STDIN") as copy:
+                for lead_id in dict.fromkeys(doc["lead_id"] for doc in documents):
+                    copy.write_row((lead_id,))
+            conn.execute(MIGRATION.read_text())
+            with conn.cursor().copy(
+                "COPY research_documents (lead_id, source, title, body) FROM STDIN"
+            ) as copy:
+                for doc in documents:
+                    copy.write_row(
+                        (doc["lead_id"], doc["source"], doc["title"], doc["body"])
+                    )
+            conn.execute("VACUUM ANALYZE research_documents")
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            conn.execute(
+                "SELECT index_research_documents(%s, %s)",
+                (documents[0]["lead_id"], Jsonb(documents[:9])),
+            )
+            reindex = (time.perf_counter() - start) * 1000
+
+            size = conn.execute(
+                "SELECT PG_TOTAL_RELATION_SIZE('research_documents')"
+            ).fetchone()[0]
+            print(
+                f"Postgres {conn.info.server_version // 10000}: "
+                f"{len(documents):,} reports ({leads:,} leads), "
+                f"{size / 1e6:.0f}MB, loaded and indexed in {build:.1f}s; "
+                f"re-indexing one lead {reindex:.1f}ms\n"
+            )
+
+            def search(query, limit):
+                return conn.execute(
+                    "SELECT * FROM search_research(%s, %s)", (query, limit)
+                ).fetchall()
+
+            print_timings(search, query_sets)
+
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 11_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    dsn = sys.argv[3] if len(sys.argv) > 3 else None
+
+    rng = random.Random(3)
+    weights = list(accumulate(1 / rank for rank in range(1, len(NAMES) + 1)))
+
+    documents = [
+        {
+            "lead_id": row["lead_id"],
+            "source": row["report_type"],
+            "title": row["title"],
+            "body": row["content"]
+            + "\n"
+            + " ".join(rng.choices(NAMES, cum_weights=weights, k=12)),
+        }
+        for row in make_report_corpus(leads)
+    ]
+
+    selective = [
+        " ".join(rng.sample(NAMES[10:2000], 1) + rng.sample(WORDS, rng.randint(0, 1)))
+        for _ in range(queries)
+    ]
+    common = [" ".join(rng.sample(WORDS, rng.randint(1, 2))) for _ in range(queries)]
+    query_sets = (("selective", selective), ("common", common))
+
+    if dsn:
+        run_postgres(dsn, documents, leads, query_sets)
+    else:
+        run_sqlite(documents, leads, query_sets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark what compression and ETag revalidation save on the reports
+endpoint.
+
+For each lead's GET /api/research/reports/{lead_id} payload this measures
+the JSON size uncompressed, gzip'd (GZipMiddleware) and brotli'd
+(brotli-asgi, if installed), the CPU time each encoder costs, and the
+estimated transfer time on a slow link. A 304 revalidation sends no body;
+its server-side cost is hashing the (id, created_at) pairs.
+
+Usage:
+    python -m benchmarks.response_compression [leads] [link_mbps]
+"""
+
+import sys
+import gzip
+import json
+import time
+import statistics
+from itertools import groupby
+
+from app.api.etag import make_etag
+from benchmarks.report_corpus import make_report_corpus
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def timed(fn, repeat: int = 5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings) * 1000
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    link_mbps = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    corpus = make_report_corpus(leads)
+    payloads = [
+        list(rows) for _, rows in groupby(corpus, key=lambda row: row["lead_id"])
+    ]
+
+    results = {"identity": [], "gzip": [], "brotli": [], "304": []}
+
+    for reports in payloads:
+        body, json_ms = timed(lambda: json.dumps({"reports": reports}).encode())
+        results["identity"].append((len(body), json_ms))
+
+        compressed, ms = timed(lambda: gzip.compress(body, compresslevel=6))
+        results["gzip"].append((len(compressed), json_ms + ms))
+
+        if brotli:
+            compressed, ms = timed(lambda: brotli.compress(body, quality=4))
+            results["brotli"].append((len(compressed), json_ms + ms))
+
+        versions = [{"id": r["id"], "created_at": r["created_at"]} for r in reports]
+        _, ms = timed(lambda: make_etag(versions))
+        results["304"].append((0, ms))
+
+    print(f"{leads} leads, 9 reports each, {link_mbps:g} Mbps link\n")
+    print(
+        f"{'encoding':<9} {'body (KB)':>10} {'ratio':>6} "
+        f"{'server (ms)':>12} {'transfer (ms)':>14}"
+    )
+
+    identity_size = statistics.mean(size for size, _ in results["identity"])
+
+    for name, rows in results.items():
+        if not rows:
+            print(f"{name:<9} {'(brotli not installed)':>44}")
+            continue
+
+        size = statistics.mean(size for size, _ in rows)
+        server_ms = statistics.mean(ms for _, ms in rows)
+        transfer_ms = size * 8 / (link_mbps * 1e6) * 1000
+        ratio = f"{identity_size / size:.1f}x" if size else "-"
+        print(
+            f"{name:<9} {size / 1024:>10.1f} {ratio:>6} "
+            f"{server_ms:>12.2f} {transfer_ms:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
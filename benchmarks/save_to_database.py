@@ -0,0 +1,296 @@
+"""
+Benchmark how long save_to_database spends talking to the database.
+
+There's no Postgres here, so the stand-in is a fake Supabase client that
+applies each request to an in-memory SQLite database and then sleeps for
+a simulated network round trip. That keeps the comparison about the
+number of round trips, which is what dominates against a hosted database.
+
+Three strategies are compared for a typical run (9 reports, email and
+interview script):
+
+    sequential  the previous save_to_database: one request per row
+    bulk        one multi-row upsert per table
+    rpc         one save_research_results call (single transaction)
+
+It also checks that saving the same run twice doesn't duplicate rows.
+
+Usage:
+    python -m benchmarks.save_to_database [round_trip_ms] [runs]
+"""
+
+import sys
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import statistics
+
+from app.workflow.persistence import build_research_rows, save_research_rows
+
+
+SCHEMA = """
+CREATE TABLE leads (id TEXT PRIMARY KEY, status TEXT, score REAL, score_details TEXT);
+CREATE TABLE company_data (
+    lead_id TEXT UNIQUE, name TEXT, profile TEXT, website TEXT, blog_url TEXT,
+    facebook_url TEXT, twitter_url TEXT, youtube_url TEXT
+);
+CREATE TABLE report_contents (
+    hash TEXT PRIMARY KEY, encoding TEXT, body TEXT, size INTEGER,
+    compressed_size INTEGER
+);
+CREATE TABLE reports (
+    lead_id TEXT, user_id TEXT, report_type TEXT, title TEXT, content TEXT,
+    content_hash TEXT, is_markdown INTEGER, metadata TEXT,
+    idempotency_key TEXT UNIQUE
+);
+CREATE TABLE outreach_materials (
+    lead_id TEXT, user_id TEXT, material_type TEXT, subject TEXT, content TEXT,
+    idempotency_key TEXT UNIQUE
+);
+"""
+
+
+def _column_value(value):
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+class FakeQuery:
+    """The slice of the postgrest query builder save_to_database uses."""
+
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.action = None
+        self.rows = []
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []
+
+    def _set(self, action, rows, on_conflict=None, ignore_duplicates=False):
+        self.action = action
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def insert(self, rows):
+        return self._set("insert", rows)
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        return self._set("upsert", rows, on_conflict, ignore_duplicates)
+
+    def update(self, values):
+        return self._set("update", values)
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        if self.action == "update":
+            values = self.rows[0]
+            assignments = ", ".join(f"{column} = ?" for column in values)
+            where = " AND ".join(f"{column} = ?" for column, _ in self.filters)
+            conn.execute(
+                f"UPDATE {self.table} SET {assignments} WHERE {where}",
+                [_column_value(v) for v in values.values()]
+                + [value for _, value in self.filters],
+            )
+            return
+
+        for row in self.rows:
+            columns = list(row)
+            sql = (
+                f"INSERT INTO {self.table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            if self.action == "upsert" and self.ignore_duplicates:
+                sql += f" ON CONFLICT ({self.on_conflict}) DO NOTHING"
+            elif self.action == "upsert":
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns)
+                sql += f" ON CONFLICT ({self.on_conflict}) DO UPDATE SET {updates}"
+            conn.execute(sql, [_column_value(row[c]) for c in columns])
+
+    async def execute(self):
+        await self.db.round_trip()
+        with self.db.conn:
+            self.apply(self.db.conn)
+
+
+class FakeRpc:
+    def __init__(self, db: "FakeSupabase", payload: dict):
+        self.db = db
+        self.payload = payload
+
+    async def execute(self):
+        await self.db.round_trip()
+        rows = self.payload
+        queries = [FakeQuery(self.db, "leads").update(rows["lead"])]
+        queries[0].eq("id", rows["lead_id"])
+        if rows["company_data"]:
+            queries.append(
+                FakeQuery(self.db, "company_data").upsert(
+                    rows["company_data"], on_conflict="lead_id"
+                )
+            )
+        if rows["report_contents"]:
+            queries.append(
+                FakeQuery(self.db, "report_contents").upsert(
+                    rows["report_contents"], on_conflict="hash", ignore_duplicates=True
+                )
+            )
+        for table in ("reports", "outreach_materials"):
+            if rows[table]:
+                queries.append(
+                    FakeQuery(self.db, table).upsert(
+                        rows[table],
+                        on_conflict="idempotency_key",
+                        ignore_duplicates=True,
+                    )
+                )
+        with self.db.conn:  # One transaction, like the plpgsql function
+            for query in queries:
+                query.apply(self.db.conn)
+
+
+class FakeSupabase:
+    def __init__(self, round_trip_seconds: float):
+        self.round_trip_seconds = round_trip_seconds
+        self.requests = 0
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript(SCHEMA)
+
+    async def round_trip(self):
+        self.requests += 1
+        await asyncio.sleep(self.round_trip_seconds)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict) -> FakeRpc:
+        return FakeRpc(self, params["payload"])
+
+    def count(self, table: str) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def make_state() -> dict:
+    lead_id = str(uuid.uuid4())
+    report_types = [
+        "linkedin_profile", "website_analysis", "blog_analysis",
+        "social_media_analysis", "news_analysis", "digital_presence",
+        "lead_profile", "global_research", "outreach_report",
+    ]
+    return {
+        "user_id": str(uuid.uuid4()),
+        "run_id": str(uuid.uuid4()),
+        "current_lead": {"id": lead_id},
+        "company_data": {
+            "name": "Northwind Analytics",
+            "profile": "Profile text " * 200,
+            "website": "https://northwind.example",
+            "social_media_links": {"blog": "https://northwind.example/blog"},
+        },
+        "reports": [
+            {
+                "report_type": report_type,
+                "title": report_type.replace("_", " ").title(),
+                "content": f"# {report_type}\n" + "Report body. " * 400,
+                "is_markdown": True,
+                "metadata": {},
+            }
+            for report_type in report_types
+        ],
+        "lead_score": 0.8,
+        "score_details": {"fit": 0.8},
+        "is_qualified": True,
+        "outreach_materials": {
+            "email_subject": "Hello",
+            "email_body": "Email body " * 50,
+            "interview_script": "Script " * 100,
+        },
+    }
+
+
+async def save_sequential(supabase, state: dict) -> None:
+    """The previous save_to_database: one awaited request per row."""
+    rows = build_research_rows(state)
+    await supabase.table("leads").update(rows["lead"]).eq(
+        "id", rows["lead_id"]
+    ).execute()
+    await supabase.table("company_data").upsert(
+        rows["company_data"], on_conflict="lead_id"
+    ).execute()
+    for report in state["reports"]:
+        row = {"lead_id": rows["lead_id"], "user_id": state["user_id"], **report}
+        await supabase.table("reports").insert(row).execute()
+    for row in rows["outreach_materials"]:
+        row = {k: v for k, v in row.items() if k != "idempotency_key"}
+        await supabase.table("outreach_materials").insert(row).execute()
+
+
+async def save_bulk(supabase, state: dict) -> None:
+    await save_research_rows(supabase, build_research_rows(state), use_rpc=False)
+
+
+async def save_rpc(supabase, state: dict) -> None:
+    await save_research_rows(supabase, build_research_rows(state), use_rpc=True)
+
+
+async def measure(name, save, round_trip_seconds: float, runs: int) -> float:
+    supabase = FakeSupabase(round_trip_seconds)
+    timings = []
+
+    for _ in range(runs):
+        state = make_state()
+        supabase.conn.execute(
+            "INSERT INTO leads (id) VALUES (?)", (state["current_lead"]["id"],)
+        )
+        start = time.perf_counter()
+        await save(supabase, state)
+        timings.append(time.perf_counter() - start)
+
+    median_ms = statistics.median(timings) * 1000
+    print(
+        f"{name:<11} {supabase.requests / runs:>8.0f} "
+        f"{median_ms:>12.1f} {max(timings) * 1000:>10.1f}"
+    )
+    return median_ms
+
+
+async def check_idempotency() -> None:
+    for use_rpc in (False, True):
+        supabase = FakeSupabase(0)
+        state = make_state()
+        rows = build_research_rows(state)
+        await save_research_rows(supabase, rows, use_rpc=use_rpc)
+        await save_research_rows(supabase, rows, use_rpc=use_rpc)  # Retry
+        label = "rpc" if use_rpc else "bulk"
+        print(
+            f"{label:<5} saved twice -> reports={supabase.count('reports')} "
+            f"outreach={supabase.count('outreach_materials')} "
+            f"contents={supabase.count('report_contents')} "
+            f"company_data={supabase.count('company_data')}"
+        )
+
+
+async def main():
+    round_trip_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    round_trip_seconds = round_trip_ms / 1000
+
+    print(f"Simulated round trip: {round_trip_ms:.0f}ms, {runs} runs per strategy\n")
+    print(f"{'strategy':<11} {'requests':>8} {'median (ms)':>12} {'max (ms)':>10}")
+
+    baseline = await measure("sequential", save_sequential, round_trip_seconds, runs)
+    bulk = await measure("bulk", save_bulk, round_trip_seconds, runs)
+    rpc = await measure("rpc", save_rpc, round_trip_seconds, runs)
+
+    print(f"\nbulk is {baseline / bulk:.1f}x faster, rpc is {baseline / rpc:.1f}x faster\n")
+    await check_idempotency()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+-- Idempotent, single-round-trip persistence of a research run.
+--
+-- Report and outreach rows carry an idempotency_key derived from
+-- (lead_id, run_id, row type), so retrying a save skips rows that were
+-- already written instead of duplicating them.
+
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS reports_idempotency_key_idx
+    ON reports (idempotency_key);
+
+ALTER TABLE outreach_materials ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS outreach_materials_idempotency_key_idx
+    ON outreach_materials (idempotency_key);
+
+-- Writes everything built by app/workflow/persistence.py:build_research_rows
+-- in one transaction: either the whole run is saved or nothing is.
+CREATE OR REPLACE FUNCTION save_research_results(payload JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_lead_id UUID := (payload->>'lead_id')::UUID;
+BEGIN
+    UPDATE leads SET
+        status = payload->'lead'->>'status',
+        score = (payload->'lead'->>'score')::NUMERIC,
+        score_details = payload->'lead'->'score_details',
+        updated_at = NOW()
+    WHERE id = v_lead_id;
+
+    IF jsonb_typeof(payload->'company_data') = 'object' THEN
+        INSERT INTO company_data (
+            lead_id, name, profile, website,
+            blog_url, facebook_url, twitter_url, youtube_url
+        )
+        SELECT
+            v_lead_id, c.name, c.profile, c.website,
+            c.blog_url, c.facebook_url, c.twitter_url, c.youtube_url
+        FROM jsonb_to_record(payload->'company_data') AS c(
+            name TEXT, profile TEXT, website TEXT,
+            blog_url TEXT, facebook_url TEXT, twitter_url TEXT, youtube_url TEXT
+        )
+        ON CONFLICT (lead_id) DO UPDATE SET
+            name = EXCLUDED.name,
+            profile = EXCLUDED.profile,
+            website = EXCLUDED.website,
+            blog_url = EXCLUDED.blog_url,
+            facebook_url = EXCLUDED.facebook_url,
+            twitter_url = EXCLUDED.twitter_url,
+            youtube_url = EXCLUDED.youtube_url;
+    END IF;
+
+    INSERT INTO reports (
+        lead_id, user_id, report_type, title, content,
+        is_markdown, metadata, idempotency_key
+    )
+    SELECT
+        v_lead_id, r.user_id, r.report_type, r.title, r.content,
+        COALESCE(r.is_markdown, TRUE), COALESCE(r.metadata, '{}'::JSONB),
+        r.idempotency_key
+    FROM jsonb_to_recordset(COALESCE(payload->'reports', '[]'::JSONB)) AS r(
+        user_id UUID, report_type TEXT, title TEXT, content TEXT,
+        is_markdown BOOLEAN, metadata JSONB, idempotency_key TEXT
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING;
+
+    INSERT INTO outreach_materials (
+        lead_id, user_id, material_type, subject, content, idempotency_key
+    )
+    SELECT
+        v_lead_id, o.user_id, o.material_type, o.subject, o.content,
+        o.idempotency_key
+    FROM jsonb_to_recordset(
+        COALESCE(payload->'outreach_materials', '[]'::JSONB)
+    ) AS o(
+        user_id UUID, material_type TEXT, subject TEXT, content TEXT,
+        idempotency_key TEXT
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING;
+END;
+$$;
+
+-- SECURITY DEFINER bypasses row-level security, so only the backend's
+-- service role may call it (PostgREST exposes every function at /rpc)
+REVOKE EXECUTE ON FUNCTION save_research_results(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION save_research_results(JSONB) TO service_role;
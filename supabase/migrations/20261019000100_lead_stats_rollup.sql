@@ -0,0 +1,190 @@
+-- Lead statistics without scanning the leads table.
+--
+-- lead_stats_rollup keeps, per (user_id, status), the number of leads and
+-- the sum/count of positive scores; lead_stats_status_rollup keeps the same
+-- totals per status only. Statement-level triggers on leads keep both
+-- current: each insert, delete or update statement sums its transition
+-- rows and applies one delta per status, so a 500-lead import batch
+-- touches a few rollup rows once instead of once per lead, and
+-- get_lead_stats() reads a handful of rows however many leads there are.
+--
+-- Until leads carry real user ids every lead has its own placeholder
+-- user_id, so the per-user table holds about one row per lead; unscoped
+-- stats therefore read the per-status table, never the per-user one.
+--
+-- Only the triggers (as the table owner) and the service role use these
+-- tables, so RLS is on with no policies and the API roles get no access.
+
+CREATE TABLE IF NOT EXISTS lead_stats_rollup (
+    user_id UUID NOT NULL,
+    status TEXT NOT NULL,
+    lead_count BIGINT NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    scored_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS lead_stats_status_rollup (
+    status TEXT PRIMARY KEY,
+    lead_count BIGINT NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    scored_count BIGINT NOT NULL DEFAULT 0
+);
+
+ALTER TABLE lead_stats_rollup ENABLE ROW LEVEL SECURITY;
+ALTER TABLE lead_stats_status_rollup ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON TABLE lead_stats_rollup, lead_stats_status_rollup
+    FROM anon, authenticated;
+
+-- Apply signed (user_id, status, score, sign) rows, summed per key. Keys
+-- are upserted in order so concurrent statements can't deadlock.
+CREATE OR REPLACE FUNCTION lead_stats_apply(p_deltas JSONB)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO lead_stats_status_rollup AS r (
+        status, lead_count, score_sum, scored_count
+    )
+    SELECT
+        COALESCE(d.status, ''),
+        SUM(d.sign),
+        SUM(CASE WHEN d.score > 0 THEN d.sign * d.score ELSE 0 END),
+        SUM(CASE WHEN d.score > 0 THEN d.sign ELSE 0 END)
+    FROM JSONB_TO_RECORDSET(p_deltas) AS d (
+        user_id UUID, status TEXT, score DOUBLE PRECISION, sign INTEGER
+    )
+    GROUP BY COALESCE(d.status, '')
+    ORDER BY COALESCE(d.status, '')
+    ON CONFLICT (status) DO UPDATE SET
+        lead_count = r.lead_count + EXCLUDED.lead_count,
+        score_sum = r.score_sum + EXCLUDED.score_sum,
+        scored_count = r.scored_count + EXCLUDED.scored_count;
+
+    INSERT INTO lead_stats_rollup AS r (
+        user_id, status, lead_count, score_sum, scored_count
+    )
+    SELECT
+        d.user_id,
+        COALESCE(d.status, ''),
+        SUM(d.sign),
+        SUM(CASE WHEN d.score > 0 THEN d.sign * d.score ELSE 0 END),
+        SUM(CASE WHEN d.score > 0 THEN d.sign ELSE 0 END)
+    FROM JSONB_TO_RECORDSET(p_deltas) AS d (
+        user_id UUID, status TEXT, score DOUBLE PRECISION, sign INTEGER
+    )
+    GROUP BY d.user_id, COALESCE(d.status, '')
+    ORDER BY d.user_id, COALESCE(d.status, '')
+    ON CONFLICT (user_id, status) DO UPDATE SET
+        lead_count = r.lead_count + EXCLUDED.lead_count,
+        score_sum = r.score_sum + EXCLUDED.score_sum,
+        scored_count = r.scored_count + EXCLUDED.scored_count;
+$$;
+
+REVOKE EXECUTE ON FUNCTION lead_stats_apply(JSONB) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION leads_stats_rollup_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    deltas JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT JSONB_AGG(d) INTO deltas
+        FROM (
+            SELECT n.user_id, n.status, n.score, 1 AS sign FROM new_rows n
+        ) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT JSONB_AGG(d) INTO deltas
+        FROM (
+            SELECT o.user_id, o.status, o.score, -1 AS sign FROM old_rows o
+        ) d;
+    ELSE
+        -- Only rows whose counted columns changed
+        SELECT JSONB_AGG(d) INTO deltas
+        FROM (
+            SELECT o.user_id, o.status, o.score, -1 AS sign
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.user_id, o.status, o.score)
+                IS DISTINCT FROM (n.user_id, n.status, n.score)
+            UNION ALL
+            SELECT n.user_id, n.status, n.score, 1 AS sign
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.user_id, o.status, o.score)
+                IS DISTINCT FROM (n.user_id, n.status, n.score)
+        ) d;
+    END IF;
+
+    IF deltas IS NOT NULL THEN
+        PERFORM lead_stats_apply(deltas);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables can't be combined with an UPDATE OF column list, so
+-- the update trigger fires on every update statement and filters above.
+DROP TRIGGER IF EXISTS leads_stats_rollup ON leads;
+DROP TRIGGER IF EXISTS leads_stats_rollup_insert ON leads;
+DROP TRIGGER IF EXISTS leads_stats_rollup_update ON leads;
+DROP TRIGGER IF EXISTS leads_stats_rollup_delete ON leads;
+
+CREATE TRIGGER leads_stats_rollup_insert
+    AFTER INSERT ON leads
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leads_stats_rollup_trigger();
+
+CREATE TRIGGER leads_stats_rollup_update
+    AFTER UPDATE ON leads
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leads_stats_rollup_trigger();
+
+CREATE TRIGGER leads_stats_rollup_delete
+    AFTER DELETE ON leads
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leads_stats_rollup_trigger();
+
+-- Backfill from the existing leads.
+TRUNCATE lead_stats_status_rollup;
+INSERT INTO lead_stats_status_rollup (status, lead_count, score_sum, scored_count)
+SELECT
+    COALESCE(status, ''),
+    COUNT(*),
+    COALESCE(SUM(score) FILTER (WHERE score > 0), 0),
+    COUNT(*) FILTER (WHERE score > 0)
+FROM leads
+GROUP BY COALESCE(status, '');
+
+TRUNCATE lead_stats_rollup;
+INSERT INTO lead_stats_rollup (user_id, status, lead_count, score_sum, scored_count)
+SELECT
+    user_id,
+    COALESCE(status, ''),
+    COUNT(*),
+    COALESCE(SUM(score) FILTER (WHERE score > 0), 0),
+    COUNT(*) FILTER (WHERE score > 0)
+FROM leads
+GROUP BY user_id, COALESCE(status, '');
+
+-- Per-status totals, optionally for one user.
+CREATE OR REPLACE FUNCTION get_lead_stats(p_user_id UUID DEFAULT NULL)
+RETURNS TABLE (
+    status TEXT,
+    lead_count BIGINT,
+    score_sum DOUBLE PRECISION,
+    scored_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.status, s.lead_count, s.score_sum, s.scored_count
+    FROM lead_stats_status_rollup s
+    WHERE p_user_id IS NULL
+    UNION ALL
+    SELECT r.status, r.lead_count, r.score_sum, r.scored_count
+    FROM lead_stats_rollup r
+    WHERE p_user_id IS NOT NULL AND r.user_id = p_user_id;
+$$;
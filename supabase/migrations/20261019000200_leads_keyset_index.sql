@@ -0,0 +1,8 @@
+-- Supports keyset pagination of GET /api/leads: ORDER BY created_at DESC,
+-- id DESC with a (created_at, id) < (cursor) condition is a range scan.
+
+CREATE INDEX IF NOT EXISTS leads_created_at_id_idx
+    ON leads (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS leads_status_created_at_id_idx
+    ON leads (status, created_at DESC, id DESC);
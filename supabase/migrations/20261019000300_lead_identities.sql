@@ -0,0 +1,65 @@
+-- Identity index for lead deduplication.
+--
+-- Each lead owns the normalized keys that identify its person:
+--   email:<email>             lower-cased, trimmed
+--   linkedin:<path>           LinkedIn URL path, e.g. linkedin:in/jane-doe
+--   name:<name>@<domain>      lower-cased name at the company's bare domain
+-- A key belongs to at most one lead, so a duplicate is found with a primary
+-- key lookup. Rules match app/services/lead_identity.py:lead_identity_keys.
+
+CREATE TABLE IF NOT EXISTS lead_identities (
+    key TEXT PRIMARY KEY,
+    lead_id UUID NOT NULL REFERENCES leads (id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS lead_identities_lead_id_idx
+    ON lead_identities (lead_id);
+
+-- Keys are personal data and decide which lead a new one merges into, so
+-- only the backend (service role) may read or write them.
+ALTER TABLE lead_identities ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON TABLE lead_identities FROM anon, authenticated;
+
+-- Backfill from existing leads; the oldest lead keeps a shared key.
+INSERT INTO lead_identities (key, lead_id)
+SELECT key, lead_id
+FROM (
+    SELECT
+        l.created_at,
+        l.id AS lead_id,
+        UNNEST(ARRAY[
+            CASE WHEN NULLIF(TRIM(l.email), '') IS NOT NULL
+                THEN 'email:' || LOWER(TRIM(l.email)) END,
+            CASE WHEN LOWER(TRIM(l.linkedin_url))
+                    ~ '^([a-z]+://)?([a-z0-9-]+\.)*linkedin\.com(/|$)'
+                THEN 'linkedin:' || TRIM(BOTH '/' FROM REGEXP_REPLACE(
+                    LOWER(TRIM(l.linkedin_url)),
+                    '^([a-z]+://)?([a-z0-9-]+\.)*linkedin\.com([^?#]*).*$',
+                    '\3'
+                )) END,
+            CASE WHEN NULLIF(TRIM(l.name), '') IS NOT NULL
+                    AND NULLIF(TRIM(l.company_website), '') IS NOT NULL
+                THEN 'name:'
+                    || REGEXP_REPLACE(LOWER(TRIM(l.name)), '\s+', ' ', 'g')
+                    || '@'
+                    || REGEXP_REPLACE(
+                        LOWER(TRIM(l.company_website)),
+                        '^([a-z]+://)?(www\.)?([^/:?#]+).*$',
+                        '\3'
+                    ) END
+        ]) AS key
+    FROM leads l
+) keys
+WHERE key IS NOT NULL AND key NOT IN ('linkedin:')
+ORDER BY created_at
+ON CONFLICT (key) DO NOTHING;
+
+-- When a lead's research last finished. Research reuse measures freshness
+-- from this, not updated_at, which any edit to the lead bumps.
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS research_completed_at TIMESTAMPTZ;
+
+UPDATE leads
+SET research_completed_at = updated_at
+WHERE research_completed_at IS NULL
+    AND status IN ('qualified', 'not_qualified', 'outreach_ready');
@@ -0,0 +1,116 @@
+-- Content-addressed, compressed report storage.
+--
+-- Report text is stored once per distinct content in report_contents,
+-- keyed by its sha256 and compressed (zstd, or zlib where zstandard isn't
+-- installed). Reports reference it by content_hash; company-level reports
+-- shared by every lead at a company and unchanged reruns cost one row.
+-- Reports written earlier keep their inline content.
+
+CREATE TABLE IF NOT EXISTS report_contents (
+    hash TEXT PRIMARY KEY,
+    encoding TEXT NOT NULL CHECK (encoding IN ('zstd', 'zlib', 'identity')),
+    body BYTEA NOT NULL,
+    size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS content_hash TEXT
+    REFERENCES report_contents (hash);
+ALTER TABLE reports ALTER COLUMN content DROP NOT NULL;
+
+CREATE INDEX IF NOT EXISTS reports_content_hash_idx ON reports (content_hash);
+
+-- Bodies are only read and written by the backend (service role) and by
+-- save_research_results below, which runs as its owner.
+ALTER TABLE report_contents ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON TABLE report_contents FROM anon, authenticated;
+
+CREATE OR REPLACE FUNCTION save_research_results(payload JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_lead_id UUID := (payload->>'lead_id')::UUID;
+BEGIN
+    UPDATE leads SET
+        status = payload->'lead'->>'status',
+        score = (payload->'lead'->>'score')::NUMERIC,
+        score_details = payload->'lead'->'score_details',
+        research_completed_at = COALESCE(
+            (payload->'lead'->>'research_completed_at')::TIMESTAMPTZ, NOW()
+        ),
+        updated_at = NOW()
+    WHERE id = v_lead_id;
+
+    IF jsonb_typeof(payload->'company_data') = 'object' THEN
+        INSERT INTO company_data (
+            lead_id, name, profile, website,
+            blog_url, facebook_url, twitter_url, youtube_url
+        )
+        SELECT
+            v_lead_id, c.name, c.profile, c.website,
+            c.blog_url, c.facebook_url, c.twitter_url, c.youtube_url
+        FROM jsonb_to_record(payload->'company_data') AS c(
+            name TEXT, profile TEXT, website TEXT,
+            blog_url TEXT, facebook_url TEXT, twitter_url TEXT, youtube_url TEXT
+        )
+        ON CONFLICT (lead_id) DO UPDATE SET
+            name = EXCLUDED.name,
+            profile = EXCLUDED.profile,
+            website = EXCLUDED.website,
+            blog_url = EXCLUDED.blog_url,
+            facebook_url = EXCLUDED.facebook_url,
+            twitter_url = EXCLUDED.twitter_url,
+            youtube_url = EXCLUDED.youtube_url;
+    END IF;
+
+    -- Bodies arrive in PostgREST's bytea text form ("\x" + hex)
+    INSERT INTO report_contents (hash, encoding, body, size, compressed_size)
+    SELECT
+        rc.hash, rc.encoding, decode(substr(rc.body, 3), 'hex'),
+        rc.size, rc.compressed_size
+    FROM jsonb_to_recordset(
+        COALESCE(payload->'report_contents', '[]'::JSONB)
+    ) AS rc(
+        hash TEXT, encoding TEXT, body TEXT, size INTEGER, compressed_size INTEGER
+    )
+    ON CONFLICT (hash) DO NOTHING;
+
+    INSERT INTO reports (
+        lead_id, user_id, report_type, title, content, content_hash,
+        is_markdown, metadata, idempotency_key
+    )
+    SELECT
+        v_lead_id, r.user_id, r.report_type, r.title, r.content, r.content_hash,
+        COALESCE(r.is_markdown, TRUE), COALESCE(r.metadata, '{}'::JSONB),
+        r.idempotency_key
+    FROM jsonb_to_recordset(COALESCE(payload->'reports', '[]'::JSONB)) AS r(
+        user_id UUID, report_type TEXT, title TEXT, content TEXT,
+        content_hash TEXT, is_markdown BOOLEAN, metadata JSONB,
+        idempotency_key TEXT
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING;
+
+    INSERT INTO outreach_materials (
+        lead_id, user_id, material_type, subject, content, idempotency_key
+    )
+    SELECT
+        v_lead_id, o.user_id, o.material_type, o.subject, o.content,
+        o.idempotency_key
+    FROM jsonb_to_recordset(
+        COALESCE(payload->'outreach_materials', '[]'::JSONB)
+    ) AS o(
+        user_id UUID, material_type TEXT, subject TEXT, content TEXT,
+        idempotency_key TEXT
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING;
+END;
+$$;
+
+-- SECURITY DEFINER bypasses row-level security, so only the backend's
+-- service role may call it (PostgREST exposes every function at /rpc)
+REVOKE EXECUTE ON FUNCTION save_research_results(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION save_research_results(JSONB) TO service_role;
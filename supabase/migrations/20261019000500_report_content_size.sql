@@ -0,0 +1,34 @@
+-- Report size without reading the body, for the metadata-only listing
+-- (GET /api/research/reports/{lead_id}?view=summary).
+
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS content_size INTEGER;
+
+CREATE OR REPLACE FUNCTION reports_set_content_size()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.content IS NOT NULL THEN
+        NEW.content_size := octet_length(NEW.content);
+    ELSIF NEW.content_hash IS NOT NULL THEN
+        SELECT size INTO NEW.content_size
+        FROM report_contents WHERE hash = NEW.content_hash;
+    END IF;
+
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS reports_content_size ON reports;
+CREATE TRIGGER reports_content_size
+    BEFORE INSERT OR UPDATE OF content, content_hash ON reports
+    FOR EACH ROW EXECUTE FUNCTION reports_set_content_size();
+
+UPDATE reports r SET content_size = COALESCE(
+    octet_length(r.content),
+    (SELECT rc.size FROM report_contents rc WHERE rc.hash = r.content_hash)
+)
+WHERE r.content_size IS NULL;
+
+CREATE INDEX IF NOT EXISTS reports_lead_id_created_at_idx
+    ON reports (lead_id, created_at);
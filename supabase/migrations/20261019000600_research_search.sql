@@ -0,0 +1,117 @@
+-- Full-text search over research output.
+--
+-- One row per (lead, source): each report type plus the company profile,
+-- written by app/services/research_search.py after every research run.
+-- The tsvector is generated (title weighted above body) and GIN-indexed,
+-- so a ranked search reads only the matching rows.
+
+CREATE TABLE IF NOT EXISTS research_documents (
+    lead_id UUID NOT NULL REFERENCES leads (id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL,
+    tsv TSVECTOR GENERATED ALWAYS AS (
+        SETWEIGHT(TO_TSVECTOR('english', COALESCE(title, '')), 'A')
+        || SETWEIGHT(TO_TSVECTOR('english', body), 'B')
+    ) STORED,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (lead_id, source)
+);
+
+CREATE INDEX IF NOT EXISTS research_documents_tsv_idx
+    ON research_documents USING GIN (tsv);
+
+-- Written by the backend (service role) only; the API roles get nothing.
+ALTER TABLE research_documents ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON TABLE research_documents FROM anon, authenticated;
+
+-- Replace all of a lead's documents in one transaction, so sources missing
+-- from a rerun stop matching. Called by the backend with the service role.
+CREATE OR REPLACE FUNCTION index_research_documents(
+    p_lead_id UUID, p_documents JSONB
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM research_documents WHERE lead_id = p_lead_id;
+
+    INSERT INTO research_documents (lead_id, source, title, body)
+    SELECT p_lead_id, d.source, COALESCE(d.title, ''), d.body
+    FROM JSONB_TO_RECORDSET(p_documents) AS d (
+        source TEXT, title TEXT, body TEXT
+    )
+    WHERE d.body IS NOT NULL;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION index_research_documents(UUID, JSONB)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION index_research_documents(UUID, JSONB) TO service_role;
+
+-- Ranked matches with highlighted snippets. Runs as the caller, so the
+-- join to leads applies the leads row-level security policies (and only
+-- the service role can read research_documents at all).
+--
+-- Ranking reads each match's whole tsvector, so a term found in most
+-- reports would rank the entire corpus (~850ms at 100k reports). At most
+-- 1000 matches are ranked; narrower queries match fewer and are ranked in
+-- full, broad ones get the best of an arbitrary 1000.
+CREATE OR REPLACE FUNCTION search_research(p_query TEXT, p_limit INT DEFAULT 20)
+RETURNS TABLE (
+    lead_id UUID,
+    source TEXT,
+    title TEXT,
+    snippet TEXT,
+    rank REAL
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH query AS (
+        SELECT WEBSEARCH_TO_TSQUERY('english', p_query) AS q
+    ),
+    candidates AS (
+        SELECT d.lead_id, d.source, d.title, d.body, d.tsv
+        FROM research_documents d
+        JOIN leads l ON l.id = d.lead_id
+        CROSS JOIN query
+        WHERE d.tsv @@ query.q
+        LIMIT 1000
+    ),
+    matches AS (
+        SELECT c.lead_id, c.source, c.title, c.body,
+               TS_RANK_CD(c.tsv, query.q) AS rank
+        FROM candidates c
+        CROSS JOIN query
+        ORDER BY rank DESC
+        LIMIT LEAST(GREATEST(p_limit, 1), 100)
+    )
+    -- ts_headline is expensive, so only the returned rows get a snippet
+    SELECT m.lead_id, m.source, m.title,
+           TS_HEADLINE(
+               'english', m.body, query.q,
+               'StartSel=<b>, StopSel=</b>, MaxWords=24, MinWords=8'
+           ),
+           m.rank
+    FROM matches m
+    CROSS JOIN query
+    ORDER BY m.rank DESC;
+$$;
+
+-- Backfill from reports still stored inline and from company profiles.
+-- Bodies already moved to report_contents are compressed and can't be
+-- read from SQL; they are indexed again when the lead is next researched.
+INSERT INTO research_documents (lead_id, source, title, body)
+SELECT DISTINCT ON (r.lead_id, r.report_type)
+    r.lead_id, r.report_type, COALESCE(r.title, ''), r.content
+FROM reports r
+WHERE r.content IS NOT NULL AND r.content <> ''
+ORDER BY r.lead_id, r.report_type, r.created_at DESC
+ON CONFLICT (lead_id, source) DO NOTHING;
+
+INSERT INTO research_documents (lead_id, source, title, body)
+SELECT c.lead_id, 'company_profile', COALESCE(c.name, ''), c.profile
+FROM company_data c
+WHERE c.profile IS NOT NULL AND c.profile <> ''
+ON CONFLICT (lead_id, source) DO NOTHING;